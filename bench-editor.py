@@ -0,0 +1,449 @@
+#!/usr/bin/env python3
+"""
+Benchmark the content editor's data operations on large synthetic pages
+
+Drives StaticContentEditor with a stubbed tkinter by default (no display
+needed), or with real Tk via --tk. Timings and peak memory are written to a
+JSON results file that can be compared against a previous run.
+"""
+
+import argparse
+import gc
+import importlib.util
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import types
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SIZES = [100, 1000, 10000, 50000]
+OPERATIONS = ['load_pages', 'on_page_select', 'refresh_sections_list', 'on_drag_end', 'save_changes', 'update_preview', 'undo_redo']
+
+WORDS = ("python react flask docker kubernetes model data pipeline realtime dashboard "
+         "analysis neural network api cloud security platform detection system").split()
+
+
+def load_editor_module():
+    """Import content-editor.py (its file name is not a valid module name)"""
+    sys.path.insert(0, ROOT_DIR)
+    spec = importlib.util.spec_from_file_location('content_editor', os.path.join(ROOT_DIR, 'content-editor.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# --- Synthetic content -------------------------------------------------------
+
+def make_text(rng, size_bytes):
+    """HTML section body of roughly size_bytes"""
+    parts = []
+    length = 0
+    while length < size_bytes:
+        sentence = ' '.join(rng.choice(WORDS) for _ in range(12))
+        chunk = f"<p>{sentence.capitalize()}.</p><br><ul><br><li><strong>{rng.choice(WORDS)}:</strong> {sentence}</li><br></ul><br>"
+        parts.append(chunk)
+        length += len(chunk)
+    return ''.join(parts)
+
+
+def make_page(section_count, text_bytes, seed=1):
+    """A projects-like page with section_count sections"""
+    rng = random.Random(seed)
+    # Reuse a handful of bodies so generating 50,000 sections stays quick
+    bodies = [make_text(rng, text_bytes) for _ in range(16)]
+    sections = []
+    for i in range(section_count):
+        sections.append({
+            'title': f"Project {i} {rng.choice(WORDS).title()}",
+            'githubLink': f"https://github.com/example/project-{i}",
+            'documentationLink': f"https://github.com/example/project-{i}/blob/main/README.md",
+            'description': ' '.join(rng.choice(WORDS) for _ in range(20)),
+            'technologies': rng.sample(WORDS, 5),
+            'text': bodies[i % len(bodies)],
+            'order': i,
+        })
+    return {
+        'pageName': 'projects',
+        'title': 'Projects',
+        'description': 'Synthetic benchmark page',
+        'sections': sections,
+        'lastUpdated': '2025-01-01T00:00:00',
+    }
+
+
+# --- Stubbed tkinter ---------------------------------------------------------
+
+class TclError(Exception):
+    pass
+
+
+class StubVar:
+    def __init__(self, value=''):
+        self.value = value
+
+    def set(self, value):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+
+class StubWidget:
+    """Accepts any layout/config call"""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+class StubListbox(StubWidget):
+    def __init__(self, *args, **kwargs):
+        self.items = []
+        self.selection = []
+
+    def insert(self, index, *items):
+        position = len(self.items) if index == 'end' else int(index)
+        self.items[position:position] = items
+
+    def delete(self, first, last=None):
+        first = len(self.items) - 1 if first == 'end' else int(first)
+        if last is None:
+            last = first
+        last = len(self.items) - 1 if last == 'end' else int(last)
+        del self.items[first:last + 1]
+
+    def get(self, first, last=None):
+        if isinstance(first, tuple):
+            first = first[0]
+        if last is not None:
+            last = len(self.items) - 1 if last == 'end' else int(last)
+            return tuple(self.items[int(first):last + 1])
+        return self.items[int(first)]
+
+    def size(self):
+        return len(self.items)
+
+    def curselection(self):
+        return tuple(self.selection)
+
+    def selection_clear(self, first, last=None):
+        self.selection = []
+
+    def selection_set(self, first, last=None):
+        self.selection = [len(self.items) - 1 if first == 'end' else int(first)]
+
+    def nearest(self, y):
+        return int(y)
+
+
+class StubEntry(StubWidget):
+    def __init__(self, *args, **kwargs):
+        self.value = ''
+
+    def delete(self, first, last=None):
+        self.value = ''
+
+    def insert(self, index, text):
+        self.value = self.value[:int(index)] + text + self.value[int(index):]
+
+    def get(self):
+        return self.value
+
+
+class StubText(StubWidget):
+    """Enough of tk.Text for the editor: line.column and 'end' indexes"""
+
+    def __init__(self, *args, **kwargs):
+        self.content = ''
+
+    def offset(self, index):
+        index = str(index)
+        if index == 'end':
+            return len(self.content) + 1
+        if index == 'insert':
+            return len(self.content)
+        if index.startswith('sel.'):
+            raise TclError("text doesn't contain any characters tagged with \"sel\"")
+        line, column = (int(part) for part in index.split('.'))
+        position = 0
+        for _ in range(line - 1):
+            newline = self.content.find('\n', position)
+            if newline == -1:
+                return len(self.content) + 1
+            position = newline + 1
+        return min(position + column, len(self.content) + 1)
+
+    def get(self, start, end=None):
+        text = self.content + '\n'
+        first = self.offset(start)
+        return text[first:self.offset(end)] if end is not None else text[first:first + 1]
+
+    def delete(self, start, end=None):
+        first = self.offset(start)
+        last = self.offset(end) if end is not None else first + 1
+        last = min(last, len(self.content))
+        if first < last:
+            self.content = self.content[:first] + self.content[last:]
+
+    def insert(self, index, text):
+        position = min(self.offset(index), len(self.content))
+        self.content = self.content[:position] + text + self.content[position:]
+
+    def index(self, index):
+        return '1.0'
+
+
+class StubRoot(StubWidget):
+    """Collects after() callbacks so the benchmark decides when they run"""
+
+    def __init__(self):
+        self.callbacks = []
+        self.next_id = 0
+
+    def after(self, delay_ms, callback=None, *args):
+        self.next_id += 1
+        self.callbacks.append((self.next_id, callback, args))
+        return self.next_id
+
+    def after_cancel(self, after_id):
+        self.callbacks = [entry for entry in self.callbacks if entry[0] != after_id]
+
+    def pump(self):
+        callbacks, self.callbacks = self.callbacks, []
+        for _, callback, args in callbacks:
+            callback(*args)
+
+
+def install_stub_tk(editor_module):
+    """Point the editor's lazily-imported tkinter names at the stubs"""
+    tk = types.SimpleNamespace(
+        END='end', INSERT='insert', SEL_FIRST='sel.first', SEL_LAST='sel.last',
+        BOTH='both', X='x', Y='y', LEFT='left', RIGHT='right', BOTTOM='bottom', TOP='top',
+        W='w', E='e', WORD='word', NORMAL='normal', DISABLED='disabled', SUNKEN='sunken',
+        TclError=TclError, StringVar=StubVar, Listbox=StubListbox, Text=StubText,
+    )
+    ttk = types.SimpleNamespace(Frame=StubWidget, Label=StubWidget, Button=StubWidget, Entry=StubEntry)
+    messagebox = types.SimpleNamespace(
+        showinfo=lambda *a, **k: None, showwarning=lambda *a, **k: None,
+        showerror=lambda *a, **k: print(f"messagebox error: {a}", file=sys.stderr),
+        askyesno=lambda *a, **k: True,
+    )
+    scrolledtext = types.SimpleNamespace(ScrolledText=StubText)
+    editor_module.tk = tk
+    editor_module.ttk = ttk
+    editor_module.messagebox = messagebox
+    editor_module.scrolledtext = scrolledtext
+    editor_module.filedialog = types.SimpleNamespace()
+    return StubRoot()
+
+
+# --- Driver ------------------------------------------------------------------
+
+class EditorDriver:
+    """Creates an editor on a data directory and runs its operations to completion"""
+
+    def __init__(self, editor_module, data_dir, use_tk):
+        self.module = editor_module
+        self.use_tk = use_tk
+        if use_tk:
+            editor_module.import_tk()
+            self.root = editor_module.tk.Tk()
+            self.root.withdraw()
+        else:
+            self.root = install_stub_tk(editor_module)
+        self.editor = editor_module.StaticContentEditor(self.root, data_dir)
+
+    def pump(self):
+        if self.use_tk:
+            self.root.update()
+        else:
+            self.root.pump()
+
+    def run_until(self, done, timeout=300):
+        deadline = time.perf_counter() + timeout
+        while not done():
+            if time.perf_counter() > deadline:
+                raise TimeoutError("operation did not finish")
+            self.pump()
+            time.sleep(0.0005)
+
+    def select_page(self):
+        listbox = self.editor.pages_listbox
+        index = list(listbox.get(0, 'end')).index('projects') if self.use_tk else listbox.items.index('projects')
+        listbox.selection_clear(0, 'end')
+        listbox.selection_set(index)
+        self.editor.on_page_select(None)
+
+    def select_section(self, index):
+        self.editor.current_section = index
+        section = self.editor.current_page['sections'][index]
+        self.editor.section_title_entry.delete(0, 'end')
+        self.editor.section_title_entry.insert(0, section['title'])
+        self.editor.content_text.delete('1.0', 'end')
+        self.editor.content_text.insert('1.0', section['text'])
+
+    # Operations: each returns after all background work it triggered is done
+
+    def op_load_pages(self):
+        self.editor.load_pages()
+
+    def op_on_page_select(self):
+        self.editor.page_cache.invalidate()
+        self.select_page()
+
+    def op_refresh_sections_list(self):
+        self.editor.refresh_sections_list()
+
+    def op_on_drag_end(self):
+        count = len(self.editor.current_page['sections'])
+        self.editor.drag_start_index = 0
+        self.editor.drag_current_index = count - 1
+        self.editor.on_drag_end(None)
+
+    def op_save_changes(self):
+        self.select_section(0)
+        self.editor.save_changes()
+        writer = self.editor.page_writer
+        self.run_until(lambda: not writer.is_busy() and writer.results.empty())
+
+    def op_update_preview(self):
+        rendered = self.editor.preview_render_count
+        self.editor.content_text.insert('1.0', 'x')
+        self.editor.update_preview()
+        self.run_until(lambda: self.editor.preview_render_count > rendered)
+
+    def op_undo_redo(self):
+        if not self.editor.history.can_undo():
+            self.op_on_drag_end()
+        self.editor.undo()
+        self.editor.redo()
+
+    def close(self):
+        if self.editor.data_watcher is not None:
+            self.editor.data_watcher.stop()
+        self.editor.page_writer.close()
+        self.editor.preview_executor.shutdown(wait=True)
+        if self.use_tk:
+            self.root.destroy()
+
+
+def measure(driver, operation, repeat):
+    """Time an operation repeat times, then once more under tracemalloc for its peak"""
+    func = getattr(driver, f"op_{operation}")
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+
+    gc.collect()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'min_ms': min(timings) * 1000,
+        'median_ms': statistics.median(timings) * 1000,
+        'peak_kb': peak / 1024,
+    }
+
+
+def run_size(editor_module, size, args):
+    """Benchmark every operation on a page with size sections"""
+    data_dir = tempfile.mkdtemp(prefix='bench-editor-')
+    try:
+        page = make_page(size, args.text_bytes)
+        with open(os.path.join(data_dir, 'projects.json'), 'w', encoding='utf-8') as f:
+            json.dump(page, f, indent=2)
+        page_bytes = os.path.getsize(os.path.join(data_dir, 'projects.json'))
+        del page
+
+        driver = EditorDriver(editor_module, data_dir, args.tk)
+        try:
+            driver.select_page()
+            driver.select_section(0)
+            results = []
+            for operation in args.operations:
+                stats = measure(driver, operation, args.repeat)
+                stats.update({'sections': size, 'operation': operation, 'page_kb': page_bytes / 1024})
+                results.append(stats)
+                print(f"  {size:>6} sections  {operation:<22} {stats['median_ms']:>10.2f} ms  "
+                      f"peak {stats['peak_kb']:>10.0f} KB")
+            print(f"  {size:>6} sections  {driver.editor.history.stats_text()}")
+            return results
+        finally:
+            driver.close()
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def compare(results, previous_path):
+    """Print the median change against a previous results file"""
+    with open(previous_path, 'r', encoding='utf-8') as f:
+        previous = json.load(f)
+    baseline = {(r['sections'], r['operation']): r for r in previous.get('results', [])}
+    print(f"\nCompared with {previous_path}:")
+    for result in results:
+        before = baseline.get((result['sections'], result['operation']))
+        if not before or not before['median_ms']:
+            continue
+        ratio = result['median_ms'] / before['median_ms']
+        marker = '🔺' if ratio > 1.10 else ('🔻' if ratio < 0.90 else '  ')
+        print(f"  {marker} {result['sections']:>6} sections  {result['operation']:<22} "
+              f"{before['median_ms']:>10.2f} -> {result['median_ms']:>10.2f} ms  ({ratio:.2f}x)")
+
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Benchmark content editor operations on synthetic pages")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="section counts to test")
+    parser.add_argument('--text-bytes', type=int, default=4096, help="approximate size of each section's text")
+    parser.add_argument('--repeat', type=int, default=3, help="timed runs per operation")
+    parser.add_argument('--operations', nargs='+', default=OPERATIONS, choices=OPERATIONS)
+    parser.add_argument('--tk', action='store_true', help="use real Tk (needs a display) instead of stubs")
+    parser.add_argument('--output', default='bench-results.json', help="where to write the results")
+    parser.add_argument('--compare', metavar='PREVIOUS', help="results file from an earlier run")
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args()
+    editor_module = load_editor_module()
+
+    print(f"📊 Benchmarking content editor ({'Tk' if args.tk else 'stubbed Tk'})...")
+    results = []
+    for size in args.sizes:
+        results.extend(run_size(editor_module, size, args))
+
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'createdAt': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'textBytes': args.text_bytes,
+            'repeat': args.repeat,
+            'tk': args.tk,
+        },
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✅ Results written to {args.output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""
+A small task graph for rebuild-site.py
+
+Each task declares the paths it reads (inputs), the paths it writes
+(outputs) and the tasks that must finish first. Tasks whose dependencies are
+done run concurrently on a thread pool (the slow ones start their own
+processes). A task is skipped when the hash of its inputs matches the last
+successful run and its outputs still exist. When a task fails, everything
+downstream of it is cancelled.
+"""
+
+import hashlib
+import os
+import sys
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+# Task outcomes
+RAN = 'ran'
+SKIPPED = 'skipped'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+
+def hash_file(path):
+    """Return the sha256 hex digest of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def iter_files(path, exclude=None):
+    """Yield every file under path (or path itself), skipping excluded files and directories"""
+    exclude = set(exclude or ())
+    if os.path.isfile(path):
+        if path not in exclude:
+            yield path
+        return
+    for dirpath, dirnames, filenames in os.walk(path):
+        dirnames[:] = sorted(d for d in dirnames if os.path.join(dirpath, d) not in exclude)
+        for filename in sorted(filenames):
+            file_path = os.path.join(dirpath, filename)
+            if file_path not in exclude:
+                yield file_path
+
+
+def hash_paths(paths, exclude=None, suffixes=None):
+    """Combine the names and contents of every file under paths into one hash"""
+    digest = hashlib.sha256()
+    for path in paths:
+        if not os.path.exists(path):
+            continue
+        for file_path in iter_files(path, exclude):
+            if suffixes and not file_path.endswith(suffixes):
+                continue
+            digest.update(file_path.replace(os.sep, '/').encode('utf-8'))
+            digest.update(hash_file(file_path).encode('ascii'))
+    return digest.hexdigest()
+
+
+class LineWriter:
+    """Stand-in for sys.stdout that only writes whole lines
+
+    print() writes the text and the newline separately, so output from tasks
+    running side by side would otherwise be spliced together mid-line.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.lock = threading.Lock()
+        self.partial = threading.local()
+
+    def write(self, text):
+        buffered = getattr(self.partial, 'text', '') + text
+        complete, newline, rest = buffered.rpartition('\n')
+        self.partial.text = rest
+        if newline:
+            with self.lock:
+                self.stream.write(complete + newline)
+                self.stream.flush()
+        return len(text)
+
+    def flush(self):
+        text = getattr(self.partial, 'text', '')
+        self.partial.text = ''
+        with self.lock:
+            self.stream.write(text)
+            self.stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+class Task:
+    """One build stage: a function returning False on failure, plus what it reads and writes
+
+    inputs: files/directories whose contents decide whether the task is up to date
+        (a task without inputs always runs)
+    exclude: paths under inputs to leave out of the hash
+    suffixes: only hash input files with these endings
+    outputs: paths that must exist for the task to be skipped
+    deps: names of tasks that must succeed first
+    salt: extra input that is not a file (e.g. a tool version); a string or a
+        function returning one, called only when the hash is needed
+    """
+
+    def __init__(self, name, func, inputs=(), outputs=(), deps=(), exclude=(), suffixes=None, salt=None):
+        self.name = name
+        self.func = func
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.deps = list(deps)
+        self.exclude = list(exclude)
+        self.suffixes = suffixes
+        self.salt = salt
+
+    def input_hash(self):
+        if not self.inputs:
+            return None
+        digest = hash_paths(self.inputs, self.exclude, self.suffixes)
+        if self.salt is not None:
+            salt = self.salt() if callable(self.salt) else self.salt
+            digest = hashlib.sha256(f"{digest}:{salt}".encode('utf-8')).hexdigest()
+        return digest
+
+
+class TaskGraph:
+    """Runs tasks in dependency order, concurrently where the graph allows"""
+
+    def __init__(self, tasks, trace, state=None):
+        self.tasks = {task.name: task for task in tasks}
+        self.trace = trace
+        # task name -> input hash of its last successful run
+        self.state = dict(state or {})
+        self.check()
+
+    def check(self):
+        """Reject unknown dependencies and cycles before anything runs"""
+        for task in self.tasks.values():
+            for dep in task.deps:
+                if dep not in self.tasks:
+                    raise ValueError(f"Task '{task.name}' depends on unknown task '{dep}'")
+        visiting, done = set(), set()
+
+        def visit(name, path):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Task dependency cycle: {' -> '.join(path + [name])}")
+            visiting.add(name)
+            for dep in self.tasks[name].deps:
+                visit(dep, path + [name])
+            visiting.discard(name)
+            done.add(name)
+
+        for name in self.tasks:
+            visit(name, [])
+
+    def execute(self, task, force, cancel):
+        """Run or skip one task (on a worker thread) and return its outcome"""
+        digest = task.input_hash()
+        if (not force and digest is not None and self.state.get(task.name) == digest
+                and all(os.path.exists(path) for path in task.outputs)):
+            print(f"⏭️  {task.name}: up to date")
+            with self.trace.phase(task.name, 'task') as info:
+                info['status'] = SKIPPED
+            return SKIPPED
+        result = self.trace.step(task.name, task.func, category='task')
+        if result is False:
+            return CANCELLED if cancel is not None and cancel.is_set() else FAILED
+        if digest is not None:
+            self.state[task.name] = digest
+        return RAN
+
+    def run(self, force=False, cancel=None, max_workers=None):
+        """Run the graph; returns {task name: outcome}"""
+        outcomes = {}
+        waiting = dict(self.tasks)
+        running = {}
+        stdout, sys.stdout = sys.stdout, LineWriter(sys.stdout)
+        try:
+            self.schedule(waiting, running, outcomes, force, cancel, max_workers)
+        finally:
+            sys.stdout = stdout
+        return outcomes
+
+    def schedule(self, waiting, running, outcomes, force, cancel, max_workers):
+        """Start every task whose dependencies are done until none are left"""
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='build-task') as pool:
+            while waiting or running:
+                for name, task in list(waiting.items()):
+                    dep_outcomes = [outcomes.get(dep) for dep in task.deps]
+                    if any(outcome in (FAILED, CANCELLED) for outcome in dep_outcomes) or \
+                            (cancel is not None and cancel.is_set()):
+                        # Never start work downstream of a failure (or after a cancel)
+                        outcomes[name] = CANCELLED
+                        del waiting[name]
+                    elif all(outcome in (RAN, SKIPPED) for outcome in dep_outcomes):
+                        running[pool.submit(self.execute, task, force, cancel)] = name
+                        del waiting[name]
+                if not running:
+                    continue
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    try:
+                        outcomes[name] = future.result()
+                    except Exception as e:
+                        print(f"❌ {name} crashed: {e}")
+                        outcomes[name] = FAILED
@@ -0,0 +1,156 @@
+"""
+Timing traces for rebuild-site.py
+
+Every build phase is recorded as a span (start, duration, thread, status and
+any extra numbers such as a child's peak RSS). A trace is written twice: as
+plain JSON for scripts and diffs, and in the Chrome trace event format so it
+can be opened in chrome://tracing or https://ui.perfetto.dev.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+TRACE_VERSION = 1
+
+
+def peak_rss_mb(rusage):
+    """ru_maxrss is in kilobytes on Linux but in bytes on macOS"""
+    scale = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return round(rusage.ru_maxrss / scale, 1)
+
+
+class BuildTrace:
+    """Collects the phases of one build"""
+
+    def __init__(self, command=None):
+        self.command = command or sys.argv
+        self.started_at = time.strftime('%Y-%m-%dT%H:%M:%S')
+        self.started = time.perf_counter()
+        self.phases = []
+        self.metadata = {}
+        self.threads = {}
+        self.lock = threading.Lock()
+
+    def now_ms(self):
+        return (time.perf_counter() - self.started) * 1000
+
+    @contextmanager
+    def phase(self, name, category='build'):
+        """Time the body; it may set status or add numbers to the yielded dict"""
+        info = {'status': 'ok'}
+        start_ms = self.now_ms()
+        try:
+            yield info
+        except BaseException:
+            info['status'] = 'error'
+            raise
+        finally:
+            self.record(name, category, start_ms, self.now_ms() - start_ms, info)
+
+    def step(self, name, func, *args, category='build'):
+        """Run one build step and record it; a False return marks the phase failed"""
+        with self.phase(name, category) as info:
+            result = func(*args)
+            if result is False:
+                info['status'] = 'failed'
+            return result
+
+    def record(self, name, category, start_ms, duration_ms, info):
+        thread = threading.current_thread()
+        with self.lock:
+            tid = self.threads.setdefault(thread.ident, (len(self.threads) + 1, thread.name))[0]
+            self.phases.append({
+                'name': name,
+                'category': category,
+                'startMs': round(start_ms, 3),
+                'durationMs': round(duration_ms, 3),
+                'thread': tid,
+                **info,
+            })
+
+    def to_json(self):
+        """Plain trace: one entry per phase, in the order they finished"""
+        return {
+            'version': TRACE_VERSION,
+            'command': self.command,
+            'startedAt': self.started_at,
+            'totalMs': round(self.now_ms(), 3),
+            **self.metadata,
+            'phases': self.phases,
+        }
+
+    def to_chrome(self):
+        """Chrome trace event format (complete events plus thread names)"""
+        pid = os.getpid()
+        events = [
+            {'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': name}}
+            for tid, name in self.threads.values()
+        ]
+        for phase in self.phases:
+            args = {key: value for key, value in phase.items()
+                    if key not in ('name', 'category', 'startMs', 'durationMs', 'thread')}
+            events.append({
+                'name': phase['name'],
+                'cat': phase['category'],
+                'ph': 'X',
+                'ts': round(phase['startMs'] * 1000),
+                'dur': round(phase['durationMs'] * 1000),
+                'pid': pid,
+                'tid': phase['thread'],
+                'args': args,
+            })
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def write(self, path):
+        """Write <path> and its Chrome counterpart <path minus .json>.chrome.json"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        chrome_path = os.path.splitext(path)[0] + '.chrome.json'
+        for target, data in ((path, self.to_json()), (chrome_path, self.to_chrome())):
+            tmp_path = target + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_path, target)
+        return path, chrome_path
+
+    def summary_lines(self, limit=8):
+        """The slowest phases, for the end-of-build report"""
+        timed = [phase for phase in self.phases if phase['status'] != 'skipped']
+        slowest = sorted(timed, key=lambda phase: phase['durationMs'], reverse=True)[:limit]
+        lines = []
+        for phase in slowest:
+            rss = f"  peak RSS {phase['peakRssMb']} MB" if 'peakRssMb' in phase else ''
+            lines.append(f"{phase['durationMs']:>10.1f} ms  {phase['name']}{rss}")
+        return lines
+
+
+def load_trace(path):
+    """Read a trace written by BuildTrace.write"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare_traces(previous, current):
+    """Lines comparing the total time of each phase name between two traces"""
+    def totals(trace):
+        result = {}
+        for phase in trace['phases']:
+            result[phase['name']] = result.get(phase['name'], 0) + phase['durationMs']
+        return result
+
+    before, after = totals(previous), totals(current)
+    lines = []
+    for name in sorted(before.keys() | after.keys(), key=lambda n: -after.get(n, before.get(n, 0))):
+        old, new = before.get(name), after.get(name)
+        if old is None:
+            lines.append(f"{name:<32} {'-':>10}  {new:>10.1f} ms  (new)")
+        elif new is None:
+            lines.append(f"{name:<32} {old:>10.1f}  {'-':>10}     (not run)")
+        else:
+            change = f"{(new - old) / old * 100:+.0f}%" if old else ''
+            lines.append(f"{name:<32} {old:>10.1f}  {new:>10.1f} ms  {change}")
+    lines.append(f"{'total':<32} {previous['totalMs']:>10.1f}  {current['totalMs']:>10.1f} ms")
+    return lines
@@ -0,0 +1,228 @@
+"""
+Find and replace across every page
+
+ContentIndex maps three kinds of keys to the (page, section) locations that
+hold them:
+
+- ('tech', name)  a technologies entry, lowercased
+- ('host', host)  the host of a githubLink or documentationLink
+- ('word', run)   a lowercased run of letters and digits in any field
+
+It is built once from every page and updated per page after saves; an
+update re-reads only the sections whose fields changed and only moves the
+postings of sections whose position changed. A query takes its candidate
+sections from the index and checks each one against the section itself,
+so the index decides which sections are visited, never what matches.
+
+plan_replace() turns a replacement into a patch in the journal's shape,
+{page name: [{'op': 'set', 'section': i, 'field': f, 'value': v}, ...]},
+holding only the sections that change, which callers apply and save as
+one batch.
+"""
+
+import re
+from urllib.parse import urlsplit, urlunsplit
+
+from content_store import ordered_sections, parse_technologies
+
+# Fields each kind of replacement reads and rewrites
+SCOPES = {
+    'technology': ['technologies'],
+    'host': ['githubLink', 'documentationLink'],
+    'link': ['githubLink', 'documentationLink'],
+    'text': ['title', 'description', 'text'],
+}
+LINK_FIELDS = ['githubLink', 'documentationLink']
+WORD_FIELDS = ['title', 'description', 'text', 'githubLink', 'documentationLink', 'technologies']
+
+WORD_RE = re.compile(r'[a-z0-9]+')
+NO_KEYS = frozenset()
+
+
+def link_host(value):
+    """Lowercased host of a link, or '' if it has none"""
+    try:
+        return urlsplit(value.strip()).hostname or ''
+    except ValueError:
+        return ''
+
+
+def section_fingerprint(section):
+    """The indexed fields of a section, to tell which sections an update changed"""
+    return tuple(
+        tuple(value) if isinstance(value, list) else value
+        for value in (section.get(field) for field in WORD_FIELDS)
+    )
+
+
+def section_keys(section):
+    """Every index key a section holds"""
+    keys = set()
+    technologies = section.get('technologies')
+    if isinstance(technologies, list):
+        keys.update(('tech', str(item).strip().lower()) for item in technologies)
+    for field in LINK_FIELDS:
+        value = section.get(field)
+        if isinstance(value, str) and link_host(value):
+            keys.add(('host', link_host(value)))
+    for field in WORD_FIELDS:
+        value = section.get(field)
+        if isinstance(value, list):
+            value = ' '.join(str(item) for item in value)
+        if isinstance(value, str):
+            keys.update(('word', run) for run in WORD_RE.findall(value.lower()))
+    return frozenset(keys)
+
+
+def query_words(find, whole_word):
+    """Word runs every match of find is certain to contain as whole runs
+
+    A run in the middle of the query is bounded by other characters of the
+    query, so it is a whole run wherever the query matches. Runs at either
+    end may be the tail or head of a longer run, unless whole_word rules
+    that out.
+    """
+    lowered = find.lower()
+    return [
+        match.group() for match in WORD_RE.finditer(lowered)
+        if whole_word or (match.start() > 0 and match.end() < len(lowered))
+    ]
+
+
+def compile_pattern(find, whole_word=False, ignore_case=False):
+    """Regex for a literal find string"""
+    pattern = re.escape(find)
+    if whole_word:
+        pattern = rf'(?<![A-Za-z0-9]){pattern}(?![A-Za-z0-9])'
+    return re.compile(pattern, re.IGNORECASE if ignore_case else 0)
+
+
+class ContentIndex:
+    """In-memory index from technologies, link hosts and words to section locations"""
+
+    def __init__(self):
+        self.pages = {}      # page name -> [(fingerprint, keys)] in display order
+        self.postings = {}   # key -> {(page name, section index)}
+
+    def update_page(self, page_name, page):
+        """Re-index a page after it changed (or index it for the first time)"""
+        old = self.pages.get(page_name, [])
+        known = {fingerprint: keys for fingerprint, keys in old}
+        new = []
+        for section in ordered_sections(page):
+            fingerprint = section_fingerprint(section)
+            keys = known.get(fingerprint)
+            if keys is None:
+                keys = section_keys(section)
+            new.append((fingerprint, keys))
+
+        for index in range(max(len(old), len(new))):
+            old_keys = old[index][1] if index < len(old) else NO_KEYS
+            new_keys = new[index][1] if index < len(new) else NO_KEYS
+            if old_keys is new_keys:
+                continue
+            location = (page_name, index)
+            for key in old_keys - new_keys:
+                postings = self.postings[key]
+                postings.discard(location)
+                if not postings:
+                    del self.postings[key]
+            for key in new_keys - old_keys:
+                self.postings.setdefault(key, set()).add(location)
+        self.pages[page_name] = new
+
+    def remove_page(self, page_name):
+        """Drop a page that no longer exists"""
+        if page_name in self.pages:
+            self.update_page(page_name, {'sections': []})
+            del self.pages[page_name]
+
+    def locate(self, key):
+        """Sorted (page name, section index) locations holding one key"""
+        return sorted(self.postings.get(key, ()))
+
+    def all_locations(self):
+        return [(page_name, index) for page_name, entries in self.pages.items() for index in range(len(entries))]
+
+    def candidates(self, scope, find, whole_word=False):
+        """Locations that may match a find in a scope (a superset of the real matches)"""
+        if scope == 'technology':
+            return self.locate(('tech', find.strip().lower()))
+        if scope == 'host':
+            return self.locate(('host', find.strip().lower()))
+        words = query_words(find, whole_word)
+        if not words:
+            # Nothing certain to look up (a single partial word): visit everything
+            return self.all_locations()
+        sets = sorted((self.postings.get(('word', word), set()) for word in set(words)), key=len)
+        return sorted(sets[0].intersection(*sets[1:]))
+
+    def stats_text(self):
+        sections = sum(len(entries) for entries in self.pages.values())
+        return f"Index: {len(self.pages)} pages, {sections} sections, {len(self.postings)} keys"
+
+
+def replace_technologies(technologies, find, replace):
+    """Rename (or with an empty replace, remove) one technology; returns the new list or None"""
+    target = find.strip().lower()
+    if not any(str(item).strip().lower() == target for item in technologies):
+        return None
+    renamed = []
+    for item in technologies:
+        value = replace.strip() if str(item).strip().lower() == target else item
+        if value and value not in renamed:
+            renamed.append(value)
+    return parse_technologies(renamed)
+
+
+def replace_host(link, find, replace):
+    """Move a link to another host; returns the new link or None"""
+    if link_host(link) != find.strip().lower():
+        return None
+    parts = urlsplit(link.strip())
+    netloc = parts.netloc
+    # Keep any user info and port, swap the host itself
+    start = netloc.lower().rindex(parts.hostname)
+    return urlunsplit(parts._replace(netloc=netloc[:start] + replace.strip() + netloc[start + len(parts.hostname):]))
+
+
+def plan_replace(index, load_page, scope, find, replace, whole_word=False, ignore_case=False):
+    """Work out a replacement across all indexed pages without changing any
+
+    Returns (patch, replacements): patch maps each affected page to set
+    operations for the fields that change, in section order.
+    """
+    if scope not in SCOPES:
+        raise ValueError(f"Unknown scope '{scope}' (expected one of: {', '.join(SCOPES)})")
+    if not find.strip():
+        raise ValueError("Nothing to find")
+    pattern = compile_pattern(find, whole_word, ignore_case) if scope in ('link', 'text') else None
+
+    patch = {}
+    replacements = 0
+    pages = {}
+    for page_name, section_index in index.candidates(scope, find, whole_word):
+        if page_name not in pages:
+            pages[page_name] = load_page(page_name)
+        sections = ordered_sections(pages[page_name])
+        if section_index >= len(sections):
+            continue
+        section = sections[section_index]
+        for field in SCOPES[scope]:
+            value = section.get(field)
+            if scope == 'technology':
+                new_value = replace_technologies(value, find, replace) if isinstance(value, list) else None
+                count = 1
+            elif not isinstance(value, str):
+                continue
+            elif scope == 'host':
+                new_value = replace_host(value, find, replace)
+                count = 1
+            else:
+                new_value, count = pattern.subn(lambda _: replace, value)
+            if new_value is None or new_value == value:
+                continue
+            replacements += count
+            patch.setdefault(page_name, []).append(
+                {'op': 'set', 'section': section_index, 'field': field, 'value': new_value})
+    return patch, replacements
@@ -1,12 +1,19 @@
 import React, { useState, useEffect } from 'react';
 import { Link } from 'react-router-dom';
 import ParticleBackground from '../components/ParticleBackground';
+import { getImageVariants, sortSections } from '../utils/api';
 
 const Landing = () => {
   console.log('Landing component is rendering');
   
   const [featuredProjects, setFeaturedProjects] = useState([]);
   const [expandedTech, setExpandedTech] = useState({});
+  const [profileVariants, setProfileVariants] = useState(null);
+  
+  // Responsive profile image variants (only present in production builds)
+  useEffect(() => {
+    getImageVariants('profile.jpeg').then(setProfileVariants);
+  }, []);
   
   // Fetch featured projects data
   useEffect(() => {
@@ -16,7 +23,7 @@ const Landing = () => {
         const basePath = process.env.NODE_ENV === 'production' ? '/Portfolio' : '';
         const response = await fetch(`${basePath}/data/projects.json`);
         if (response.ok) {
-          const data = await response.json();
+          const data = sortSections(await response.json());
           const featured = data.sections.slice(0, 3);
           setFeaturedProjects(featured);
           console.log('Featured projects loaded:', featured);
@@ -154,12 +161,26 @@ const Landing = () => {
                 <div className="absolute inset-0 bg-gradient-to-r from-blue-500/20 to-purple-500/20 rounded-2xl blur-xl transform rotate-2"></div>
                 <div className="relative bg-gradient-to-br from-gray-800/50 to-gray-900/50 backdrop-blur-sm rounded-2xl p-4 border border-gray-700/50 shadow-2xl">
                   <div className="rounded-xl overflow-hidden relative aspect-[4/3]">
+                    <picture>
+                      {profileVariants && ['avif', 'webp', 'jpeg']
+                        .filter((format) => profileVariants.variants[format])
+                        .map((format) => (
+                          <source
+                            key={format}
+                            type={`image/${format}`}
+                            sizes="(min-width: 1024px) 512px, 100vw"
+                            srcSet={profileVariants.variants[format]
+                              .map((variant) => `${process.env.PUBLIC_URL || ''}/${variant.src} ${variant.width}w`)
+                              .join(', ')}
+                          />
+                        ))}
                     <img 
-                      src={`${process.env.NODE_ENV === 'production' ? '/Portfolio' : ''}/profile.jpeg`}
+                      src={`${process.env.PUBLIC_URL || ''}/profile.jpeg`}
                   alt="Yuvashree Senthilmurugan" 
                       className="w-full h-full object-cover rounded-lg"
                       style={{ objectPosition: "center 32%" }}
                 />
+                    </picture>
                   </div>
                 </div>
                 {/* Decorative Glowing Orbs */}
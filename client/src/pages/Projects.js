@@ -1,18 +1,48 @@
 import React, { useState, useEffect } from 'react';
 import { useNavigate } from 'react-router-dom';
-import { getPageContent } from '../utils/api';
+import { getPageContent, searchContent } from '../utils/api';
 
 const Projects = () => {
   const [projects, setProjects] = useState([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
   const [expandedTech, setExpandedTech] = useState({});
+  const [query, setQuery] = useState('');
+  // Section indexes matching the query, best first (null: no query)
+  const [matches, setMatches] = useState(null);
   const navigate = useNavigate();
 
   useEffect(() => {
     fetchProjects();
   }, []);
 
+  useEffect(() => {
+    if (!query.trim()) {
+      setMatches(null);
+      return undefined;
+    }
+    let cancelled = false;
+    searchContent(query).then((results) => {
+      if (cancelled) return;
+      if (results === null) {
+        // No search index (development server): plain substring match
+        const needle = query.trim().toLowerCase();
+        setMatches(projects
+          .map((project, index) => [project, index])
+          .filter(([project]) => [project.title, project.description, ...(project.technologies || [])]
+            .some((value) => String(value || '').toLowerCase().includes(needle)))
+          .map(([, index]) => index));
+      } else {
+        setMatches(results.filter((result) => result.page === 'projects').map((result) => result.section));
+      }
+    });
+    return () => {
+      cancelled = true;
+    };
+  }, [query, projects]);
+
+  const visibleProjects = matches === null ? projects : matches.map((index) => projects[index]).filter(Boolean);
+
   const fetchProjects = async () => {
     try {
       // Use the updated getPageContent function that reads from static JSON files
@@ -61,11 +91,19 @@ const Projects = () => {
           <h1 className="text-4xl md:text-6xl font-bold gradient-heading mb-6">
             Projects
           </h1>
+          <input
+            type="search"
+            value={query}
+            onChange={(event) => setQuery(event.target.value)}
+            placeholder="Search projects, e.g. machine learning"
+            aria-label="Search projects"
+            className="w-full max-w-md px-4 py-2 bg-gray-800/80 text-white border border-gray-700/30 rounded-lg focus:outline-none focus:border-blue-400"
+          />
         </div>
 
         {/* Chroma Grid */}
         <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-8">
-          {projects.map((project, index) => (
+          {visibleProjects.map((project, index) => (
             <div
               key={project._id || index}
               className="group relative bg-gray-800/80 backdrop-blur-sm border border-gray-700/30 rounded-2xl p-8 hover:border-gray-600/50 transition-all duration-300 hover:scale-[1.02]"
@@ -144,6 +182,13 @@ const Projects = () => {
           ))}
         </div>
 
+        {/* No search results */}
+        {projects.length > 0 && visibleProjects.length === 0 && (
+          <div className="text-center text-gray-400 mt-16">
+            <p className="text-xl">No projects match "{query}".</p>
+          </div>
+        )}
+
         {/* Empty State */}
         {projects.length === 0 && (
           <div className="text-center text-gray-400 mt-16">
@@ -1,8 +1,70 @@
 // Static data utilities for GitHub Pages deployment
 // This replaces the dynamic API calls with static JSON file loading
 
+// Sections carry sparse/fractional `order` keys (a moved section only gets a
+// new key), so the array order in the JSON is not authoritative.
+export const sortSections = (page) => {
+  if (!page || !Array.isArray(page.sections)) {
+    return page;
+  }
+  const sections = [...page.sections].sort((a, b) => (a.order ?? 0) - (b.order ?? 0));
+  return { ...page, sections };
+};
+
+// data/manifest.json is regenerated on every save and build. It is the only
+// data file that has to be revalidated: the files it points at are named by
+// their content hash, so they can be cached forever.
+let manifestPromise = null;
+
+const loadManifest = () => {
+  if (!manifestPromise) {
+    manifestPromise = fetch(`${process.env.PUBLIC_URL || ''}/data/manifest.json`, { cache: 'no-cache' })
+      .then((response) => (response.ok ? response.json() : null))
+      .catch(() => null);
+  }
+  return manifestPromise;
+};
+
+// Every page in one request: written by rebuild-site.py into build/data/.
+// Loaded once per visit; falls back to per-page files when it's missing
+// (e.g. on the development server).
+let contentBundlePromise = null;
+
+const loadContentBundle = () => {
+  if (!contentBundlePromise) {
+    contentBundlePromise = (async () => {
+      const manifest = await loadManifest();
+      const bundlePaths = [
+        `${process.env.PUBLIC_URL || ''}/data/content-bundle.json`,
+        `./data/content-bundle.json`
+      ];
+      if (manifest && manifest.bundle && manifest.bundle.file) {
+        bundlePaths.unshift(`${process.env.PUBLIC_URL || ''}/data/${manifest.bundle.file}`);
+      }
+      for (const path of bundlePaths) {
+        try {
+          const response = await fetch(path);
+          if (response.ok) {
+            return await response.json();
+          }
+        } catch (error) {
+          continue;
+        }
+      }
+      console.log('Content bundle not available, loading pages individually');
+      return null;
+    })();
+  }
+  return contentBundlePromise;
+};
+
 // Content API Functions - now reads from static JSON files
 export const getPageContent = async (pageName) => {
+  const bundle = await loadContentBundle();
+  if (bundle && bundle.pages && bundle.pages[pageName]) {
+    return sortSections(bundle.pages[pageName].content);
+  }
+
   try {
     // For GitHub Pages, we need to handle the subdirectory structure
     const baseUrl = window.location.origin + window.location.pathname.split('/').slice(0, -1).join('/');
@@ -14,6 +76,13 @@ export const getPageContent = async (pageName) => {
       `${window.location.origin}/data/${pageName}.json`,
       `${window.location.origin}/Portfolio/data/${pageName}.json`
     ];
+    // Hashed copies only exist in a build, whose manifest also lists the bundle
+    // (the development server would answer a missing file with index.html)
+    const manifest = await loadManifest();
+    const entry = manifest && manifest.bundle && manifest.pages.find((page) => page.pageName === pageName);
+    if (entry && entry.file) {
+      possiblePaths.unshift(`${process.env.PUBLIC_URL || ''}/data/${entry.file}`);
+    }
     
     console.log(`Attempting to load ${pageName} content...`);
     console.log('Base URL:', baseUrl);
@@ -47,7 +116,7 @@ export const getPageContent = async (pageName) => {
     
     const data = await response.json();
     console.log(`Successfully loaded ${pageName} content from:`, response.url);
-    return data;
+    return sortSections(data);
   } catch (error) {
     console.error(`Error loading ${pageName} content:`, error);
     // Return default content structure if file doesn't exist
@@ -65,6 +134,99 @@ export const getPageContent = async (pageName) => {
   }
 };
 
+// Full-text search over every section. build/data/search-index.json is an
+// inverted index written by rebuild-site.py: `terms` is sorted and
+// `postings[i]` holds [docDelta, weight, ...] pairs for `terms[i]`.
+let searchIndexPromise = null;
+
+const loadSearchIndex = () => {
+  if (!searchIndexPromise) {
+    searchIndexPromise = fetch(`${process.env.PUBLIC_URL || ''}/data/search-index.json`)
+      .then((response) => (response.ok ? response.json() : null))
+      .catch(() => null);
+  }
+  return searchIndexPromise;
+};
+
+const findTerm = (terms, term) => {
+  let low = 0;
+  let high = terms.length - 1;
+  while (low <= high) {
+    const mid = (low + high) >> 1;
+    if (terms[mid] === term) return mid;
+    if (terms[mid] < term) low = mid + 1;
+    else high = mid - 1;
+  }
+  return -1;
+};
+
+// Split a query exactly as search_index.tokenize() splits indexed text: stop
+// words and single letters are never indexed, so they are dropped here too
+// instead of intersecting the results with an empty postings list
+export const tokenizeQuery = (query, stopWords) => {
+  const tokens = query.toLowerCase().match(/[a-z0-9]+(?:[+#]+|(?:[.-][a-z0-9]+)+)?/g) || [];
+  return tokens.filter((token) => !stopWords.has(token) && (token.length > 1 || !/^[a-z]+$/.test(token)));
+};
+
+// Returns [{ page, section, title, score }] for sections matching every query
+// term, or null when there is no search index (e.g. on the development server)
+export const searchContent = async (query) => {
+  const index = await loadSearchIndex();
+  if (!index) {
+    return null;
+  }
+  const queryTerms = tokenizeQuery(query, new Set(index.stopWords || []));
+  if (queryTerms.length === 0) {
+    return [];
+  }
+
+  let scores = null;
+  for (const term of queryTerms) {
+    const termIndex = findTerm(index.terms, term);
+    const termScores = new Map();
+    if (termIndex !== -1) {
+      const postings = index.postings[termIndex];
+      let docId = 0;
+      for (let i = 0; i < postings.length; i += 2) {
+        docId += postings[i];
+        termScores.set(docId, postings[i + 1]);
+      }
+    }
+    if (scores === null) {
+      scores = termScores;
+    } else {
+      for (const docId of Array.from(scores.keys())) {
+        if (termScores.has(docId)) {
+          scores.set(docId, scores.get(docId) + termScores.get(docId));
+        } else {
+          scores.delete(docId);
+        }
+      }
+    }
+  }
+
+  return Array.from(scores.entries())
+    .sort((a, b) => b[1] - a[1])
+    .map(([docId, score]) => {
+      const [page, section, title] = index.docs[docId];
+      return { page, section, title, score };
+    });
+};
+
+// Responsive image variants: build/images/manifest.json is written by
+// rebuild-site.py. Resolves to null when it's missing (development server).
+let imageManifestPromise = null;
+
+export const getImageVariants = async (imageName) => {
+  if (!imageManifestPromise) {
+    imageManifestPromise = fetch(`${process.env.PUBLIC_URL || ''}/images/manifest.json`)
+      .then((response) => (response.ok ? response.json() : null))
+      .catch(() => null);
+  }
+  const manifest = await imageManifestPromise;
+  return (manifest && manifest.images && manifest.images[imageName]) || null;
+};
+
 // Legacy function for backward compatibility - now returns a promise that resolves immediately
 export const updatePageContent = async (pageName, content) => {
   console.warn('updatePageContent is not available in static mode. Content must be updated manually in the JSON files.');
@@ -1,23 +1,112 @@
-import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext, filedialog
+import time
+
+# Measured from the top of the script so the headless CLI can report its startup cost
+STARTED_AT = time.perf_counter()
+
+import argparse
 import json
 import os
-from datetime import datetime
+import queue
+import sys
+
+import content_schema
+import content_store
+import html_normalizer
+from bulk_edit import SCOPES, ContentIndex, plan_replace
+from content_store import PageCache, PageWriter, WEBSITE_PAGES
+from edit_history import EditHistory, apply_operation, field_operations, invert
+
+# tkinter is imported lazily so the headless CLI never pays for it
+tk = ttk = messagebox = scrolledtext = filedialog = None
+
+def import_tk():
+    """Import tkinter for the GUI"""
+    global tk, ttk, messagebox, scrolledtext, filedialog
+    import tkinter as tk
+    from tkinter import ttk, messagebox, scrolledtext, filedialog
+
+# Milliseconds of typing inactivity before the preview is re-rendered
+PREVIEW_DEBOUNCE_MS = 150
+
+# How often the Tk thread checks for page files changed outside the editor
+DATA_WATCH_POLL_MS = 250
+
+def render_preview_text(content):
+    """Simple HTML to text conversion for preview"""
+    # Remove HTML tags but keep line breaks
+    return html_normalizer.to_text(content)
+
+def diff_line_ranges(old_lines, new_lines):
+    """Return (start, old_end, new_end) of the single line range that differs"""
+    limit = min(len(old_lines), len(new_lines))
+    start = 0
+    while start < limit and old_lines[start] == new_lines[start]:
+        start += 1
+    old_end, new_end = len(old_lines), len(new_lines)
+    while old_end > start and new_end > start and old_lines[old_end - 1] == new_lines[new_end - 1]:
+        old_end -= 1
+        new_end -= 1
+    return start, old_end, new_end
+
+def render_preview_job(content, previous_lines):
+    """Render the preview and diff it against what is on screen (runs off the Tk thread)"""
+    started = time.perf_counter()
+    lines = render_preview_text(content).splitlines(keepends=True)
+    ranges = diff_line_ranges(previous_lines, lines)
+    return lines, ranges, (time.perf_counter() - started) * 1000
+
+def page_name_for_path(path):
+    """Map a page file or page journal path to its page name"""
+    name = os.path.basename(path)
+    for suffix in (content_store.JOURNAL_SUFFIX, '.json'):
+        if name.endswith(suffix):
+            return name[:-len(suffix)]
+    return None
 
 class StaticContentEditor:
-    def __init__(self, root):
+    def __init__(self, root, data_dir=None):
         self.root = root
         self.root.title("Static Content Editor")
         self.root.geometry("1200x800")
         self.root.configure(bg='#1f2937')
         
         # Data directory path
-        self.data_dir = os.path.join(os.path.dirname(__file__), 'client', 'public', 'data')
+        self.data_dir = data_dir or os.path.join(os.path.dirname(__file__), 'client', 'public', 'data')
+        self.page_cache = PageCache(self.data_dir)
+        self.page_writer = PageWriter(self.data_dir)
         
         self.current_page = None
         self.current_section = None
+        
+        # Undo/redo for the page on screen (starts over when another page is loaded)
+        self.history = EditHistory()
+        
+        # Technology/link host/word index for find and replace across pages,
+        # built the first time it is needed and updated after every save
+        self.content_index = None
+        
+        # Preview engine state
+        from concurrent.futures import ThreadPoolExecutor
+        self.preview_executor = ThreadPoolExecutor(max_workers=1)
+        self.preview_after_id = None
+        self.preview_generation = 0
+        self.preview_lines = []
+        self.preview_render_count = 0
+        self.preview_last_ms = 0.0
+        self.preview_total_ms = 0.0
+        
+        # Pages changed on disk by something other than this editor
+        self.data_watcher = None
+        self.watch_queue = queue.Queue()
+        self.changed_pages = set()
+        
         self.setup_ui()
         self.load_pages()
+        
+        # Pick up finished background saves and flush pending ones on exit
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.poll_saves()
+        self.start_watching()
     
     def setup_ui(self):
         # Main container
@@ -87,10 +176,22 @@ class StaticContentEditor:
         delete_section_btn = ttk.Button(buttons_frame, text="Delete Section", command=self.delete_section)
         delete_section_btn.pack(fill=tk.X, pady=(0, 5))
         
+        # Undo/redo buttons (also Ctrl+Z, Ctrl+Y / Ctrl+Shift+Z)
+        history_frame = ttk.Frame(buttons_frame)
+        history_frame.pack(fill=tk.X, pady=(0, 5))
+        undo_btn = ttk.Button(history_frame, text="Undo", command=self.undo)
+        undo_btn.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 2))
+        redo_btn = ttk.Button(history_frame, text="Redo", command=self.redo)
+        redo_btn.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(2, 0))
+        
         # Save button
         save_btn = ttk.Button(buttons_frame, text="Save Changes", command=self.save_changes)
         save_btn.pack(fill=tk.X, pady=(0, 5))
         
+        # Find and replace across pages
+        replace_btn = ttk.Button(buttons_frame, text="Find & Replace...", command=self.open_bulk_replace)
+        replace_btn.pack(fill=tk.X, pady=(0, 5))
+        
         # Refresh button
         refresh_btn = ttk.Button(buttons_frame, text="Refresh", command=self.refresh_data)
         refresh_btn.pack(fill=tk.X)
@@ -245,16 +346,32 @@ class StaticContentEditor:
         )
         self.preview_text.pack(fill=tk.BOTH, expand=True, pady=(5, 0))
         
+        # Preview render timing
+        self.preview_timing_var = tk.StringVar()
+        preview_timing_label = ttk.Label(preview_frame, textvariable=self.preview_timing_var, font=('Arial', 8), foreground='gray')
+        preview_timing_label.pack(anchor=tk.E)
+        
         # Bind events for automatic line break conversion
         self.content_text.bind('<KeyRelease>', self.update_preview)
         self.content_text.bind('<Return>', self.handle_enter_key)
-        self.content_text.bind('<KeyPress>', self.handle_key_press)
+        
+        # Undo/redo page edits from anywhere in the window
+        self.root.bind('<Control-z>', self.undo)
+        self.root.bind('<Control-y>', self.redo)
+        self.root.bind('<Control-Shift-Z>', self.redo)
         
         # Status bar
         self.status_var = tk.StringVar()
         self.status_var.set("Ready - Select a page and section to edit")
-        status_bar = ttk.Label(self.root, textvariable=self.status_var, relief=tk.SUNKEN)
-        status_bar.pack(side=tk.BOTTOM, fill=tk.X)
+        status_frame = ttk.Frame(self.root)
+        status_frame.pack(side=tk.BOTTOM, fill=tk.X)
+        status_bar = ttk.Label(status_frame, textvariable=self.status_var, relief=tk.SUNKEN)
+        status_bar.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        
+        # Page cache counters
+        self.cache_status_var = tk.StringVar()
+        cache_status_bar = ttk.Label(status_frame, textvariable=self.cache_status_var, relief=tk.SUNKEN)
+        cache_status_bar.pack(side=tk.RIGHT)
     
     def load_pages(self):
         """Load all pages from JSON files"""
@@ -266,19 +383,10 @@ class StaticContentEditor:
                 return
             
             # Only show pages that are actually used by the website
-            # Based on the routes in App.js and PageTemplate usage
-            website_pages = [
-                'home',      # About page (route: /about, component: Home)
-                'education', # Education page (route: /education)
-                'experience', # Experience page (route: /experience)
-                'projects'   # Projects page (route: /projects)
-            ]
-            
             # Check which pages exist and add them
             available_pages = []
-            for page_name in website_pages:
-                file_path = os.path.join(self.data_dir, f"{page_name}.json")
-                if os.path.exists(file_path):
+            for page_name in WEBSITE_PAGES:
+                if self.page_cache.exists(page_name):
                     available_pages.append(page_name)
                     self.pages_listbox.insert(tk.END, page_name)
             
@@ -294,9 +402,8 @@ class StaticContentEditor:
         page_name = self.pages_listbox.get(self.pages_listbox.curselection())
         
         try:
-            file_path = os.path.join(self.data_dir, f"{page_name}.json")
-            with open(file_path, 'r', encoding='utf-8') as f:
-                self.current_page = json.load(f)
+            self.current_page = self.load_page(page_name)
+            self.history.clear()
             
             # Load page title
             self.page_title_entry.delete(0, tk.END)
@@ -347,14 +454,9 @@ class StaticContentEditor:
             # Load content - handle both HTML and plain text
             content = section.get('text', '')
             
-            # If content has HTML <br> tags, convert them to line breaks for editing
-            if '<br>' in content:
-                editable_content = content.replace('<br>', '\n')
-            else:
-                editable_content = content
-            
+            # One line per block, with <br> shown as a line break
             self.content_text.delete(1.0, tk.END)
-            self.content_text.insert(1.0, editable_content)
+            self.content_text.insert(1.0, self.convert_html_to_plain_text(content))
             
             # Update preview
             self.update_preview()
@@ -365,22 +467,26 @@ class StaticContentEditor:
         """Handle double-click on section to edit"""
         self.on_section_select(event)
     
-    def add_section(self):
-        """Add a new section to the current page"""
-        if not self.current_page:
-            messagebox.showwarning("Warning", "Please select a page first")
-            return
-        
-        # Clear form
+    def clear_section_form(self):
+        """Empty the section form so a later save can't write stale values"""
         self.section_title_entry.delete(0, tk.END)
         self.github_link_entry.delete(0, tk.END)
         self.documentation_link_entry.delete(0, tk.END)
         self.description_entry.delete(0, tk.END)
         self.technologies_entry.delete(0, tk.END)
         self.content_text.delete(1.0, tk.END)
+    
+    def add_section(self):
+        """Add a new section to the current page"""
+        if not self.current_page:
+            messagebox.showwarning("Warning", "Please select a page first")
+            return
         
-        # Add to sections list
-        self.sections_listbox.insert(tk.END, "New Section")
+        self.clear_section_form()
+        
+        # Add to sections list (one placeholder row at most)
+        if self.sections_listbox.size() == len(self.current_page.get('sections', [])):
+            self.sections_listbox.insert(tk.END, "New Section")
         self.sections_listbox.selection_clear(0, tk.END)
         self.sections_listbox.selection_set(tk.END)
         
@@ -395,16 +501,17 @@ class StaticContentEditor:
         
         if messagebox.askyesno("Confirm Delete", "Are you sure you want to delete this section?"):
             try:
-                # Remove from current page data
-                sections = self.current_page.get('sections', [])
-                if self.current_section < len(sections):
-                    sections.pop(self.current_section)
-                    self.current_page['sections'] = sections
+                # Remove from current page data (an unsaved new section only has a row)
+                if self.current_section < len(self.current_page.get('sections', [])):
+                    section = content_store.delete_section(self.current_page, self.current_section)
+                    self.history.record("delete section", [
+                        {'op': 'delete', 'section': self.current_section, 'value': section}])
                 
-                # Refresh sections list
-                self.refresh_sections_list()
+                # Drop its row from the sections list
+                self.sections_listbox.delete(self.current_section)
                 
                 self.current_section = None
+                self.clear_section_form()
                 self.status_var.set("Section deleted")
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to delete section: {e}")
@@ -416,89 +523,270 @@ class StaticContentEditor:
             return
         
         try:
-            # Update page title
-            new_title = self.page_title_entry.get()
-            self.current_page['title'] = new_title
-            
-            # Update or add section
-            section_title = self.section_title_entry.get()
-            github_link = self.github_link_entry.get()
-            documentation_link = self.documentation_link_entry.get()
-            description = self.description_entry.get()
-            technologies_str = self.technologies_entry.get()
-            content_text = self.content_text.get(1.0, tk.END).strip()
-            
-            # Parse technologies string into list
-            technologies = []
-            if technologies_str.strip():
-                technologies = [tech.strip() for tech in technologies_str.split(',') if tech.strip()]
+            fields = self.form_fields()
             
-            # Convert plain text line breaks to HTML line breaks
-            content_text = self.convert_line_breaks_to_html(content_text)
-            
-            if not section_title:
+            if not fields['title']:
                 messagebox.showwarning("Warning", "Section title is required")
                 return
             
-            if self.current_section is not None and self.current_section < len(self.current_page.get('sections', [])):
-                # Update existing section
-                section = self.current_page['sections'][self.current_section]
-                section['title'] = section_title
-                section['githubLink'] = github_link
-                section['documentationLink'] = documentation_link
-                section['description'] = description
-                section['technologies'] = technologies
-                section['text'] = content_text
+            # Update page title
+            old_title = self.current_page.get('title', '')
+            old_updated = self.current_page.get('lastUpdated')
+            self.current_page['title'] = self.page_title_entry.get()
+            operations = field_operations({'title': old_title}, self.current_page, ['title'])
+            
+            # Update or add section
+            is_new = self.current_section is None or self.current_section >= len(self.current_page.get('sections', []))
+            if not is_new:
+                section = content_store.get_section(self.current_page, self.current_section)
+                before = content_store.copy_section(section)
+                for field, value in fields.items():
+                    content_store.set_section_field(section, field, value)
+                operations += field_operations(before, section, content_store.SECTION_FIELDS, self.current_section)
             else:
-                # Add new section
-                new_section = {
-                    'title': section_title,
-                    'githubLink': github_link,
-                    'documentationLink': documentation_link,
-                    'description': description,
-                    'technologies': technologies,
-                    'text': content_text,
-                    'order': len(self.current_page.get('sections', []))
-                }
-                self.current_page['sections'].append(new_section)
+                section = content_store.add_section(self.current_page, fields)
+                operations.append({'op': 'add', 'section': len(self.current_page['sections']) - 1,
+                                   'value': content_store.copy_section(section)})
             
             # Update last updated timestamp
-            self.current_page['lastUpdated'] = datetime.now().isoformat()
+            content_store.touch_page(self.current_page)
             
-            # Save to file
+            # Never write a page the site can't render; an invalid edit is
+            # taken back out of the model so nothing else saves it later
             page_name = self.current_page['pageName']
-            file_path = os.path.join(self.data_dir, f"{page_name}.json")
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(self.current_page, f, indent=2, ensure_ascii=False)
+            errors = content_schema.validate_page(self.current_page, page_name)
+            if errors:
+                for operation in reversed(operations):
+                    apply_operation(self.current_page, invert(operation))
+                if old_updated is None:
+                    self.current_page.pop('lastUpdated', None)
+                else:
+                    self.current_page['lastUpdated'] = old_updated
+                shown = '\n'.join(str(error) for error in errors[:10])
+                more = f"\n...and {len(errors) - 10} more" if len(errors) > 10 else ''
+                messagebox.showerror("Invalid Content", f"The page was not saved:\n\n{shown}{more}")
+                return
             
-            # Refresh data
-            self.refresh_data()
+            self.history.record(f"edit of {fields['title']}", operations)
+            if not is_new:
+                self.retitle_section_row(self.current_section)
+            else:
+                # The new section takes over the "New Section" row if there is one
+                self.current_section = len(self.current_page['sections']) - 1
+                if self.sections_listbox.size() > self.current_section:
+                    self.retitle_section_row(self.current_section)
+                else:
+                    self.sections_listbox.insert(tk.END, fields['title'])
+                    self.sections_listbox.selection_clear(0, tk.END)
+                    self.sections_listbox.selection_set(self.current_section)
             
-            # Show success message with website refresh info
-            messagebox.showinfo("Success", 
-                "Changes saved successfully!\n\n" +
-                "The website will automatically reflect your changes.\n" +
-                "If you don't see updates immediately, refresh your browser.\n\n" +
-                "For production deployment, run: python3 rebuild-site.py")
+            # Hand the page to the background writer; the in-memory model is already current
+            self.page_writer.submit(page_name, self.current_page)
+            if self.content_index is not None:
+                self.content_index.update_page(page_name, self.current_page)
+            
+            self.status_var.set(f"Saving {page_name}...")
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save changes: {e}")
     
+    def form_fields(self):
+        """Read the section form as a dict of editable fields"""
+        return {
+            'title': self.section_title_entry.get(),
+            'githubLink': self.github_link_entry.get(),
+            'documentationLink': self.documentation_link_entry.get(),
+            'description': self.description_entry.get(),
+            'technologies': self.technologies_entry.get(),
+            # Convert plain text line breaks to HTML line breaks
+            'text': self.convert_line_breaks_to_html(self.content_text.get(1.0, tk.END).strip()),
+        }
+    
+    def has_unsaved_changes(self):
+        """Check whether the current page or the section form holds edits that were not saved"""
+        if not self.current_page:
+            return False
+        page_name = self.current_page['pageName']
+        saved = self.page_writer.latest(page_name)
+        if saved is None:
+            entry = self.page_cache.peek(page_name)
+            saved = entry[1] if entry is not None else None
+        # Deletes and drags change the model before they are saved
+        return saved != self.current_page or self.form_has_edits()
+    
+    def form_has_edits(self):
+        """Check whether the page title or the section form differs from the page model"""
+        if not self.current_page:
+            return False
+        if self.page_title_entry.get() != self.current_page.get('title', ''):
+            return True
+        if self.current_section is None:
+            return False
+        fields = self.form_fields()
+        sections = self.current_page.get('sections', [])
+        if self.current_section >= len(sections):
+            # A new section that was never saved
+            return any(fields.values())
+        return not content_store.section_matches(sections[self.current_section], fields)
+    
     def refresh_data(self):
         """Refresh all data"""
         self.load_pages()
         if self.current_page:
-            # Reload current page
+            # Reload current page (served from the cache unless the file changed)
             page_name = self.current_page['pageName']
-            file_path = os.path.join(self.data_dir, f"{page_name}.json")
-            with open(file_path, 'r', encoding='utf-8') as f:
-                self.current_page = json.load(f)
+            self.current_page = self.load_page(page_name)
+            self.history.clear()
             
             # Reload sections
             self.refresh_sections_list()
         
         self.status_var.set("Data refreshed")
     
+    def load_page(self, page_name):
+        """Load a page, preferring a save that has not reached the disk yet"""
+        page = self.page_writer.latest(page_name)
+        if page is None:
+            page = self.page_cache.load(page_name)
+        self.update_cache_status()
+        return page
+    
+    def poll_saves(self):
+        """Report background saves that have finished"""
+        self.drain_saves()
+        self.root.after(100, self.poll_saves)
+    
+    def drain_saves(self):
+        """Record finished background saves in the page cache"""
+        for page_name, page, key, error in self.page_writer.drain_results():
+            if error is not None:
+                messagebox.showerror("Error", f"Failed to save changes: {error}")
+                continue
+            self.page_cache.store(page_name, page, key)
+            self.status_var.set(f"Saved {page_name} - for production deployment, run: python3 rebuild-site.py")
+    
+    def start_watching(self):
+        """Watch the data directory so pages edited elsewhere are reloaded"""
+        from file_watcher import WatcherThread, create_watcher
+        try:
+            watcher = create_watcher([self.data_dir])
+        except OSError as e:
+            self.status_var.set(f"Not watching {self.data_dir} for changes: {e}")
+            return
+        self.data_watcher = WatcherThread(watcher, self.watch_queue.put)
+        self.poll_data_changes()
+    
+    def poll_data_changes(self):
+        """Apply page files changed outside the editor"""
+        while True:
+            try:
+                paths = self.watch_queue.get_nowait()
+            except queue.Empty:
+                break
+            for path in paths:
+                page_name = page_name_for_path(path)
+                if page_name in WEBSITE_PAGES:
+                    self.changed_pages.add(page_name)
+        
+        # Our own saves show up here too; wait until they are recorded in the
+        # cache so they can be told apart from outside edits
+        if self.changed_pages and not self.page_writer.is_busy():
+            self.drain_saves()
+            for page_name in sorted(self.changed_pages):
+                self.apply_external_change(page_name)
+            self.changed_pages.clear()
+            self.update_cache_status()
+        self.root.after(DATA_WATCH_POLL_MS, self.poll_data_changes)
+    
+    def apply_external_change(self, page_name):
+        """Reload one page whose file (or journal) changed on disk"""
+        key = self.page_cache.stat_key(page_name)
+        self.update_page_row(page_name, key is not None)
+        entry = self.page_cache.peek(page_name)
+        if entry is not None and entry[0] == key:
+            # Written by this editor, or touched without changing
+            return
+        self.page_writer.forget(page_name)
+        if self.content_index is not None:
+            if key is None:
+                self.content_index.remove_page(page_name)
+            else:
+                self.content_index.update_page(page_name, self.page_cache.load(page_name))
+        
+        is_current = self.current_page is not None and self.current_page.get('pageName') == page_name
+        if key is None:
+            self.page_cache.invalidate(page_name)
+            if is_current:
+                self.status_var.set(f"{page_name}.json was deleted on disk - saving will recreate it")
+            return
+        if not is_current:
+            # Not on screen: the cache re-reads it the next time it is selected
+            self.status_var.set(f"{page_name}.json changed on disk")
+            return
+        
+        unsaved = self.has_unsaved_changes()
+        page = self.page_cache.load(page_name)
+        if unsaved and not messagebox.askyesno(
+                "Page Changed on Disk",
+                f"{page_name}.json was changed outside the editor while you have unsaved edits.\n\n"
+                "Reload it and discard your edits?\n"
+                "(No keeps your edits; saving will overwrite the changes on disk.)"):
+            self.status_var.set(f"Kept your edits to {page_name} - saving will overwrite the changes on disk")
+            return
+        self.reload_current_page(page)
+        self.status_var.set(f"Reloaded {page_name} - it was changed on disk")
+    
+    def reload_current_page(self, page):
+        """Swap in a new version of the current page, touching only the rows that changed"""
+        old_titles = [section.get('title', 'Untitled') for section in content_store.ordered_sections(self.current_page)]
+        new_titles = [section.get('title', 'Untitled') for section in content_store.ordered_sections(page)]
+        if self.sections_listbox.size() > len(old_titles):
+            # Drop the placeholder row of an unsaved new section
+            self.sections_listbox.delete(len(old_titles), tk.END)
+        start, old_end, new_end = diff_line_ranges(old_titles, new_titles)
+        if old_end > start:
+            self.sections_listbox.delete(start, old_end - 1)
+        if new_end > start:
+            self.sections_listbox.insert(start, *new_titles[start:new_end])
+        
+        self.current_page = page
+        self.history.clear()
+        self.page_title_entry.delete(0, tk.END)
+        self.page_title_entry.insert(0, page.get('title', ''))
+        
+        self.sections_listbox.selection_clear(0, tk.END)
+        if self.current_section is not None and self.current_section < len(new_titles):
+            self.sections_listbox.selection_set(self.current_section)
+            self.on_section_select(None)
+        else:
+            self.current_section = None
+            self.clear_section_form()
+    
+    def update_page_row(self, page_name, exists):
+        """Add or remove one page in the pages list, keeping the website order"""
+        rows = list(self.pages_listbox.get(0, tk.END))
+        if exists and page_name not in rows:
+            position = WEBSITE_PAGES.index(page_name)
+            index = sum(1 for name in rows if WEBSITE_PAGES.index(name) < position)
+            self.pages_listbox.insert(index, page_name)
+        elif not exists and page_name in rows:
+            self.pages_listbox.delete(rows.index(page_name))
+    
+    def on_close(self):
+        """Finish pending saves before closing the window"""
+        if self.data_watcher is not None:
+            self.data_watcher.stop()
+        if self.page_writer.is_busy():
+            self.status_var.set("Finishing pending saves...")
+            self.root.update_idletasks()
+        self.page_writer.close()
+        self.preview_executor.shutdown(wait=False)
+        self.root.destroy()
+    
+    def update_cache_status(self):
+        """Show the page cache hit/miss counters in the status bar"""
+        self.cache_status_var.set(self.page_cache.stats_text())
+    
     def make_bold(self):
         """Make selected text bold"""
         try:
@@ -560,8 +848,7 @@ class StaticContentEditor:
         try:
             selected_text = self.content_text.get(tk.SEL_FIRST, tk.SEL_LAST)
             # Remove HTML tags
-            import re
-            clean_text = re.sub(r'<[^>]+>', '', selected_text)
+            clean_text = html_normalizer.strip_tags(selected_text)
             self.content_text.delete(tk.SEL_FIRST, tk.SEL_LAST)
             self.content_text.insert(tk.SEL_FIRST, clean_text)
         except tk.TclError:
@@ -569,29 +856,49 @@ class StaticContentEditor:
         self.update_preview()
     
     def update_preview(self, event=None):
-        """Update the preview with formatted content"""
+        """Schedule a preview render once typing pauses"""
+        if self.preview_after_id is not None:
+            self.root.after_cancel(self.preview_after_id)
+        self.preview_after_id = self.root.after(PREVIEW_DEBOUNCE_MS, self.start_preview_render)
+    
+    def start_preview_render(self):
+        """Hand the current content to the preview worker"""
+        self.preview_after_id = None
+        self.preview_generation += 1
+        content = self.content_text.get(1.0, tk.END)
+        future = self.preview_executor.submit(render_preview_job, content, self.preview_lines)
+        self.poll_preview_render(future, self.preview_generation)
+    
+    def poll_preview_render(self, future, generation):
+        """Apply the worker result on the Tk thread once it is ready"""
+        if not future.done():
+            self.root.after(10, self.poll_preview_render, future, generation)
+            return
+        if generation != self.preview_generation:
+            # A newer render has been scheduled, drop this one
+            return
         try:
-            content = self.content_text.get(1.0, tk.END)
-            self.preview_text.config(state=tk.NORMAL)
-            self.preview_text.delete(1.0, tk.END)
-            
-            # Simple HTML to text conversion for preview
-            import re
-            # Remove HTML tags but keep line breaks
-            preview_text = re.sub(r'<br/?>', '\n', content)
-            preview_text = re.sub(r'</p>', '\n\n', preview_text)
-            preview_text = re.sub(r'<[^>]+>', '', preview_text)
+            lines, (start, old_end, new_end), elapsed_ms = future.result()
+            self.apply_preview_lines(lines, start, old_end, new_end)
             
-            self.preview_text.insert(1.0, preview_text)
-            self.preview_text.config(state=tk.DISABLED)
+            self.preview_render_count += 1
+            self.preview_last_ms = elapsed_ms
+            self.preview_total_ms += elapsed_ms
+            self.preview_timing_var.set(
+                f"Preview render #{self.preview_render_count}: {elapsed_ms:.1f} ms "
+                f"(avg {self.preview_total_ms / self.preview_render_count:.1f} ms)")
         except Exception as e:
             print(f"Preview update error: {e}")
     
-    def handle_key_press(self, event):
-        """Handle key press events"""
-        # Store the current cursor position for potential undo
-        self.last_cursor_pos = self.content_text.index(tk.INSERT)
-        return True  # Allow the key press to proceed
+    def apply_preview_lines(self, lines, start, old_end, new_end):
+        """Replace only the changed line range in the preview widget"""
+        if start == old_end and start == new_end:
+            return
+        self.preview_text.config(state=tk.NORMAL)
+        self.preview_text.delete(f"{start + 1}.0", f"{old_end + 1}.0")
+        self.preview_text.insert(f"{start + 1}.0", ''.join(lines[start:new_end]))
+        self.preview_text.config(state=tk.DISABLED)
+        self.preview_lines = lines
     
     def handle_enter_key(self, event):
         """Handle Enter key press to add line breaks"""
@@ -606,14 +913,12 @@ class StaticContentEditor:
     
     def convert_line_breaks_to_html(self, text):
         """Convert plain text line breaks to HTML line breaks"""
-        # Split by actual line breaks and join with <br>
-        lines = text.split('\n')
-        return '<br>'.join(lines)
+        # Breaks inside a block become <br>; the ones between blocks are dropped
+        return html_normalizer.normalize_html(text)
     
     def convert_html_to_plain_text(self, text):
         """Convert HTML line breaks back to plain text for editing"""
-        # Replace <br> tags with actual line breaks
-        return text.replace('<br>', '\n')
+        return html_normalizer.to_editable(text)
     
     def add_paragraph(self):
         """Add a properly formatted paragraph"""
@@ -672,30 +977,22 @@ class StaticContentEditor:
                     if (self.drag_start_index < len(sections) and 
                         self.drag_current_index < len(sections)):
                         
-                        # Remove the item from its original position
-                        item = sections.pop(self.drag_start_index)
-                        
-                        # Insert it at the new position
-                        sections.insert(self.drag_current_index, item)
-                        
-                        # Update the order field for all sections
-                        for i, section in enumerate(sections):
-                            section['order'] = i
-                        
-                        # Update the current page data
-                        self.current_page['sections'] = sections
+                        # Move the item; only its own order field changes
+                        old_order = sections[self.drag_start_index].get('order', 0)
+                        content_store.move_section(self.current_page, self.drag_start_index, self.drag_current_index)
+                        self.history.record("section move", [{
+                            'op': 'move', 'from': self.drag_start_index, 'to': self.drag_current_index,
+                            'orders': [old_order, sections[self.drag_current_index].get('order', 0)],
+                        }])
                         
                         # Clear current section selection to prevent content mixing
                         self.current_section = None
                         
                         # Clear the form fields
-                        self.section_title_entry.delete(0, tk.END)
-                        self.github_link_entry.delete(0, tk.END)
-                        self.documentation_link_entry.delete(0, tk.END)
-                        self.content_text.delete(1.0, tk.END)
+                        self.clear_section_form()
                         
-                        # Refresh the sections listbox
-                        self.refresh_sections_list()
+                        # Move just the dragged row
+                        self.move_section_row(self.drag_start_index, self.drag_current_index)
                         
                         # Update status
                         self.status_var.set(f"Section moved from position {self.drag_start_index + 1} to {self.drag_current_index + 1}. Please select a section to edit.")
@@ -707,18 +1004,432 @@ class StaticContentEditor:
         self.drag_start_index = None
         self.drag_current_index = None
     
+    def undo(self, event=None):
+        """Revert the newest page edit"""
+        self.step_history(self.history.undo, self.history.can_undo(), "Undid", "Nothing to undo")
+        return 'break'
+    
+    def redo(self, event=None):
+        """Re-apply the newest undone page edit"""
+        self.step_history(self.history.redo, self.history.can_redo(), "Redid", "Nothing to redo")
+        return 'break'
+    
+    def step_history(self, step, available, done_text, empty_text):
+        """Apply an undo or redo step to the page model and mirror it in the sections list"""
+        if not self.current_page:
+            return
+        if not available:
+            self.status_var.set(empty_text)
+            return
+        if self.form_has_edits() and not messagebox.askyesno(
+                "Unsaved Form Edits", "Discard the edits in the section form?"):
+            return
+        
+        # Drop the placeholder row of an unsaved new section
+        count = len(content_store.ordered_sections(self.current_page))
+        if self.sections_listbox.size() > count:
+            self.sections_listbox.delete(count, tk.END)
+        try:
+            label, operations = step(self.current_page)
+        except Exception as e:
+            # The model no longer matches the history; it can't be trusted
+            self.history.clear()
+            messagebox.showerror("Error", f"Failed to apply history step: {e}")
+            return
+        
+        selected = self.current_section
+        for operation in operations:
+            selected = self.apply_history_rows(operation, selected)
+        
+        self.page_title_entry.delete(0, tk.END)
+        self.page_title_entry.insert(0, self.current_page.get('title', ''))
+        self.sections_listbox.selection_clear(0, tk.END)
+        if selected is not None and selected < len(self.current_page['sections']):
+            self.sections_listbox.selection_set(selected)
+            self.on_section_select(None)
+        else:
+            self.current_section = None
+            self.clear_section_form()
+        self.status_var.set(f"{done_text} {label} - save to keep it ({self.history.stats_text()})")
+    
+    def apply_history_rows(self, operation, selected):
+        """Update the sections list for one applied history operation; returns the row to select"""
+        op = operation['op']
+        if op == 'set':
+            if 'section' not in operation:
+                return selected
+            if operation['field'] == 'title':
+                self.retitle_section_row(operation['section'])
+            return operation['section']
+        if op == 'add':
+            self.sections_listbox.insert(operation['section'], operation['value'].get('title', 'Untitled'))
+            return operation['section']
+        if op == 'delete':
+            self.sections_listbox.delete(operation['section'])
+            return None
+        self.move_section_row(operation['from'], operation['to'])
+        return operation['to']
+    
+    def ensure_content_index(self):
+        """Return the find-and-replace index, building it on first use"""
+        if self.content_index is None:
+            # Saved versions only: unsaved edits on screen are not replaced into the files
+            self.content_index = ContentIndex()
+            for page_name in WEBSITE_PAGES:
+                if self.page_cache.exists(page_name):
+                    self.content_index.update_page(page_name, self.load_page(page_name))
+        return self.content_index
+    
+    def plan_bulk_replace(self, scope, find, replace, whole_word=False, ignore_case=False):
+        """Return (patch, replacements) for a replacement across the saved version of every page"""
+        return plan_replace(self.ensure_content_index(), self.load_page, scope, find, replace,
+                            whole_word, ignore_case)
+    
+    def plan_screen_replace(self, scope, find, replace, whole_word=False, ignore_case=False):
+        """Set operations for the same replacement on the page on screen, unsaved edits included"""
+        if not self.current_page:
+            return []
+        page_name = self.current_page['pageName']
+        index = ContentIndex()
+        index.update_page(page_name, self.current_page)
+        patch, _ = plan_replace(index, lambda _: self.current_page, scope, find, replace, whole_word, ignore_case)
+        return patch.get(page_name, [])
+    
+    def bulk_replace(self, scope, find, replace, whole_word=False, ignore_case=False):
+        """Replace across every page and save the pages that changed as one batch"""
+        patch, replacements = self.plan_bulk_replace(scope, find, replace, whole_word, ignore_case)
+        if not patch:
+            self.status_var.set(f"No matches for '{find}'")
+            return {}
+        
+        sections = sum(len({op['section'] for op in ops}) for ops in patch.values())
+        if not messagebox.askyesno(
+                "Replace Across Pages",
+                f"Replace {replacements} match(es) in {sections} section(s) on {', '.join(patch)}?\n\n"
+                "The changed pages are saved right away; unsaved edits to the page on screen "
+                "stay unsaved (Undo can revert the replacement on screen)."):
+            return {}
+        current_name = self.current_page['pageName'] if self.current_page else None
+        screen_patch = self.plan_screen_replace(scope, find, replace, whole_word, ignore_case)
+        if screen_patch and self.form_has_edits() and not messagebox.askyesno(
+                "Unsaved Form Edits", "Discard the edits in the section form?"):
+            return {}
+        
+        # Check every page before saving any, so a batch is saved whole or not at all
+        updated = {}
+        for page_name, operations in patch.items():
+            page = content_store.copy_page(self.load_page(page_name))
+            for operation in operations:
+                content_store.apply_page_operation(page, operation)
+            content_store.touch_page(page)
+            errors = content_schema.validate_page(page, page_name)
+            if errors:
+                shown = '\n'.join(str(error) for error in errors[:10])
+                messagebox.showerror("Invalid Content", f"Nothing was replaced; {page_name} would be invalid:\n\n{shown}")
+                return {}
+            updated[page_name] = page
+        
+        if screen_patch:
+            # Apply to the model on screen as one undoable step; its other unsaved
+            # edits (deletes, moves, undos) are left for the next Save
+            page = content_store.copy_page(self.current_page)
+            for operation in screen_patch:
+                content_store.apply_page_operation(page, operation)
+            changed = sorted({op['section'] for op in screen_patch})
+            operations = []
+            for index in changed:
+                operations += field_operations(self.current_page['sections'][index], page['sections'][index],
+                                               content_store.SECTION_FIELDS, index)
+            for operation in operations:
+                apply_operation(self.current_page, operation)
+            self.history.record(f"replace of '{find}'", operations)
+            if current_name in updated:
+                self.current_page['lastUpdated'] = updated[current_name]['lastUpdated']
+            for index in changed:
+                self.retitle_section_row(index)
+            self.sections_listbox.selection_clear(0, tk.END)
+            if self.current_section is not None and self.current_section < len(self.current_page['sections']):
+                self.sections_listbox.selection_set(self.current_section)
+                self.on_section_select(None)
+        
+        for page_name, page in updated.items():
+            self.page_writer.submit(page_name, page)
+            self.content_index.update_page(page_name, page)
+        self.status_var.set(f"Replaced {replacements} match(es) - saving {', '.join(updated)}...")
+        return patch
+    
+    def open_bulk_replace(self):
+        """Window for finding and replacing technologies, links and text across every page"""
+        window = tk.Toplevel(self.root)
+        window.title("Find & Replace Across Pages")
+        window.transient(self.root)
+        
+        form = ttk.Frame(window, padding=10)
+        form.pack(fill=tk.BOTH, expand=True)
+        
+        scope_var = tk.StringVar(value='technology')
+        scope_frame = ttk.Frame(form)
+        scope_frame.pack(fill=tk.X, pady=(0, 5))
+        ttk.Label(scope_frame, text="In:").pack(side=tk.LEFT)
+        labels = {'technology': "Technologies", 'host': "Link hosts", 'link': "Links", 'text': "Titles, descriptions & text"}
+        for scope in SCOPES:
+            ttk.Radiobutton(scope_frame, text=labels[scope], value=scope, variable=scope_var).pack(side=tk.LEFT, padx=(5, 0))
+        
+        ttk.Label(form, text="Find:").pack(anchor=tk.W)
+        find_entry = ttk.Entry(form, font=('Arial', 11))
+        find_entry.pack(fill=tk.X, pady=(0, 5))
+        ttk.Label(form, text="Replace with:").pack(anchor=tk.W)
+        replace_entry = ttk.Entry(form, font=('Arial', 11))
+        replace_entry.pack(fill=tk.X, pady=(0, 5))
+        
+        whole_word_var = tk.BooleanVar(value=False)
+        ignore_case_var = tk.BooleanVar(value=False)
+        options_frame = ttk.Frame(form)
+        options_frame.pack(fill=tk.X, pady=(0, 5))
+        ttk.Checkbutton(options_frame, text="Whole word", variable=whole_word_var).pack(side=tk.LEFT)
+        ttk.Checkbutton(options_frame, text="Ignore case", variable=ignore_case_var).pack(side=tk.LEFT, padx=(10, 0))
+        
+        matches_listbox = tk.Listbox(form, height=12, font=('Arial', 10))
+        matches_listbox.pack(fill=tk.BOTH, expand=True, pady=(0, 5))
+        result_var = tk.StringVar()
+        ttk.Label(form, textvariable=result_var, foreground='gray').pack(anchor=tk.W)
+        
+        def arguments():
+            return (scope_var.get(), find_entry.get(), replace_entry.get(), whole_word_var.get(), ignore_case_var.get())
+        
+        def preview():
+            matches_listbox.delete(0, tk.END)
+            try:
+                patch, replacements = self.plan_bulk_replace(*arguments())
+            except ValueError as e:
+                result_var.set(str(e))
+                return
+            for page_name, operations in patch.items():
+                sections = content_store.ordered_sections(self.load_page(page_name))
+                for operation in operations:
+                    title = sections[operation['section']].get('title', 'Untitled')
+                    matches_listbox.insert(tk.END, f"{page_name} › {title} › {operation['field']}")
+            result_var.set(f"{replacements} match(es) on {len(patch)} page(s) - {self.content_index.stats_text()}")
+        
+        def replace_all():
+            try:
+                patch = self.bulk_replace(*arguments())
+            except ValueError as e:
+                result_var.set(str(e))
+                return
+            if patch:
+                matches_listbox.delete(0, tk.END)
+                result_var.set(self.status_var.get())
+        
+        buttons = ttk.Frame(form)
+        buttons.pack(fill=tk.X)
+        ttk.Button(buttons, text="Find", command=preview).pack(side=tk.LEFT)
+        ttk.Button(buttons, text="Replace All", command=replace_all).pack(side=tk.LEFT, padx=(5, 0))
+        ttk.Button(buttons, text="Close", command=window.destroy).pack(side=tk.RIGHT)
+        find_entry.focus_set()
+    
     def refresh_sections_list(self):
-        """Refresh the sections listbox display"""
+        """Repopulate the sections listbox (on page load; edits update single rows)"""
         if self.current_page:
             self.sections_listbox.delete(0, tk.END)
-            sections = self.current_page.get('sections', [])
-            # Sort sections by order
-            sections.sort(key=lambda x: x.get('order', 0))
-            for section in sections:
-                title = section.get('title', 'Untitled')
-                self.sections_listbox.insert(tk.END, title)
+            # Sections are kept in display order, so no sorting is needed here
+            titles = [section.get('title', 'Untitled') for section in content_store.ordered_sections(self.current_page)]
+            if titles:
+                self.sections_listbox.insert(tk.END, *titles)
+    
+    def retitle_section_row(self, index):
+        """Update one row's title if it changed"""
+        title = self.current_page['sections'][index].get('title', 'Untitled')
+        if self.sections_listbox.get(index) != title:
+            self.sections_listbox.delete(index)
+            self.sections_listbox.insert(index, title)
+        self.sections_listbox.selection_clear(0, tk.END)
+        self.sections_listbox.selection_set(index)
+    
+    def move_section_row(self, from_index, to_index):
+        """Move one row to mirror a section move"""
+        title = self.sections_listbox.get(from_index)
+        self.sections_listbox.delete(from_index)
+        self.sections_listbox.insert(to_index, title)
+
+class HeadlessEditor:
+    """Command-line access to the same page/section model, without tkinter"""
+    
+    def __init__(self, data_dir):
+        self.page_cache = PageCache(data_dir)
+        self.pages = {}
+        self.changed = []
+    
+    def page(self, page_name):
+        """Load a page once per run; later commands in a patch see earlier edits"""
+        if page_name not in self.pages:
+            self.pages[page_name] = self.page_cache.load(page_name)
+        return self.pages[page_name]
+    
+    def modify(self, page_name, operations):
+        """Apply patch operations to a page and mark it for saving"""
+        page = self.page(page_name)
+        for operation in operations:
+            content_store.apply_page_operation(page, operation)
+        if page_name not in self.changed:
+            self.changed.append(page_name)
+    
+    def save(self):
+        """Validate and write every modified page atomically and return their names"""
+        for page_name in self.changed:
+            errors = content_schema.validate_page(self.pages[page_name], page_name)
+            if errors:
+                raise ValueError(f"{page_name} is invalid, nothing was saved:\n  " +
+                                 '\n  '.join(str(error) for error in errors))
+        for page_name in self.changed:
+            page = self.pages[page_name]
+            content_store.touch_page(page)
+            content_store.write_page(self.page_cache.data_dir, page_name, page)
+        content_store.write_manifest(self.page_cache.data_dir,
+                                     {page_name: self.pages[page_name] for page_name in self.changed})
+        return list(self.changed)
+
+def parse_cli_value(value, as_json):
+    """Decode a command-line value, optionally as JSON"""
+    return json.loads(value) if as_json else value
+
+def run_cli(args):
+    """Run one headless command and return the exit status"""
+    data_dir = args.data_dir or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'client', 'public', 'data')
+    editor = HeadlessEditor(data_dir)
+    
+    if args.command == 'pages':
+        for page_name in WEBSITE_PAGES:
+            if editor.page_cache.exists(page_name):
+                print(page_name)
+        return 0
+    
+    if args.command == 'get':
+        page = editor.page(args.page)
+        if args.section is None:
+            result = page if args.field is None else page.get(args.field)
+        else:
+            section = content_store.get_section(page, args.section)
+            result = section if args.field is None else section.get(args.field)
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+        return 0
+    
+    if args.command == 'list':
+        for index, section in enumerate(content_store.ordered_sections(editor.page(args.page))):
+            print(f"{index}\t{section.get('title', 'Untitled')}")
+        return 0
+    
+    if args.command == 'set':
+        operation = {'op': 'set', 'field': args.field, 'value': parse_cli_value(args.value, args.json)}
+        if args.section is not None:
+            operation['section'] = args.section
+        editor.modify(args.page, [operation])
+    elif args.command == 'add':
+        fields = {field: parse_cli_value(value, args.json) for field, value in args.fields}
+        editor.modify(args.page, [{'op': 'add', 'fields': fields, 'position': args.position}])
+    elif args.command == 'delete':
+        editor.modify(args.page, [{'op': 'delete', 'section': args.section}])
+    elif args.command == 'move':
+        editor.modify(args.page, [{'op': 'move', 'from': args.from_index, 'to': args.to_index}])
+    elif args.command == 'apply':
+        with open(args.patch_file, 'r', encoding='utf-8') as f:
+            patch = json.load(f)
+        for page_name, operations in patch.get('pages', {}).items():
+            editor.modify(page_name, operations)
+    elif args.command == 'replace':
+        index = ContentIndex()
+        for page_name in WEBSITE_PAGES:
+            if editor.page_cache.exists(page_name):
+                index.update_page(page_name, editor.page(page_name))
+        patch, replacements = plan_replace(index, editor.page, args.scope, args.find, args.replace,
+                                           args.whole_word, args.ignore_case)
+        for page_name, operations in patch.items():
+            sections = content_store.ordered_sections(editor.page(page_name))
+            for operation in operations:
+                print(f"{page_name}\t{operation['section']}\t{operation['field']}\t"
+                      f"{sections[operation['section']].get('title', 'Untitled')}")
+        print(f"{replacements} match(es) on {len(patch)} page(s)")
+        if args.dry_run:
+            return 0
+        for page_name, operations in patch.items():
+            editor.modify(page_name, operations)
+    
+    for page_name in editor.save():
+        print(f"Saved {page_name}")
+    return 0
+
+def parse_args(argv=None):
+    """Parse command line options; no command starts the GUI"""
+    parser = argparse.ArgumentParser(
+        description="Edit website content. Run without a command to open the editor window.")
+    parser.add_argument('--data-dir', help="page JSON directory (default: client/public/data)")
+    parser.add_argument('--timing', action='store_true', help="print startup and run time to stderr")
+    commands = parser.add_subparsers(dest='command')
+    
+    commands.add_parser('pages', help="list editable pages")
+    
+    list_parser = commands.add_parser('list', help="list a page's sections in display order")
+    list_parser.add_argument('page')
+    
+    get_parser = commands.add_parser('get', help="print a page, a section or one field as JSON")
+    get_parser.add_argument('page')
+    get_parser.add_argument('--section', type=int)
+    get_parser.add_argument('--field')
+    
+    set_parser = commands.add_parser('set', help="set a page field, or a section field with --section")
+    set_parser.add_argument('page')
+    set_parser.add_argument('field')
+    set_parser.add_argument('value')
+    set_parser.add_argument('--section', type=int)
+    set_parser.add_argument('--json', action='store_true', help="decode the value as JSON")
+    
+    add_parser = commands.add_parser('add', help="add a section")
+    add_parser.add_argument('page')
+    add_parser.add_argument('--field', dest='fields', nargs=2, action='append', default=[],
+                            metavar=('NAME', 'VALUE'), help="section field (repeatable)")
+    add_parser.add_argument('--position', type=int)
+    add_parser.add_argument('--json', action='store_true', help="decode field values as JSON")
+    
+    delete_parser = commands.add_parser('delete', help="delete a section")
+    delete_parser.add_argument('page')
+    delete_parser.add_argument('section', type=int)
+    
+    move_parser = commands.add_parser('move', help="move a section to a new position")
+    move_parser.add_argument('page')
+    move_parser.add_argument('from_index', type=int)
+    move_parser.add_argument('to_index', type=int)
+    
+    apply_parser = commands.add_parser('apply', help="apply a JSON patch file across pages")
+    apply_parser.add_argument('patch_file')
+    
+    replace_parser = commands.add_parser('replace', help="find and replace across every page")
+    replace_parser.add_argument('scope', choices=list(SCOPES),
+                                help="technology entries, link hosts, link text, or titles/descriptions/text")
+    replace_parser.add_argument('find')
+    replace_parser.add_argument('replace', help="replacement (an empty technology removes the entry)")
+    replace_parser.add_argument('--whole-word', action='store_true', help="only match whole words")
+    replace_parser.add_argument('--ignore-case', action='store_true')
+    replace_parser.add_argument('--dry-run', action='store_true', help="list the matches without saving")
+    
+    return parser.parse_args(argv)
 
 def main():
+    args = parse_args()
+    
+    if args.command:
+        ready_at = time.perf_counter()
+        try:
+            status = run_cli(args)
+        except (OSError, ValueError, KeyError, IndexError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            status = 1
+        if args.timing:
+            finished_at = time.perf_counter()
+            print(f"startup {(ready_at - STARTED_AT) * 1000:.1f} ms, "
+                  f"command {(finished_at - ready_at) * 1000:.1f} ms", file=sys.stderr)
+        sys.exit(status)
+    
+    import_tk()
     root = tk.Tk()
     app = StaticContentEditor(root)
     root.mainloop()
@@ -0,0 +1,202 @@
+"""
+Schema validation for the page JSON files in client/public/data
+
+The schema is written as plain dictionaries and compiled once into nested
+checker functions, so validating a page is a straight walk over its data.
+"""
+
+import json
+import math
+import os
+import re
+
+URL_RE = re.compile(r'^(https?://|mailto:|/|\./)')
+
+SECTION_SCHEMA = {
+    'type': 'object',
+    'required': ['title', 'text', 'order'],
+    'properties': {
+        'title': {'type': 'string'},
+        'text': {'type': 'string'},
+        'order': {'type': 'number'},
+        'description': {'type': 'string'},
+        'technologies': {'type': 'array', 'items': {'type': 'string', 'nonEmpty': True}},
+        'githubLink': {'type': 'string', 'format': 'url'},
+        'documentationLink': {'type': 'string', 'format': 'url'},
+        'imageUrl': {'type': 'string', 'format': 'url'},
+        'metadata': {'type': 'object'},
+    },
+}
+
+PAGE_SCHEMA = {
+    'type': 'object',
+    'required': ['pageName', 'title', 'sections'],
+    'properties': {
+        'pageName': {'type': 'string', 'nonEmpty': True},
+        'title': {'type': 'string'},
+        'description': {'type': 'string'},
+        'lastUpdated': {'type': 'string'},
+        'sections': {'type': 'array', 'items': SECTION_SCHEMA},
+    },
+}
+
+MANIFEST_SCHEMA = {
+    'type': 'object',
+    'required': ['pages'],
+    'properties': {
+        'pages': {
+            'type': 'array',
+            'items': {
+                'type': 'object',
+                'required': ['pageName'],
+                'properties': {
+                    'pageName': {'type': 'string', 'nonEmpty': True},
+                    'title': {'type': 'string'},
+                    'description': {'type': 'string'},
+                    'lastUpdated': {'type': 'string'},
+                    'hash': {'type': 'string'},
+                    'size': {'type': 'number'},
+                    'file': {'type': 'string'},
+                },
+            },
+        },
+        'version': {'type': 'number'},
+        'totalPages': {'type': 'number'},
+    },
+}
+
+MANIFEST_NAME = 'manifest.json'
+
+
+class ValidationError:
+    """One problem found in a JSON document, located by its JSON path"""
+
+    def __init__(self, path, message):
+        self.path = path
+        self.message = message
+
+    def __str__(self):
+        return f"{self.path}: {self.message}"
+
+    def __repr__(self):
+        return f"ValidationError({self.path!r}, {self.message!r})"
+
+
+def is_number(value):
+    """bool is an int subclass, but an order of true is still a mistake"""
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+
+TYPE_CHECKS = {
+    'object': (lambda value: isinstance(value, dict), 'an object'),
+    'array': (lambda value: isinstance(value, list), 'an array'),
+    'string': (lambda value: isinstance(value, str), 'a string'),
+    'number': (is_number, 'a finite number'),
+}
+
+
+def describe(value):
+    """Short JSON-flavoured description of a value for error messages"""
+    if value is None:
+        return 'null'
+    if isinstance(value, bool):
+        return 'a boolean'
+    for check, label in TYPE_CHECKS.values():
+        if check(value):
+            return label
+    return type(value).__name__
+
+
+def compile_schema(schema):
+    """Turn a schema dictionary into a function(value, path, errors)"""
+    type_check, type_label = TYPE_CHECKS[schema['type']]
+    checks = []
+
+    if schema.get('nonEmpty'):
+        def check_non_empty(value, path, errors):
+            if not value.strip():
+                errors.append(ValidationError(path, "must not be empty"))
+        checks.append(check_non_empty)
+
+    if schema.get('format') == 'url':
+        def check_url(value, path, errors):
+            if value and not URL_RE.match(value):
+                errors.append(ValidationError(path, f"is not a valid link: {value!r}"))
+        checks.append(check_url)
+
+    if schema['type'] == 'object':
+        required = schema.get('required', [])
+        properties = {name: compile_schema(sub) for name, sub in schema.get('properties', {}).items()}
+
+        def check_object(value, path, errors):
+            for name in required:
+                if name not in value:
+                    errors.append(ValidationError(path, f"missing required field '{name}'"))
+            for name, check in properties.items():
+                if name in value:
+                    check(value[name], f"{path}.{name}", errors)
+        checks.append(check_object)
+
+    if schema['type'] == 'array' and 'items' in schema:
+        item_check = compile_schema(schema['items'])
+
+        def check_items(value, path, errors):
+            for index, item in enumerate(value):
+                item_check(item, f"{path}[{index}]", errors)
+        checks.append(check_items)
+
+    def check(value, path, errors):
+        if not type_check(value):
+            errors.append(ValidationError(path, f"must be {type_label}, got {describe(value)}"))
+            return
+        for extra_check in checks:
+            extra_check(value, path, errors)
+
+    return check
+
+
+# Compiled once at import; every validation reuses these
+check_page = compile_schema(PAGE_SCHEMA)
+check_manifest = compile_schema(MANIFEST_SCHEMA)
+
+
+def validate_page(page, page_name=None):
+    """Validate an in-memory page and return a list of ValidationError"""
+    errors = []
+    check_page(page, '$', errors)
+    if page_name and isinstance(page, dict) and isinstance(page.get('pageName'), str) \
+            and page['pageName'] != page_name:
+        errors.append(ValidationError('$.pageName', f"is '{page['pageName']}' but the file is {page_name}.json"))
+    return errors
+
+
+def validate_file(path):
+    """Parse and validate one data file"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except json.JSONDecodeError as e:
+        return [ValidationError('$', f"invalid JSON at line {e.lineno}, column {e.colno}: {e.msg}")]
+    except (OSError, UnicodeDecodeError) as e:
+        return [ValidationError('$', f"could not be read: {e}")]
+
+    filename = os.path.basename(path)
+    if filename == MANIFEST_NAME:
+        errors = []
+        check_manifest(data, '$', errors)
+        return errors
+    return validate_page(data, os.path.splitext(filename)[0])
+
+
+def validate_data_dir(data_dir, max_workers=None):
+    """Validate every JSON file in the data directory concurrently
+
+    Returns a dict of filename -> list of ValidationError (empty when valid).
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    filenames = sorted(name for name in os.listdir(data_dir) if name.endswith('.json'))
+    paths = [os.path.join(data_dir, name) for name in filenames]
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        results = pool.map(validate_file, paths)
+    return dict(zip(filenames, results))
@@ -0,0 +1,766 @@
+"""
+Page storage helpers shared by the content editor and the build scripts
+"""
+
+import hashlib
+import json
+import os
+import queue
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from html_normalizer import normalize_html
+
+# Pages that are actually used by the website
+# Based on the routes in App.js and PageTemplate usage
+WEBSITE_PAGES = [
+    'home',      # About page (route: /about, component: Home)
+    'education', # Education page (route: /education)
+    'experience', # Experience page (route: /experience)
+    'projects'   # Projects page (route: /projects)
+]
+
+# Sections are ordered by sparse keys: new keys leave ORDER_GAP between
+# neighbours, and a move takes the midpoint of its new neighbours, so only the
+# moved section's order changes. When two neighbours get closer than
+# MIN_ORDER_GAP the page is rebalanced back to evenly spaced integers.
+ORDER_GAP = 1024
+MIN_ORDER_GAP = 1e-6
+
+# Saves append section-level patches to <page>.journal.jsonl next to the page
+# file. The journal is folded back into <page>.json ("compacted") when the
+# editor closes, before a build, or once it outgrows the page itself.
+# Appends and compactions hold the data directory's lock, and a journal's
+# first record names the hash of the page file it was started on: a journal
+# left behind by a crash after its page file was rewritten is not replayed.
+JOURNAL_SUFFIX = '.journal.jsonl'
+JOURNAL_MIN_COMPACT_BYTES = 64 * 1024
+
+# manifest.json in the data directory is generated from the page files on
+# every save and build: one entry per page with the hash and size of the
+# bytes the build ships, and the content-hashed file name it ships them as.
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_VERSION = 2
+
+# Editable section fields, in the order they are written for a new section
+SECTION_FIELDS = ['title', 'githubLink', 'documentationLink', 'description', 'technologies', 'text']
+PAGE_FIELDS = ['title', 'description']
+
+
+def copy_section(section):
+    """Copy a section so edits to the copy never reach the original"""
+    copied = dict(section)
+    for key, value in copied.items():
+        if isinstance(value, list):
+            copied[key] = list(value)
+    return copied
+
+
+def copy_page(page):
+    """Copy a page and its sections (much cheaper than re-parsing the JSON)"""
+    copied = dict(page)
+    copied['sections'] = [copy_section(section) for section in page.get('sections', [])]
+    return copied
+
+
+def parse_technologies(value):
+    """Turn a comma-separated string (or a list) into a clean list of technologies"""
+    if isinstance(value, list):
+        items = value
+    else:
+        items = str(value).split(',') if value else []
+    return [str(item).strip() for item in items if str(item).strip()]
+
+
+def new_section(fields, order):
+    """Build a section with every editable field present"""
+    section = {field: [] if field == 'technologies' else '' for field in SECTION_FIELDS}
+    for field, value in fields.items():
+        set_section_field(section, field, value)
+    section['order'] = order
+    return section
+
+
+def set_section_field(section, field, value):
+    """Set one editable field on a section"""
+    if field not in SECTION_FIELDS:
+        raise KeyError(f"Unknown section field '{field}' (expected one of: {', '.join(SECTION_FIELDS)})")
+    if field == 'technologies':
+        value = parse_technologies(value)
+    elif field == 'text':
+        value = normalize_html(value)
+    section[field] = value
+
+
+def section_matches(section, fields):
+    """Check whether setting these editable fields would leave the section unchanged"""
+    for field, value in fields.items():
+        empty = [] if field == 'technologies' else ''
+        current = section.get(field, empty)
+        if field == 'technologies':
+            value = parse_technologies(value)
+        elif field == 'text':
+            # Stored text may predate normalization; compare canonical forms
+            value, current = normalize_html(value), normalize_html(current)
+        if current != value:
+            return False
+    return True
+
+
+def normalized_page(page):
+    """Return a copy of a page with every section's HTML in its canonical, minified form"""
+    sections = page.get('sections') if isinstance(page, dict) else None
+    if not isinstance(sections, list):
+        return page
+    return dict(page, sections=[
+        dict(section, text=normalize_html(section['text']))
+        if isinstance(section, dict) and isinstance(section.get('text'), str) else section
+        for section in sections
+    ])
+
+
+def page_payload(page):
+    """The bytes the build ships for a page: canonical section HTML as minified JSON"""
+    return json.dumps(normalized_page(page), separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def content_hash(payload):
+    """Short content hash used in manifests and file names"""
+    return hashlib.sha256(payload).hexdigest()[:16]
+
+
+def hashed_file_name(name, payload):
+    """<stem>.<content hash>.json, for files that can be cached forever"""
+    return f"{os.path.splitext(name)[0]}.{content_hash(payload)}.json"
+
+
+def set_page_field(page, field, value):
+    """Set one editable page-level field"""
+    if field not in PAGE_FIELDS:
+        raise KeyError(f"Unknown page field '{field}' (expected one of: {', '.join(PAGE_FIELDS)})")
+    page[field] = value
+
+
+def section_order(section):
+    """Sort key for sections"""
+    return section.get('order', 0)
+
+
+def sort_sections(page):
+    """Put the sections list in display order once, when a page is loaded
+
+    Every edit below keeps the list in that order, so callers can index it
+    directly instead of re-sorting. Already-sorted pages are left untouched.
+    """
+    sections = page.setdefault('sections', [])
+    if any(section_order(a) > section_order(b) for a, b in zip(sections, sections[1:])):
+        sections.sort(key=section_order)
+    return sections
+
+
+def ordered_sections(page):
+    """Return the page's sections in display order"""
+    return page.setdefault('sections', [])
+
+
+def get_section(page, index):
+    """Return the section at a position in display order"""
+    sections = ordered_sections(page)
+    if not 0 <= index < len(sections):
+        raise IndexError(f"Section {index} out of range (page has {len(sections)} sections)")
+    return sections[index]
+
+
+def order_between(before, after):
+    """Return an order key strictly between two neighbours (None for an open end), or None if there is no room"""
+    if before is None and after is None:
+        return 0
+    if before is None:
+        return section_order(after) - ORDER_GAP
+    if after is None:
+        return section_order(before) + ORDER_GAP
+    low, high = section_order(before), section_order(after)
+    if high - low < MIN_ORDER_GAP:
+        return None
+    if isinstance(low, int) and isinstance(high, int) and high - low >= 2:
+        return (low + high) // 2
+    middle = (low + high) / 2
+    return middle if low < middle < high else None
+
+
+def place_section(sections, index):
+    """Give the section at index an order key between its neighbours
+
+    Returns True when the page had to be rebalanced (every order changed).
+    """
+    before = sections[index - 1] if index > 0 else None
+    after = sections[index + 1] if index + 1 < len(sections) else None
+    order = order_between(before, after)
+    if order is None:
+        rebalance_sections(sections)
+        return True
+    sections[index]['order'] = order
+    return False
+
+
+def add_section(page, fields, position=None):
+    """Add a section at the end (or at a position) and return it"""
+    sections = ordered_sections(page)
+    section = new_section(fields, 0)
+    if position is None or position >= len(sections):
+        sections.append(section)
+        place_section(sections, len(sections) - 1)
+    else:
+        position = max(position, 0)
+        sections.insert(position, section)
+        place_section(sections, position)
+    return section
+
+
+def delete_section(page, index):
+    """Remove the section at a position in display order and return it"""
+    get_section(page, index)
+    return page['sections'].pop(index)
+
+
+def move_section(page, from_index, to_index):
+    """Move a section to a new position, changing only its own order when possible
+
+    Returns True when the move forced a rebalance of every order.
+    """
+    sections = ordered_sections(page)
+    get_section(page, from_index)
+    get_section(page, to_index)
+    if from_index == to_index:
+        return False
+    item = sections.pop(from_index)
+    sections.insert(to_index, item)
+    return place_section(sections, to_index)
+
+
+def rebalance_sections(sections):
+    """Respace every order key evenly (only when neighbouring keys run out of room)"""
+    for i, section in enumerate(sections):
+        section['order'] = i * ORDER_GAP
+
+
+def touch_page(page):
+    """Update last updated timestamp"""
+    page['lastUpdated'] = datetime.now().isoformat()
+
+
+def apply_page_operation(page, operation):
+    """Apply one patch operation (set/add/delete/move) to a page"""
+    op = operation.get('op')
+    if op == 'set':
+        if 'section' in operation:
+            set_section_field(get_section(page, operation['section']), operation['field'], operation['value'])
+        else:
+            set_page_field(page, operation['field'], operation['value'])
+    elif op == 'add':
+        add_section(page, operation.get('fields', {}), operation.get('position'))
+    elif op == 'delete':
+        delete_section(page, operation['section'])
+    elif op == 'move':
+        move_section(page, operation['from'], operation['to'])
+    else:
+        raise ValueError(f"Unknown patch operation '{op}'")
+
+
+def page_names(data_dir):
+    """Names of the page files in a data directory (everything but the manifest and temp files)"""
+    return sorted(
+        filename[:-len('.json')] for filename in os.listdir(data_dir)
+        if filename.endswith('.json') and filename != MANIFEST_NAME and not filename.startswith('.')
+    )
+
+
+def manifest_entry(page_name, page, payload=None):
+    """One page's manifest entry; payload is the page's shipped bytes if already serialized"""
+    if payload is None:
+        payload = page_payload(page)
+    digest = content_hash(payload)
+    return {
+        'pageName': page_name,
+        'title': page.get('title', ''),
+        'description': page.get('description', ''),
+        'lastUpdated': page.get('lastUpdated', ''),
+        'hash': digest,
+        'size': len(payload),
+        'file': f"{page_name}.{digest}.json",
+    }
+
+
+def build_manifest(data_dir, pages=None, cache=None):
+    """Manifest of every page file in data_dir
+
+    pages: {page_name: page} already in memory (e.g. just saved), used instead
+        of re-reading those files
+    cache: dict kept between calls; entries of pages whose files have not
+        changed since are reused instead of re-hashed
+    """
+    pages = pages or {}
+    cache = {} if cache is None else cache
+    entries = []
+    for page_name in page_names(data_dir):
+        key = page_stat_key(data_dir, page_name)
+        cached = cache.get(page_name)
+        if page_name in pages:
+            entry = manifest_entry(page_name, pages[page_name])
+        elif cached is not None and cached[0] == key:
+            entry = cached[1]
+        else:
+            try:
+                entry = manifest_entry(page_name, load_page_file(data_dir, page_name))
+            except (OSError, ValueError):
+                # Broken or vanished files are left to validation
+                continue
+        cache[page_name] = (key, entry)
+        entries.append(entry)
+    for page_name in set(cache) - {entry['pageName'] for entry in entries}:
+        del cache[page_name]
+    return {'version': MANIFEST_VERSION, 'totalPages': len(entries), 'pages': entries}
+
+
+def write_manifest(data_dir, pages=None, cache=None):
+    """Regenerate manifest.json; returns True if it changed"""
+    manifest = build_manifest(data_dir, pages, cache)
+    path = os.path.join(data_dir, MANIFEST_NAME)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            if json.load(f) == manifest:
+                return False
+    except (OSError, ValueError):
+        pass
+    atomic_write_json(path, manifest)
+    return True
+
+
+class PageCache:
+    """In-memory cache of parsed page files, validated by (mtime, size)"""
+
+    def __init__(self, data_dir):
+        self.data_dir = data_dir
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def page_path(self, page_name):
+        """Return the JSON file path for a page"""
+        return os.path.join(self.data_dir, f"{page_name}.json")
+
+    def stat_key(self, page_name):
+        """Return the (mtime, size) key of a page and its journal, or None if the page is missing"""
+        return page_stat_key(self.data_dir, page_name)
+
+    def exists(self, page_name):
+        """Check whether a page file exists on disk"""
+        return self.stat_key(page_name) is not None
+
+    def load(self, page_name):
+        """Return a private copy of a page, parsing the file only if it changed on disk"""
+        key = self.stat_key(page_name)
+        if key is None:
+            self.entries.pop(page_name, None)
+            raise FileNotFoundError(self.page_path(page_name))
+
+        entry = self.entries.get(page_name)
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return copy_page(entry[1])
+
+        self.misses += 1
+        page = load_page_file(self.data_dir, page_name)
+        self.entries[page_name] = (key, page)
+        return copy_page(page)
+
+    def store(self, page_name, page, key=None):
+        """Record a page that was just written so the next load is served from memory"""
+        if key is None:
+            key = self.stat_key(page_name)
+        if key is None:
+            self.entries.pop(page_name, None)
+            return
+        self.entries[page_name] = (key, copy_page(page))
+
+    def peek(self, page_name):
+        """Return (stat_key, page) as last loaded or stored, without copying or checking the disk"""
+        return self.entries.get(page_name)
+
+    def invalidate(self, page_name=None):
+        """Forget one page, or every page when no name is given"""
+        if page_name is None:
+            self.entries.clear()
+        else:
+            self.entries.pop(page_name, None)
+
+    def stats_text(self):
+        """Short hit/miss summary for the status bar"""
+        return f"Page cache: {self.hits} hits / {self.misses} misses"
+
+
+def file_mode(path):
+    """Permission bits of an existing file, or the default for a new one (umask applies)"""
+    try:
+        return os.stat(path).st_mode & 0o777
+    except FileNotFoundError:
+        return 0o666
+
+
+def atomic_write_json(path, data):
+    """Write JSON to a temp file, fsync it and rename it over the target"""
+    directory = os.path.dirname(path) or '.'
+    payload = json.dumps(data, indent=2, ensure_ascii=False)
+    # A unique temp name next to the target, so the final rename stays on one filesystem
+    tmp_path = os.path.join(directory, f".{os.path.basename(path)}.{os.getpid()}.{threading.get_ident()}.tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, file_mode(path))
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    # Make the rename itself durable where the platform allows it
+    if hasattr(os, 'O_DIRECTORY'):
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def journal_path(data_dir, page_name):
+    """Return the journal file path for a page"""
+    return os.path.join(data_dir, f"{page_name}{JOURNAL_SUFFIX}")
+
+
+def page_stat_key(data_dir, page_name):
+    """(mtime, size) of the page file plus its journal, or None if the page file is missing"""
+    try:
+        st = os.stat(os.path.join(data_dir, f"{page_name}.json"))
+    except FileNotFoundError:
+        return None
+    try:
+        jst = os.stat(journal_path(data_dir, page_name))
+        journal_key = (jst.st_mtime_ns, jst.st_size)
+    except FileNotFoundError:
+        journal_key = None
+    return (st.st_mtime_ns, st.st_size, journal_key)
+
+
+def sections_by_order(page):
+    """Map order -> section, or None if two sections share an order"""
+    by_order = {}
+    for section in page.get('sections', []):
+        key = section_order(section)
+        if key in by_order:
+            return None
+        by_order[key] = section
+    return by_order
+
+
+def diff_pages(base, page):
+    """Return the journal operations that turn base into page (sections keyed by order)"""
+    if any(field not in page for field in base if field != 'sections'):
+        return [{'op': 'snapshot', 'page': page}]
+    old_sections = sections_by_order(base)
+    new_sections = sections_by_order(page)
+    if old_sections is None or new_sections is None:
+        return [{'op': 'snapshot', 'page': page}]
+
+    ops = []
+    page_fields = {field: value for field, value in page.items()
+                   if field != 'sections' and base.get(field) != value}
+    if page_fields:
+        ops.append({'op': 'page', 'fields': page_fields})
+    removed = {key: section for key, section in old_sections.items() if key not in new_sections}
+    for key, section in new_sections.items():
+        before = old_sections.get(key)
+        if before is None:
+            # A moved section keeps its content under a new order key
+            moved_from = next((old_key for old_key, old in removed.items()
+                               if {**old, 'order': key} == section), None)
+            if moved_from is not None:
+                del removed[moved_from]
+                ops.append({'op': 'move', 'from': moved_from, 'to': key})
+            else:
+                ops.append({'op': 'put', 'order': key, 'section': section})
+        elif before != section:
+            op = {'op': 'patch', 'order': key,
+                  'fields': {field: value for field, value in section.items() if before.get(field) != value}}
+            unset = [field for field in before if field not in section]
+            if unset:
+                op['unset'] = unset
+            ops.append(op)
+    ops.extend({'op': 'remove', 'order': key} for key in removed)
+    return ops
+
+
+def apply_journal(page, records):
+    """Replay journal records onto a page in place"""
+    by_order = sections_by_order(page)
+    if by_order is None:
+        by_order = {section_order(s): s for s in page.get('sections', [])}
+    for record in records:
+        for op in record.get('ops', []):
+            kind = op.get('op')
+            if kind == 'snapshot':
+                page.clear()
+                page.update(copy_page(op['page']))
+                by_order = {section_order(s): s for s in page.get('sections', [])}
+            elif kind == 'page':
+                page.update(op['fields'])
+            elif kind == 'remove':
+                by_order.pop(op['order'], None)
+            elif kind == 'move' and op['from'] in by_order:
+                section = by_order.pop(op['from'])
+                section['order'] = op['to']
+                by_order[op['to']] = section
+            elif kind == 'put':
+                by_order[op['order']] = copy_section(op['section'])
+            elif kind == 'patch' and op['order'] in by_order:
+                section = by_order[op['order']]
+                section.update(op['fields'])
+                for field in op.get('unset', []):
+                    section.pop(field, None)
+    page['sections'] = sorted(by_order.values(), key=section_order)
+    return page
+
+
+def read_journal(path):
+    """Read journal records, ignoring a torn final line left by a crash"""
+    records = []
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    break
+    except FileNotFoundError:
+        pass
+    return records
+
+
+@contextmanager
+def journal_lock(data_dir):
+    """Hold the data directory's journal lock, so appends and compactions never interleave
+
+    The lock is an flock on the directory itself; processes and threads each
+    take it through their own descriptor. Without fcntl it is a no-op.
+    """
+    if fcntl is None:
+        yield
+        return
+    fd = os.open(data_dir, os.O_RDONLY)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        # Closing the descriptor releases the lock
+        os.close(fd)
+
+
+def journal_applies(records, raw):
+    """Whether journal records were written on top of these page file bytes
+
+    Journals from before the base hash was recorded are always replayed.
+    """
+    base = records[0].get('base') if records else None
+    return base is None or base == content_hash(raw)
+
+
+def load_page_file(data_dir, page_name):
+    """Parse a page file, replay its journal and put the sections in display order"""
+    with open(os.path.join(data_dir, f"{page_name}.json"), 'rb') as f:
+        raw = f.read()
+    page = json.loads(raw)
+    records = read_journal(journal_path(data_dir, page_name))
+    if records and journal_applies(records, raw):
+        apply_journal(page, records)
+    sort_sections(page)
+    return page
+
+
+def append_journal(data_dir, page_name, ops):
+    """Durably append one record to a page's journal and return the journal size"""
+    record = {'ts': datetime.now().isoformat(), 'ops': ops}
+    path = journal_path(data_dir, page_name)
+    with journal_lock(data_dir):
+        with open(path, 'a', encoding='utf-8') as f:
+            if f.tell() == 0:
+                with open(os.path.join(data_dir, f"{page_name}.json"), 'rb') as page_file:
+                    record = {'base': content_hash(page_file.read()), **record}
+            f.write(json.dumps(record, separators=(',', ':'), ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+            return f.tell()
+
+
+def replace_page(data_dir, page_name, page):
+    """write_page without taking the lock, for callers that already hold it"""
+    atomic_write_json(os.path.join(data_dir, f"{page_name}.json"), page)
+    try:
+        os.remove(journal_path(data_dir, page_name))
+    except FileNotFoundError:
+        pass
+
+
+def write_page(data_dir, page_name, page):
+    """Write the canonical page file atomically and drop its (now folded-in) journal"""
+    with journal_lock(data_dir):
+        replace_page(data_dir, page_name, page)
+
+
+def compact_page(data_dir, page_name):
+    """Fold a page's journal into its page file; returns False if there was no journal"""
+    # Read, rewrite and remove under the lock: an append in between would be lost
+    with journal_lock(data_dir):
+        if not os.path.exists(journal_path(data_dir, page_name)):
+            return False
+        replace_page(data_dir, page_name, load_page_file(data_dir, page_name))
+    return True
+
+
+def compact_journals(data_dir):
+    """Compact every journal in the data directory and return the page names"""
+    compacted = []
+    for filename in sorted(os.listdir(data_dir)):
+        if filename.endswith(JOURNAL_SUFFIX):
+            page_name = filename[:-len(JOURNAL_SUFFIX)]
+            if os.path.exists(os.path.join(data_dir, f"{page_name}.json")) and compact_page(data_dir, page_name):
+                compacted.append(page_name)
+    return compacted
+
+
+class PageWriter:
+    """Background writer that journals page saves, coalescing repeated saves of a page
+
+    Each save appends only the sections that changed to the page's journal;
+    the page file itself is rewritten atomically when the journal is
+    compacted.
+    """
+
+    def __init__(self, data_dir):
+        self.data_dir = data_dir
+        self.persisted = {}
+        self.manifest_cache = {}
+        self.pending = {}
+        self.inflight = {}
+        self.results = queue.Queue()
+        self.condition = threading.Condition()
+        self.closed = False
+        self.thread = threading.Thread(target=self.run, name='page-writer', daemon=True)
+        self.thread.start()
+
+    def submit(self, page_name, page):
+        """Queue a snapshot of a page; a newer save replaces one that has not started yet"""
+        snapshot = copy_page(page)
+        with self.condition:
+            if self.closed:
+                raise RuntimeError("Page writer is closed")
+            self.pending[page_name] = snapshot
+            self.condition.notify_all()
+
+    def latest(self, page_name):
+        """Return a copy of the newest snapshot not yet on disk, or None"""
+        with self.condition:
+            page = self.pending.get(page_name) or self.inflight.get(page_name)
+            return copy_page(page) if page is not None else None
+
+    def is_busy(self):
+        """Check whether any save is queued or being written"""
+        with self.condition:
+            return bool(self.pending or self.inflight)
+
+    def run(self):
+        """Worker loop: write whatever is pending, oldest request first"""
+        while True:
+            with self.condition:
+                while not self.pending and not self.closed:
+                    self.condition.wait()
+                if not self.pending:
+                    return
+                page_name = next(iter(self.pending))
+                page = self.pending.pop(page_name)
+                self.inflight[page_name] = page
+
+            key = None
+            error = None
+            try:
+                self.write(page_name, page)
+                key = page_stat_key(self.data_dir, page_name)
+            except Exception as e:
+                error = e
+
+            with self.condition:
+                self.inflight.pop(page_name, None)
+                self.condition.notify_all()
+            self.results.put((page_name, page, key, error))
+
+    def write(self, page_name, page):
+        """Journal the difference from the last persisted state, compacting when needed"""
+        base = self.persisted.get(page_name)
+        if base is None and os.path.exists(os.path.join(self.data_dir, f"{page_name}.json")):
+            base = load_page_file(self.data_dir, page_name)
+        ops = diff_pages(base, page) if base is not None else [{'op': 'snapshot', 'page': page}]
+
+        if ops and ops[0]['op'] == 'snapshot':
+            write_page(self.data_dir, page_name, page)
+        elif ops:
+            journal_size = append_journal(self.data_dir, page_name, ops)
+            page_size = os.path.getsize(os.path.join(self.data_dir, f"{page_name}.json"))
+            if journal_size > max(JOURNAL_MIN_COMPACT_BYTES, page_size):
+                # Replaying the journal now costs more than rewriting the page
+                write_page(self.data_dir, page_name, page)
+        self.persisted[page_name] = page
+        write_manifest(self.data_dir, {page_name: page}, self.manifest_cache)
+
+    def forget(self, page_name):
+        """Drop the persisted state of a page that changed on disk behind our back
+
+        The next save then diffs against the file as it is now, and closing
+        the editor will not compact a stale copy over it.
+        """
+        with self.condition:
+            self.persisted.pop(page_name, None)
+
+    def compact(self):
+        """Fold the journals of every page this writer has saved into their page files"""
+        for page_name, page in list(self.persisted.items()):
+            if os.path.exists(journal_path(self.data_dir, page_name)):
+                write_page(self.data_dir, page_name, page)
+
+    def drain_results(self):
+        """Return every (page_name, page, stat_key, error) finished since the last call"""
+        finished = []
+        while True:
+            try:
+                finished.append(self.results.get_nowait())
+            except queue.Empty:
+                return finished
+
+    def flush(self, timeout=None):
+        """Block until every queued save has been written"""
+        with self.condition:
+            return self.condition.wait_for(lambda: not self.pending and not self.inflight, timeout)
+
+    def close(self, timeout=None):
+        """Finish the queued saves, compact the journals and stop the worker"""
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        self.thread.join(timeout)
+        if not self.thread.is_alive():
+            self.compact()
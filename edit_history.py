@@ -0,0 +1,184 @@
+"""
+Undo/redo history for the content editor
+
+Each step is a short list of reversible operations on the page model, in
+the same {'op': ...} shape as the journal patches, rather than a snapshot of
+the page:
+
+- set:    one field, as the replaced span of the old value and what replaced
+          it ([start, removed, inserted]), so a one-word fix to a 4 KB
+          section costs a few bytes; lists store their old and new values
+- add:    the new section and its position
+- delete: the removed section and its position
+- move:   both positions and the moved section's old and new order keys
+
+Undoing a step applies the inverse of its operations in reverse order.
+Steps are sized by their JSON encoding; once the history outgrows its byte
+or step limit the oldest steps are dropped.
+"""
+
+import json
+from collections import deque
+
+from content_store import copy_section, ordered_sections, place_section, section_order
+
+HISTORY_MAX_BYTES = 256 * 1024
+HISTORY_MAX_STEPS = 1000
+# Bookkeeping per step on top of its encoded operations
+STEP_OVERHEAD_BYTES = 64
+
+
+def text_edit(old, new):
+    """The span that changed between two strings, as [start, removed, inserted]"""
+    limit = min(len(old), len(new))
+    start = 0
+    while start < limit and old[start] == new[start]:
+        start += 1
+    end = 0
+    while end < limit - start and old[-1 - end] == new[-1 - end]:
+        end += 1
+    return [start, old[start:len(old) - end], new[start:len(new) - end]]
+
+
+def apply_text_edit(value, edit):
+    start, removed, inserted = edit
+    if value[start:start + len(removed)] != removed:
+        raise ValueError("The history no longer matches the page")
+    return value[:start] + inserted + value[start + len(removed):]
+
+
+def field_operations(before, after, fields, section=None):
+    """Set operations for the fields that differ between two versions of a section (or page)"""
+    operations = []
+    for field in fields:
+        old, new = before.get(field), after.get(field)
+        if old == new:
+            continue
+        operation = {'op': 'set', 'field': field}
+        if section is not None:
+            operation['section'] = section
+        if isinstance(old, str) and isinstance(new, str):
+            operation['edit'] = text_edit(old, new)
+        else:
+            operation['old'], operation['new'] = old, new
+        operations.append(operation)
+    return operations
+
+
+def invert(operation):
+    """The operation that undoes this one"""
+    op = operation['op']
+    inverse = dict(operation)
+    if op == 'set':
+        if 'edit' in operation:
+            start, removed, inserted = operation['edit']
+            inverse['edit'] = [start, inserted, removed]
+        else:
+            inverse['old'], inverse['new'] = operation['new'], operation['old']
+    elif op in ('add', 'delete'):
+        inverse['op'] = 'delete' if op == 'add' else 'add'
+    elif op == 'move':
+        inverse['from'], inverse['to'] = operation['to'], operation['from']
+        inverse['orders'] = operation['orders'][::-1]
+    else:
+        raise ValueError(f"Unknown history operation '{op}'")
+    return inverse
+
+
+def insert_section(sections, index, section, order):
+    """Put a section back at a position, keeping its order key if it still fits there"""
+    section['order'] = order
+    sections.insert(index, section)
+    before = sections[index - 1] if index > 0 else None
+    after = sections[index + 1] if index + 1 < len(sections) else None
+    if ((before is not None and section_order(before) >= order)
+            or (after is not None and order >= section_order(after))):
+        # Neighbouring keys changed since (a rebalance); take a fresh key
+        place_section(sections, index)
+
+
+def apply_operation(page, operation):
+    """Apply one history operation to the page model"""
+    op = operation['op']
+    sections = ordered_sections(page)
+    if op == 'set':
+        target = sections[operation['section']] if 'section' in operation else page
+        field = operation['field']
+        if 'edit' in operation:
+            target[field] = apply_text_edit(target.get(field, ''), operation['edit'])
+        else:
+            target[field] = operation['new']
+    elif op == 'add':
+        section = copy_section(operation['value'])
+        insert_section(sections, operation['section'], section, section_order(section))
+    elif op == 'delete':
+        sections.pop(operation['section'])
+    elif op == 'move':
+        section = sections.pop(operation['from'])
+        insert_section(sections, operation['to'], section, operation['orders'][1])
+    else:
+        raise ValueError(f"Unknown history operation '{op}'")
+
+
+def operations_size(operations):
+    """Approximate memory held by a step"""
+    return len(json.dumps(operations, ensure_ascii=False)) + STEP_OVERHEAD_BYTES
+
+
+class EditHistory:
+    """Bounded undo/redo stacks of reversible page operations"""
+
+    def __init__(self, max_bytes=HISTORY_MAX_BYTES, max_steps=HISTORY_MAX_STEPS):
+        self.max_bytes = max_bytes
+        self.max_steps = max_steps
+        self.undo_steps = deque()
+        self.redo_steps = []
+        self.size = 0
+
+    def record(self, label, operations):
+        """Add a step (a new edit makes the redo steps unreachable)"""
+        if not operations:
+            return
+        self.size -= sum(step[2] for step in self.redo_steps)
+        self.redo_steps.clear()
+        step = (label, operations, operations_size(operations))
+        self.undo_steps.append(step)
+        self.size += step[2]
+        # The newest step is always kept, even on its own over the limit
+        while len(self.undo_steps) > 1 and (self.size > self.max_bytes or len(self.undo_steps) > self.max_steps):
+            self.size -= self.undo_steps.popleft()[2]
+
+    def can_undo(self):
+        return bool(self.undo_steps)
+
+    def can_redo(self):
+        return bool(self.redo_steps)
+
+    def undo(self, page):
+        """Revert the newest step on the page; returns (label, operations applied) or None"""
+        if not self.undo_steps:
+            return None
+        step = self.undo_steps.pop()
+        applied = [invert(operation) for operation in reversed(step[1])]
+        for operation in applied:
+            apply_operation(page, operation)
+        self.redo_steps.append(step)
+        return step[0], applied
+
+    def redo(self, page):
+        """Re-apply the newest undone step; returns (label, operations applied) or None"""
+        if not self.redo_steps:
+            return None
+        step = self.redo_steps.pop()
+        for operation in step[1]:
+            apply_operation(page, operation)
+        self.undo_steps.append(step)
+        return step[0], step[1]
+
+    def clear(self):
+        self.undo_steps.clear()
+        self.redo_steps.clear()
+        self.size = 0
+
+    def stats_text(self):
+        return f"History: {len(self.undo_steps)} undo, {len(self.redo_steps)} redo, {self.size / 1024:.1f} KB"
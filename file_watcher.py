@@ -0,0 +1,236 @@
+"""
+Directory watching for the content editor and the rebuild script
+
+Uses Linux inotify through ctypes when it is available and falls back to
+polling file stats everywhere else. Both watchers have the same interface:
+wait(timeout) blocks until something changes and returns the set of changed
+file paths (empty on timeout).
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+
+# inotify event masks (see <sys/inotify.h>)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO |
+              IN_CREATE | IN_DELETE | IN_DELETE_SELF)
+EVENT_HEADER = struct.Struct('iIII')
+
+
+def default_ignore(path):
+    """Skip editor swap files, our own temp files and dependency/build trees"""
+    name = os.path.basename(path)
+    return (name.endswith(('.tmp', '.swp', '~')) or name.startswith('.#')
+            or name in ('node_modules', 'build', '__pycache__', '.git'))
+
+
+class PollingWatcher:
+    """Detects changes by comparing (mtime, size) snapshots of the watched trees"""
+
+    def __init__(self, paths, recursive=False, interval=0.5, ignore=default_ignore):
+        self.paths = [os.path.abspath(path) for path in paths]
+        self.recursive = recursive
+        self.interval = interval
+        self.ignore = ignore
+        self.snapshot = self.scan()
+
+    def scan(self):
+        snapshot = {}
+        for root_path in self.paths:
+            if os.path.isfile(root_path):
+                self.stat_into(snapshot, root_path)
+                continue
+            for dirpath, dirnames, filenames in os.walk(root_path):
+                dirnames[:] = [d for d in dirnames if not self.ignore(os.path.join(dirpath, d))] \
+                    if self.recursive else []
+                for filename in filenames:
+                    path = os.path.join(dirpath, filename)
+                    if not self.ignore(path):
+                        self.stat_into(snapshot, path)
+        return snapshot
+
+    @staticmethod
+    def stat_into(snapshot, path):
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return
+        snapshot[path] = (st.st_mtime_ns, st.st_size)
+
+    def wait(self, timeout=None):
+        """Block until a change is seen (or timeout) and return the changed paths"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            current = self.scan()
+            changed = {path for path in current.keys() | self.snapshot.keys()
+                       if current.get(path) != self.snapshot.get(path)}
+            self.snapshot = current
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            delay = self.interval if deadline is None else min(self.interval, max(deadline - time.monotonic(), 0))
+            time.sleep(delay)
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """Kernel change notifications for the watched directories (Linux only)"""
+
+    def __init__(self, paths, recursive=False, ignore=default_ignore, libc=None):
+        self.libc = libc or load_libc()
+        self.recursive = recursive
+        self.ignore = ignore
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.watches = {}
+        self.trees = set()
+        self.files = set()
+        for path in paths:
+            path = os.path.abspath(path)
+            if os.path.isfile(path):
+                # Watch the parent directory and filter for this file
+                self.files.add(path)
+                self.add_watch(os.path.dirname(path))
+            else:
+                self.add_tree(path)
+
+    def add_watch(self, directory):
+        if directory in self.watches.values():
+            return
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+        self.watches[wd] = directory
+
+    def add_tree(self, directory):
+        self.add_watch(directory)
+        self.trees.add(directory)
+        if not self.recursive:
+            return
+        for dirpath, dirnames, _ in os.walk(directory):
+            dirnames[:] = [d for d in dirnames if not self.ignore(os.path.join(dirpath, d))]
+            for dirname in dirnames:
+                self.add_watch(os.path.join(dirpath, dirname))
+                self.trees.add(os.path.join(dirpath, dirname))
+
+    def wants(self, path):
+        """Single watched files share their directory's watch, so filter out their siblings"""
+        if self.ignore(path):
+            return False
+        return path in self.files or os.path.dirname(path) in self.trees
+
+    def wait(self, timeout=None):
+        """Block until the kernel reports a change (or timeout) and return the changed paths"""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        changed = set()
+        # Let a burst of events (e.g. a git checkout) arrive before returning
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            changed |= self.parse_events(data)
+            ready, _, _ = select.select([self.fd], [], [], 0.02)
+            if not ready:
+                break
+        return changed
+
+    def parse_events(self, data):
+        changed = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+            offset += length
+            directory = self.watches.get(wd)
+            if mask & IN_Q_OVERFLOW:
+                # Too many events were dropped; report every watched directory
+                changed.update(self.watches.values())
+                continue
+            if mask & IN_IGNORED:
+                self.trees.discard(self.watches.pop(wd, None))
+                continue
+            if directory is None:
+                continue
+            path = os.path.join(directory, name) if name else directory
+            if mask & IN_ISDIR:
+                if self.recursive and mask & (IN_CREATE | IN_MOVED_TO) and not self.ignore(path):
+                    self.add_tree(path)
+                continue
+            if self.wants(path):
+                changed.add(path)
+        return changed
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+def load_libc():
+    """Load libc with the inotify functions, or raise OSError"""
+    if not sys.platform.startswith('linux'):
+        raise OSError("inotify is only available on Linux")
+    libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+    if not hasattr(libc, 'inotify_init1'):
+        raise OSError("libc has no inotify support")
+    libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    return libc
+
+
+def create_watcher(paths, recursive=False, ignore=default_ignore, polling=False):
+    """Return an inotify watcher when possible, otherwise a polling one"""
+    if not polling:
+        try:
+            return InotifyWatcher(paths, recursive=recursive, ignore=ignore)
+        except OSError:
+            pass
+    return PollingWatcher(paths, recursive=recursive, ignore=ignore)
+
+
+class WatcherThread:
+    """Runs a watcher in a daemon thread and hands batches of changed paths to a callback"""
+
+    def __init__(self, watcher, callback):
+        self.watcher = watcher
+        self.callback = callback
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, name='file-watcher', daemon=True)
+        self.thread.start()
+
+    def run(self):
+        while not self.stopped.is_set():
+            changed = self.watcher.wait(0.5)
+            if changed and not self.stopped.is_set():
+                self.callback(changed)
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join(2)
+        self.watcher.close()
@@ -0,0 +1,216 @@
+"""
+Canonical form of section HTML, shared by the content editor and the build
+
+Section text is a small subset of HTML (paragraphs, headings, lists and
+inline formatting) that the editor shows one line per block, with <br>
+standing in for the line breaks typed inside a block. normalize_html()
+tokenizes the text once and rewrites it in a single pass:
+
+- tag names are lowercased and void tags are written as <br>, <hr>, <img ...>
+- runs of whitespace collapse to one space, raw newlines become <br>
+- the contents of <pre> and <code> are kept exactly as written, whitespace,
+  newlines and tags included
+- whitespace and <br> next to block tags are dropped (they only separated
+  lines in the editor; the site strips them anyway)
+- comments are dropped
+
+The result is stable: normalize_html(normalize_html(x)) == normalize_html(x),
+and normalize_html(to_editable(html)) == html for normalized html, so a
+section survives any number of editor round trips unchanged.
+"""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+
+TOKEN_RE = re.compile(
+    r'<!--.*?-->'
+    r'|<(/?)([a-zA-Z][a-zA-Z0-9]*)((?:[^<>"\']|"[^"]*"|\'[^\']*\')*)>',
+    re.S,
+)
+SPACE_RE = re.compile(r'\s+')
+
+# Tags whose contents are passed through untouched
+VERBATIM_TAGS = frozenset(['pre', 'code'])
+VERBATIM_END_RES = {name: re.compile(rf'</{name}\s*>', re.I) for name in VERBATIM_TAGS}
+
+# Tags that start a new line in the editor and a new block on the page
+BLOCK_TAGS = frozenset('''
+address article aside blockquote div dl dd dt figure figcaption footer h1 h2 h3 h4 h5 h6
+header hr li main nav ol p pre section table tbody td tfoot th thead tr ul
+'''.split())
+# Blocks that hold other blocks; their tags get a line of their own in the editor
+CONTAINER_TAGS = frozenset('blockquote div dl ol section table tbody tfoot thead tr ul'.split())
+
+CACHE_SIZE = 4096
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def tokenize(html, verbatim=False):
+    """Yield ('text', text) and ('tag', name, is_close, attributes) tokens, skipping comments
+
+    With verbatim, everything between a <pre> or <code> tag and its closing
+    tag comes as a single ('raw', text) token.
+    """
+    position = 0
+    while True:
+        match = TOKEN_RE.search(html, position)
+        if match is None:
+            break
+        if match.start() > position:
+            yield ('text', html[position:match.start()])
+        position = match.end()
+        name = match.group(2)
+        if name is None:
+            continue
+        name = name.lower()
+        is_close = bool(match.group(1))
+        attributes = SPACE_RE.sub(' ', match.group(3)).strip().rstrip('/').rstrip()
+        yield ('tag', name, is_close, attributes)
+        if verbatim and not is_close and name in VERBATIM_TAGS:
+            end = VERBATIM_END_RES[name].search(html, position)
+            stop = end.start() if end else len(html)
+            if stop > position:
+                yield ('raw', html[position:stop])
+            if end is None:
+                return
+            yield ('tag', name, True, '')
+            position = end.end()
+    if position < len(html):
+        yield ('text', html[position:])
+
+
+def format_tag(name, is_close, attributes):
+    if is_close:
+        return f"</{name}>"
+    return f"<{name} {attributes}>" if attributes else f"<{name}>"
+
+
+def _normalize(html):
+    out = []
+    at_block = True       # nothing but block tags emitted since the last content
+    pending_breaks = 0
+    pending_space = False
+
+    def flush_inline():
+        """Emit the breaks or the space that sit between two pieces of inline content"""
+        nonlocal pending_breaks, pending_space
+        if pending_breaks:
+            if not at_block:
+                out.append('<br>' * pending_breaks)
+        elif pending_space and not at_block:
+            out.append(' ')
+        pending_breaks = 0
+        pending_space = False
+
+    for token in tokenize(html, verbatim=True):
+        if token[0] == 'raw':
+            out.append(token[1])
+            at_block = False
+            pending_breaks = 0
+            pending_space = False
+            continue
+        if token[0] == 'text':
+            lines = token[1].split('\n')
+            for index, line in enumerate(lines):
+                if index:
+                    pending_breaks += 1
+                    pending_space = False
+                text = SPACE_RE.sub(' ', line)
+                if not text.strip():
+                    if text and not pending_breaks:
+                        pending_space = True
+                    continue
+                if text[0] == ' ' and not pending_breaks:
+                    pending_space = True
+                flush_inline()
+                out.append(text.strip())
+                at_block = False
+                pending_space = text[-1] == ' '
+            continue
+
+        _, name, is_close, attributes = token
+        if name == 'br':
+            pending_breaks += 1
+            pending_space = False
+        elif name in BLOCK_TAGS:
+            pending_breaks = 0
+            pending_space = False
+            out.append(format_tag(name, is_close, attributes))
+            at_block = True
+        else:
+            flush_inline()
+            out.append(format_tag(name, is_close, attributes))
+            at_block = False
+    return ''.join(out)
+
+
+def normalize_html(html):
+    """Return the canonical, minified form of a section's HTML (memoized by content hash)"""
+    if not html:
+        return ''
+    key = hashlib.blake2b(html.encode('utf-8'), digest_size=16).digest()
+    with _cache_lock:
+        result = _cache.get(key)
+        if result is not None:
+            _cache.move_to_end(key)
+            return result
+    result = _normalize(html)
+    with _cache_lock:
+        _cache[key] = result
+        if len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return result
+
+
+def to_editable(html):
+    """Lay normalized HTML out for the editor: one line per block, <br> as a line break"""
+    pieces = []
+
+    def newline():
+        if pieces and pieces[-1] != '\n':
+            pieces.append('\n')
+
+    ends_with_layout = False   # the last piece is a newline added after a block
+    for token in tokenize(normalize_html(html), verbatim=True):
+        ends_with_layout = False
+        if token[0] != 'tag':
+            pieces.append(token[1])
+            continue
+        _, name, is_close, attributes = token
+        if name == 'br':
+            # Normalized HTML never has a <br> next to a block tag, so this
+            # newline can't be mistaken for a block boundary on the way back
+            pieces.append('\n')
+            continue
+        block = name in BLOCK_TAGS
+        if block and (not is_close or name in CONTAINER_TAGS):
+            newline()
+        pieces.append(format_tag(name, is_close, attributes))
+        if block and (is_close or name in CONTAINER_TAGS):
+            pieces.append('\n')
+            ends_with_layout = True
+    # Only that layout newline is dropped; a newline ending an unclosed <pre> is content
+    if ends_with_layout:
+        pieces.pop()
+    return ''.join(pieces)
+
+
+def to_text(html):
+    """Plain-text rendering for the editor preview"""
+    pieces = []
+    for token in tokenize(html):
+        if token[0] == 'text':
+            pieces.append(token[1])
+        elif token[1] == 'br':
+            pieces.append('\n')
+        elif token[1] == 'p' and token[2]:
+            pieces.append('\n\n')
+    return ''.join(pieces)
+
+
+def strip_tags(html):
+    """Drop every tag and comment, keeping the text"""
+    return ''.join(token[1] for token in tokenize(html) if token[0] == 'text')
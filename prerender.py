@@ -0,0 +1,156 @@
+"""
+Static HTML snapshots of the content routes
+
+Each route's page JSON is rendered into a copy of the built index.html
+(inside <div id="root">), written to <build>/<route>.html, which static
+hosts serve for /<route>. The file sits next to index.html, so the bundle's
+relative asset URLs ("homepage": ".") still resolve. Visitors see
+the content before the JS bundle loads; React then renders over it. A
+route is re-rendered only when its page content or the index.html template
+changed, and the renders run in parallel worker processes.
+"""
+
+import hashlib
+import html
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+from content_store import normalized_page
+from search_index import page_hash
+
+RENDER_VERSION = 1
+
+# Route path -> page JSON, as wired up in client/src/App.js. Project details
+# have no URL of their own (the project travels in router state), so the
+# /projects snapshot carries each project's full text instead.
+ROUTES = {
+    'about': 'home',
+    'education': 'education',
+    'experience': 'experience',
+    'projects': 'projects',
+}
+
+ROOT_RE = re.compile(r'<div id="root">\s*</div>')
+TITLE_RE = re.compile(r'<title>(.*?)</title>', re.S)
+DESCRIPTION_RE = re.compile(r'(<meta\s+name="description"\s+content=")[^"]*(")', re.S)
+
+# Class names are ones the app already uses, so Tailwind keeps them in the CSS
+SECTION_CLASS = 'bg-gray-800/80 border border-gray-700/30 rounded-2xl p-8 mb-8'
+TECH_CLASS = 'px-3 py-1 bg-blue-900/40 text-blue-200 rounded-full text-xs font-medium border border-blue-700/30'
+
+
+def render_section(section):
+    """One section as static HTML (its text is our own, already normalized markup)"""
+    parts = [f'<section class="{SECTION_CLASS}">']
+    if section.get('title'):
+        parts.append(f'<h2 class="text-2xl font-bold text-white mb-4">{html.escape(section["title"])}</h2>')
+    if section.get('description'):
+        parts.append(f'<p class="text-gray-300 text-sm mb-4 leading-relaxed">{html.escape(section["description"])}</p>')
+    technologies = section.get('technologies')
+    if isinstance(technologies, list) and technologies:
+        chips = ''.join(f'<span class="{TECH_CLASS}">{html.escape(str(t))}</span>' for t in technologies)
+        parts.append(f'<div class="flex flex-wrap gap-2 mb-6">{chips}</div>')
+    if section.get('text'):
+        parts.append(f'<div class="text-gray-300">{section["text"]}</div>')
+    for field, label in (('githubLink', 'View on GitHub'), ('documentationLink', 'Documentation')):
+        if section.get(field):
+            parts.append(f'<a class="text-blue-400" href="{html.escape(section[field])}">{label}</a> ')
+    parts.append('</section>')
+    return ''.join(parts)
+
+
+def render_page(page):
+    """The markup that goes inside <div id="root"> for one page"""
+    page = normalized_page(page)
+    sections = sorted(page.get('sections', []), key=lambda x: x.get('order', 0))
+    parts = [
+        '<div class="min-h-screen bg-gray-900 py-16 px-4"><div class="max-w-7xl mx-auto">',
+        '<div class="text-center mb-16">',
+        f'<h1 class="text-4xl md:text-6xl font-bold gradient-heading mb-6">{html.escape(page.get("title", ""))}</h1>',
+    ]
+    if page.get('description'):
+        parts.append(f'<p class="text-gray-300">{html.escape(page["description"])}</p>')
+    parts.append('</div>')
+    parts.extend(render_section(section) for section in sections)
+    parts.append('</div></div>')
+    return ''.join(parts)
+
+
+def render_document(template, page, site_title):
+    """A copy of the built index.html with the page rendered into it"""
+    document = ROOT_RE.sub(lambda _: f'<div id="root">{render_page(page)}</div>', template, count=1)
+    title = page.get('title')
+    if title:
+        document = TITLE_RE.sub(lambda _: f'<title>{html.escape(title)} | {html.escape(site_title)}</title>',
+                                document, count=1)
+    if page.get('description'):
+        description = html.escape(page['description'])
+        document = DESCRIPTION_RE.sub(lambda m: f'{m.group(1)}{description}{m.group(2)}', document, count=1)
+    return document
+
+
+def render_route(job):
+    """Render one route and write it (runs in a worker process)"""
+    data_path, output_path, template, site_title = job
+    with open(data_path, 'r', encoding='utf-8') as f:
+        page = json.load(f)
+    document = render_document(template, page, site_title)
+    tmp_path = output_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(document)
+    os.replace(tmp_path, output_path)
+    return output_path
+
+
+def route_hash(page_path, template):
+    """Content hash of everything a route's snapshot depends on"""
+    with open(page_path, 'r', encoding='utf-8') as f:
+        page = json.load(f)
+    digest = hashlib.sha256(f"{RENDER_VERSION}:{page_hash(page)}:".encode('utf-8'))
+    digest.update(template.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def prerender_routes(data_dir, build_dir, cache_dir, routes=None):
+    """Write a snapshot per route; returns (rendered routes, unchanged routes)"""
+    with open(os.path.join(build_dir, 'index.html'), 'r', encoding='utf-8') as f:
+        template = f.read()
+    if not ROOT_RE.search(template):
+        raise ValueError(f"{build_dir}/index.html has no empty <div id=\"root\"> to render into")
+    title = TITLE_RE.search(template)
+    # "Name | Portfolio" -> "Portfolio"; pages are titled "<page title> | Portfolio"
+    site_title = html.unescape(title.group(1)).split('|')[-1].strip() if title else ''
+
+    state_path = os.path.join(cache_dir, 'state.json')
+    try:
+        with open(state_path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        state = {}
+
+    jobs, hashes, unchanged = [], {}, []
+    for route, page_name in (routes or ROUTES).items():
+        data_path = os.path.join(data_dir, f"{page_name}.json")
+        if not os.path.exists(data_path):
+            continue
+        output_path = os.path.join(build_dir, f"{route}.html")
+        hashes[route] = route_hash(data_path, template)
+        if state.get(route) == hashes[route] and os.path.exists(output_path):
+            unchanged.append(route)
+        else:
+            jobs.append((route, (data_path, output_path, template, site_title)))
+
+    if len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=min(len(jobs), os.cpu_count() or 1)) as pool:
+            list(pool.map(render_route, [job for _, job in jobs]))
+    elif jobs:
+        render_route(jobs[0][1])
+
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = state_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(hashes, f, indent=2)
+    os.replace(tmp_path, state_path)
+    return [route for route, _ in jobs], unchanged
@@ -0,0 +1,366 @@
+"""
+Local preview server for the built site
+
+A threaded HTTP/1.1 server (with keep-alive) for client/build that behaves
+like the static hosts the site is deployed to:
+
+- files carry an ETag and Last-Modified, and conditional requests get
+  304 Not Modified
+- the .br or .gz sibling written by the precompress stage is sent in place
+  of a file when the browser accepts that encoding
+- content-hashed file names are cached as immutable for a year; everything
+  else is revalidated on every use
+- a single byte range (Range: bytes=...) gets 206 Partial Content from the
+  uncompressed file, unless an If-Range validator no longer matches
+- /<route> serves the pre-rendered <route>.html; other paths without a file
+  follow the rules in _redirects (/* -> /index.html 200), or fall back to
+  index.html when there is no _redirects file
+
+With a data directory, /data/<page>.json (plus its hashed name) and
+/data/manifest.json are generated from the page files, journal included,
+whenever they change, so saved edits show up without a build. The content
+bundle is answered with 404 in that mode, which makes the app load those
+live pages one by one.
+
+Files of SENDFILE_MIN_BYTES or more are sent with socket.sendfile(), which
+uses os.sendfile() where the platform has it.
+"""
+
+import email.utils
+import json
+import mimetypes
+import os
+import posixpath
+import re
+import threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+
+from content_store import MANIFEST_NAME, build_manifest, content_hash, load_page_file, page_payload, page_stat_key
+
+SENDFILE_MIN_BYTES = 64 * 1024
+# Seconds an idle keep-alive connection is held open
+KEEP_ALIVE_TIMEOUT = 15
+
+IMMUTABLE_CACHE = 'public, max-age=31536000, immutable'
+REVALIDATE_CACHE = 'no-cache'
+# Webpack's main.1a2b3c4d.js and the build's <page>.<16 hex>.json
+HASHED_NAME_RE = re.compile(r'\.[0-9a-f]{8,}\.[a-z0-9]+$')
+PAGE_FILE_RE = re.compile(r'^([A-Za-z0-9_-]+)(?:\.([0-9a-f]{16}))?\.json$')
+
+# Preferred first
+ENCODINGS = [('br', '.br'), ('gzip', '.gz')]
+
+mimetypes.add_type('image/avif', '.avif')
+mimetypes.add_type('image/webp', '.webp')
+mimetypes.add_type('application/json', '.json')
+mimetypes.add_type('text/javascript', '.js')
+
+
+def content_type(path):
+    kind = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    if kind.startswith('text/') or kind in ('application/json', 'image/svg+xml'):
+        kind += '; charset=utf-8'
+    return kind
+
+
+def accepted_encodings(header):
+    """Content codings an Accept-Encoding header allows (q=0 excluded)"""
+    accepted = set()
+    for part in (header or '').split(','):
+        coding, _, params = part.partition(';')
+        quality = 1.0
+        for param in params.split(';'):
+            name, _, value = param.strip().partition('=')
+            if name == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding.strip() and quality > 0:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+def parse_range(header, size):
+    """(first, last) byte of a single 'bytes=' range, None to send the whole file, or False if unsatisfiable
+
+    Other units, multiple ranges and malformed headers are ignored, which
+    the HTTP spec allows: the client gets the whole file.
+    """
+    unit, _, spec = (header or '').partition('=')
+    first, dash, last = spec.strip().partition('-')
+    if unit.strip().lower() != 'bytes' or not dash or ',' in spec:
+        return None
+    try:
+        if not first:
+            # A suffix: the final <last> bytes
+            length = int(last)
+            if length <= 0:
+                return False
+            start, end = max(size - length, 0), size - 1
+        else:
+            start = int(first)
+            if last and int(last) < start:
+                return None
+            end = min(int(last), size - 1) if last else size - 1
+    except ValueError:
+        return None
+    return (start, end) if start < size else False
+
+
+def load_redirects(path):
+    """Rules from a Netlify-style _redirects file as (from, to, status)"""
+    rules = []
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return rules
+    for line in lines:
+        parts = line.split('#', 1)[0].split()
+        if len(parts) < 2:
+            continue
+        status = parts[2].rstrip('!') if len(parts) > 2 else '301'
+        rules.append((parts[0], parts[1], int(status) if status.isdigit() else 301))
+    return rules
+
+
+def match_redirect(rules, path):
+    """(target, status) of the first rule matching a path, or None"""
+    for source, target, status in rules:
+        if source.endswith('*'):
+            prefix = source[:-1]
+            if path.startswith(prefix):
+                return target.replace(':splat', path[len(prefix):]), status
+        elif path == source or path == source.rstrip('/') + '/':
+            return target, status
+    return None
+
+
+class PreviewServer(ThreadingHTTPServer):
+    """Serves a build directory, and optionally live page data"""
+
+    daemon_threads = True
+
+    def __init__(self, address, build_dir, data_dir=None):
+        self.build_dir = os.path.realpath(build_dir)
+        self.data_dir = data_dir
+        self.redirects = load_redirects(os.path.join(self.build_dir, '_redirects'))
+        self.lock = threading.Lock()
+        self.pages = {}            # page name -> (stat key, payload)
+        self.manifest_cache = {}
+        super().__init__(address, PreviewHandler)
+
+    def build_file(self, path):
+        """Filesystem path for a URL path inside the build, if it names a file"""
+        relative = posixpath.normpath(path).lstrip('/')
+        full = os.path.realpath(os.path.join(self.build_dir, *relative.split('/')))
+        if os.path.commonpath([full, self.build_dir]) != self.build_dir:
+            return None
+        if os.path.isdir(full):
+            full = os.path.join(full, 'index.html')
+        return full if os.path.isfile(full) else None
+
+    def resolve(self, path):
+        """('file', filesystem path) or ('redirect', location, status) for a URL path, or None"""
+        for candidate in (path, path.rstrip('/') + '.html' if path.strip('/') else None):
+            if candidate:
+                found = self.build_file(candidate)
+                if found:
+                    return ('file', found)
+        if self.redirects:
+            rule = match_redirect(self.redirects, path)
+            if rule is None:
+                return None
+            target, status = rule
+            if status == 200:
+                found = self.build_file(urlsplit(target).path)
+                return ('file', found) if found else None
+            return ('redirect', target, status)
+        # No _redirects: behave like a single-page-app host for routes
+        if not posixpath.splitext(path)[1]:
+            found = self.build_file('/index.html')
+            return ('file', found) if found else None
+        return None
+
+    def page_payload(self, page_name):
+        """Shipped bytes of a page from the data directory, re-read only when it changed"""
+        key = page_stat_key(self.data_dir, page_name)
+        if key is None:
+            return None
+        with self.lock:
+            cached = self.pages.get(page_name)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        payload = page_payload(load_page_file(self.data_dir, page_name))
+        with self.lock:
+            self.pages[page_name] = (key, payload)
+        return payload
+
+    def live_data(self, name):
+        """(payload, cache control) for a data file generated from the data directory
+
+        Returns None for files that come from the build, and (None, None)
+        for files that must not be served in live mode.
+        """
+        if name.split('.', 1)[0] == 'content-bundle':
+            return None, None
+        if name == MANIFEST_NAME:
+            with self.lock:
+                manifest = build_manifest(self.data_dir, cache=self.manifest_cache)
+            return json.dumps(manifest, separators=(',', ':'), ensure_ascii=False).encode('utf-8'), REVALIDATE_CACHE
+        match = PAGE_FILE_RE.match(name)
+        if match is None:
+            return None
+        try:
+            payload = self.page_payload(match.group(1))
+        except (OSError, ValueError):
+            return None, None
+        if payload is None:
+            return None
+        if match.group(2) is None:
+            return payload, REVALIDATE_CACHE
+        if match.group(2) == content_hash(payload):
+            return payload, IMMUTABLE_CACHE
+        # An older version: the build may still have it
+        return None
+
+
+class PreviewHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server_version = 'PortfolioPreview/1'
+    timeout = KEEP_ALIVE_TIMEOUT
+
+    def do_GET(self):
+        self.respond(send_body=True)
+
+    def do_HEAD(self):
+        self.respond(send_body=False)
+
+    def respond(self, send_body):
+        path = unquote(urlsplit(self.path).path)
+        if self.server.data_dir and path.startswith('/data/'):
+            live = self.server.live_data(path[len('/data/'):])
+            if live is not None:
+                payload, cache_control = live
+                if payload is None:
+                    self.send_error(HTTPStatus.NOT_FOUND)
+                else:
+                    self.send_payload(payload, content_type(path), cache_control, send_body)
+                return
+
+        target = self.server.resolve(path)
+        if target is None:
+            self.send_error(HTTPStatus.NOT_FOUND)
+        elif target[0] == 'redirect':
+            self.send_response(target[2])
+            self.send_header('Location', target[1])
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+        else:
+            self.send_file(target[1], send_body)
+
+    def not_modified(self, etag, mtime):
+        """Check the request's validators; If-None-Match wins over If-Modified-Since"""
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match is not None:
+            tags = [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]
+            return '*' in tags or etag in tags
+        if_modified_since = self.headers.get('If-Modified-Since')
+        if if_modified_since and mtime is not None:
+            try:
+                since = email.utils.parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return int(mtime) <= since
+        return False
+
+    def send_validators(self, etag, mtime, cache_control):
+        self.send_header('ETag', etag)
+        if mtime is not None:
+            self.send_header('Last-Modified', email.utils.formatdate(mtime, usegmt=True))
+        self.send_header('Cache-Control', cache_control)
+
+    def send_payload(self, payload, kind, cache_control, send_body):
+        """Send generated bytes"""
+        etag = f'"{content_hash(payload)}"'
+        if self.not_modified(etag, None):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_validators(etag, None, cache_control)
+            self.end_headers()
+            return
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', kind)
+        self.send_header('Content-Length', str(len(payload)))
+        self.send_validators(etag, None, cache_control)
+        self.end_headers()
+        if send_body:
+            self.wfile.write(payload)
+
+    def send_file(self, path, send_body):
+        """Send a build file, or its precompressed sibling when the client accepts it"""
+        accepted = accepted_encodings(self.headers.get('Accept-Encoding'))
+        range_header = self.headers.get('Range')
+        encoding, chosen = None, path
+        for coding, suffix in ENCODINGS:
+            # Ranges are served from the uncompressed file
+            if range_header is None and coding in accepted and os.path.isfile(path + suffix):
+                encoding, chosen = coding, path + suffix
+                break
+        cache_control = IMMUTABLE_CACHE if HASHED_NAME_RE.search(os.path.basename(path)) else REVALIDATE_CACHE
+
+        try:
+            f = open(chosen, 'rb')
+        except OSError:
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+        with f:
+            st = os.fstat(f.fileno())
+            etag = f'"{st.st_mtime_ns:x}-{st.st_size:x}"'
+            if self.not_modified(etag, st.st_mtime):
+                self.send_response(HTTPStatus.NOT_MODIFIED)
+                self.send_validators(etag, st.st_mtime, cache_control)
+                self.send_header('Vary', 'Accept-Encoding')
+                self.end_headers()
+                return
+            byte_range = None
+            if range_header is not None and self.headers.get('If-Range', etag) == etag:
+                byte_range = parse_range(range_header, st.st_size)
+            if byte_range is False:
+                self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+                self.send_header('Content-Range', f"bytes */{st.st_size}")
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            start, end = byte_range or (0, st.st_size - 1)
+            self.send_response(HTTPStatus.PARTIAL_CONTENT if byte_range else HTTPStatus.OK)
+            self.send_header('Content-Type', content_type(path))
+            self.send_header('Content-Length', str(end - start + 1))
+            if byte_range:
+                self.send_header('Content-Range', f"bytes {start}-{end}/{st.st_size}")
+            if encoding:
+                self.send_header('Content-Encoding', encoding)
+            self.send_header('Accept-Ranges', 'bytes')
+            self.send_header('Vary', 'Accept-Encoding')
+            self.send_validators(etag, st.st_mtime, cache_control)
+            self.end_headers()
+            if send_body:
+                self.send_body(f, start, end - start + 1)
+
+    def send_body(self, f, offset, count):
+        if count >= SENDFILE_MIN_BYTES:
+            self.wfile.flush()
+            self.connection.sendfile(f, offset, count)
+        else:
+            f.seek(offset)
+            self.wfile.write(f.read(count))
+
+    def log_message(self, format, *args):
+        print(f"   🌐 {self.address_string()} {format % args}")
+
+
+def create_server(build_dir, host='127.0.0.1', port=3000, data_dir=None):
+    """Bind a preview server (call serve_forever() on it)"""
+    return PreviewServer((host, port), build_dir, data_dir)
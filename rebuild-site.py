@@ -3,39 +3,976 @@
 Simple script to rebuild the static site after content changes
 """
 
+import argparse
+import filecmp
+import gzip
+import hashlib
+import json
+import shutil
+import signal
 import subprocess
 import sys
 import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
 
-def run_command(command, description):
-    """Run a command and handle errors"""
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+from build_graph import CANCELLED, FAILED, Task, TaskGraph, hash_file, hash_paths, iter_files
+from build_trace import BuildTrace, compare_traces, load_trace, peak_rss_mb
+from content_schema import validate_data_dir
+from content_store import (JOURNAL_SUFFIX, MANIFEST_NAME, MANIFEST_VERSION, compact_journals, content_hash,
+                           hashed_file_name, load_page_file, manifest_entry, normalized_page, page_names,
+                           page_payload, page_stat_key, write_manifest)
+from prerender import ROUTES, prerender_routes
+from search_index import build_search_index
+
+try:
+    from PIL import Image, ImageOps, features as pil_features
+except ImportError:
+    Image = None
+
+# Paths used by the build (relative to the project root)
+CLIENT_DIR = 'client'
+DATA_DIR = os.path.join(CLIENT_DIR, 'public', 'data')
+BUILD_DIR = os.path.join(CLIENT_DIR, 'build')
+BUILD_DATA_DIR = os.path.join(BUILD_DIR, 'data')
+CACHE_DIR = '.build-cache'
+BUILD_STATE_FILE = os.path.join(CACHE_DIR, 'build-state.json')
+BUNDLE_NAME = 'content-bundle.json'
+SEARCH_INDEX_NAME = 'search-index.json'
+SEARCH_CACHE_DIR = os.path.join(CACHE_DIR, 'search')
+
+# Responsive image variants
+PUBLIC_DIR = os.path.join(CLIENT_DIR, 'public')
+IMAGE_EXTENSIONS = ('.jpeg', '.jpg', '.png')
+IMAGE_WIDTHS = [320, 640, 960, 1280]
+IMAGE_CACHE_DIR = os.path.join(CACHE_DIR, 'images')
+BUILD_IMAGES_DIR = os.path.join(BUILD_DIR, 'images')
+IMAGE_ENCODERS = {
+    'avif': ('AVIF', {'quality': 55}),
+    'webp': ('WEBP', {'quality': 80, 'method': 6}),
+    'jpeg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+# Compiled JS bundles, stored by content hash and keyed by the inputs that produced them
+BUNDLE_CACHE_DIR = os.path.join(CACHE_DIR, 'bundles')
+BUNDLE_OBJECTS_DIR = os.path.join(BUNDLE_CACHE_DIR, 'objects')
+BUNDLE_CACHE_KEEP = 5
+
+# Timing traces (JSON plus a .chrome.json for chrome://tracing / Perfetto)
+TRACE_DIR = os.path.join(CACHE_DIR, 'traces')
+
+# Build files served with .gz/.br siblings, and the hashes they were compressed from
+COMPRESSIBLE_SUFFIXES = ('.js', '.css', '.html', '.json', '.svg')
+PRECOMPRESS_STATE_FILE = os.path.join(CACHE_DIR, 'precompress.json')
+
+# Route snapshot hashes (page content + index.html template)
+PRERENDER_CACHE_DIR = os.path.join(CACHE_DIR, 'prerender')
+
+# Watch mode: stages from cheapest to most thorough; each one covers the ones
+# before it and leaves out the build tasks its changes cannot affect
+WATCH_STAGES = ['data', 'assets', 'full']
+WATCH_STAGE_SKIPS = {
+    'data': ['Build JS bundle', 'Sync public assets', 'Images'],
+    'assets': ['Build JS bundle'],
+    'full': [],
+}
+# Quiet time before a burst of changes is rebuilt
+WATCH_DEBOUNCE_MS = 300
+# How often stages running worker processes check whether they were cancelled
+CANCEL_POLL_SECONDS = 0.1
+
+# Preview server (--serve)
+SERVE_HOST = '127.0.0.1'
+SERVE_PORT = 3000
+# Public files the bundler rewrites; everything else in public/ is copied as-is
+PROCESSED_PUBLIC_FILES = ['index.html']
+
+# Everything npm compiles into the JS bundle (other public files are copied as-is)
+JS_INPUTS = [
+    os.path.join(CLIENT_DIR, 'src'),
+    os.path.join(CLIENT_DIR, 'package.json'),
+    os.path.join(CLIENT_DIR, 'package-lock.json'),
+    os.path.join(CLIENT_DIR, 'tailwind.config.js'),
+    os.path.join(CLIENT_DIR, 'postcss.config.js'),
+] + [os.path.join(CLIENT_DIR, 'public', name) for name in PROCESSED_PUBLIC_FILES]
+
+# Files in build/data written by the build itself rather than copied from the
+# data directory (matched by stem, so their content-hashed copies count too)
+GENERATED_DATA_STEMS = {'content-bundle', 'search-index', 'manifest'}
+
+# The trace of the build in progress; main() and each watch-mode rebuild start a new one
+TRACE = BuildTrace()
+
+def run_command(command, description, cancel=None):
+    """Run a command, streaming its output, and stop it early if cancel (a threading.Event) is set"""
     print(f"🔄 {description}...")
+    with TRACE.phase(description, 'command') as info:
+        # A new session lets a cancel stop npm and everything it started
+        process = subprocess.Popen(command, shell=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                   text=True, bufsize=1, start_new_session=os.name == 'posix')
+        reader = threading.Thread(target=stream_output, args=(process.stdout,), daemon=True)
+        reader.start()
+        returncode, rusage = wait_for_process(process, cancel)
+        reader.join()
+        info['exitCode'] = returncode
+        if rusage is not None:
+            info['peakRssMb'] = peak_rss_mb(rusage)
+
+        if cancel is not None and cancel.is_set() and returncode != 0:
+            info['status'] = 'cancelled'
+            print(f"⏹️  {description} cancelled")
+            return False
+        if returncode != 0:
+            info['status'] = 'failed'
+            print(f"❌ {description} failed with exit code {returncode} (see the output above)")
+            return False
+    print(f"✅ {description} completed successfully")
+    return True
+
+def stream_output(stream):
+    """Echo a command's output line by line as it is produced"""
+    with stream:
+        for line in stream:
+            print(f"   │ {line.rstrip()}", flush=True)
+
+def wait_for_process(process, cancel=None):
+    """Wait for a command to exit and return (exit code, rusage or None)
+
+    os.wait4 reports the peak RSS of the command and the children it waited
+    for (npm, node, ...), which Popen.wait throws away.
+    """
+    if not hasattr(os, 'wait4'):
+        while cancel is not None and process.poll() is None:
+            if cancel.wait(0.05):
+                stop_process(process)
+                break
+        return process.wait(), None
+
+    stopped = False
+    while True:
+        pid, status, rusage = os.wait4(process.pid, 0 if cancel is None else os.WNOHANG)
+        if pid:
+            process.returncode = os.waitstatus_to_exitcode(status)
+            return process.returncode, rusage
+        if cancel.is_set() and not stopped:
+            stop_process(process)
+            stopped = True
+        time.sleep(0.05)
+
+def stop_process(process):
+    """Terminate a command started by run_command along with its children"""
+    try:
+        if os.name == 'posix':
+            os.killpg(process.pid, signal.SIGTERM)
+        else:
+            process.terminate()
+    except ProcessLookupError:
+        pass
+
+def load_build_state():
+    """Load the input hashes recorded for each task by earlier builds"""
+    try:
+        with open(BUILD_STATE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f).get('tasks', {})
+    except (OSError, ValueError, AttributeError):
+        return {}
+
+def save_build_state(task_hashes):
+    """Record the input hashes of the tasks that produced the current build"""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    state = {
+        'tasks': task_hashes,
+        'builtAt': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+    tmp_path = BUILD_STATE_FILE + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, BUILD_STATE_FILE)
+
+def data_file_payload(page_name):
+    """The source size and shipped bytes of a page: the same payload its manifest entry hashes"""
+    path = os.path.join(DATA_DIR, f"{page_name}.json")
+    source_size = os.path.getsize(path)
     try:
-        result = subprocess.run(command, shell=True, check=True, capture_output=True, text=True)
-        print(f"✅ {description} completed successfully")
+        return source_size, page_payload(load_page_file(DATA_DIR, page_name))
+    except ValueError:
+        # Validation reports broken files; ship them untouched
+        with open(path, 'rb') as f:
+            return source_size, f.read()
+
+def is_generated_data_file(name):
+    return name.split('.', 1)[0] in GENERATED_DATA_STEMS
+
+def write_if_changed(path, payload):
+    """Write payload unless the file already holds exactly these bytes; returns True if it wrote"""
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            if f.read() == payload:
+                return False
+    with open(path, 'wb') as f:
+        f.write(payload)
+    return True
+
+def sync_data_files():
+    """Write changed pages into the build, plus a content-hashed copy of each, and drop stale ones"""
+    os.makedirs(BUILD_DATA_DIR, exist_ok=True)
+    keep = set()
+    synced = 0
+    source_bytes = shipped_bytes = 0
+    for page_name in page_names(DATA_DIR):
+        name = f"{page_name}.json"
+        source_size, payload = data_file_payload(page_name)
+        source_bytes += source_size
+        shipped_bytes += len(payload)
+        hashed_name = hashed_file_name(name, payload)
+        keep.update((name, hashed_name))
+        written = write_if_changed(os.path.join(BUILD_DATA_DIR, name), payload)
+        written = write_if_changed(os.path.join(BUILD_DATA_DIR, hashed_name), payload) or written
+        if written:
+            print(f"   📄 Updated data/{name} (data/{hashed_name})")
+            synced += 1
+    for name in sorted(os.listdir(BUILD_DATA_DIR)):
+        if name.endswith('.json') and name not in keep and not is_generated_data_file(name):
+            os.remove(os.path.join(BUILD_DATA_DIR, name))
+            print(f"   🗑️  Removed data/{name}")
+            synced += 1
+    print(f"✅ Synced {synced} data file(s) ({source_bytes / 1024:.1f} KB of sources shipped as "
+          f"{shipped_bytes / 1024:.1f} KB)")
+    return True
+
+def validate_content():
+    """Validate every page JSON file before spending time on the build"""
+    print("🔄 Validating page content...")
+    results = validate_data_dir(DATA_DIR)
+    error_count = 0
+    for filename, errors in results.items():
+        for error in errors:
+            print(f"   ❌ {filename} {error}")
+        error_count += len(errors)
+    if error_count:
+        print(f"❌ Found {error_count} content error(s) in {DATA_DIR}")
+        return False
+    print(f"✅ {len(results)} data file(s) are valid")
+    return True
+
+def minify_json(data):
+    """Serialize data as compact UTF-8 JSON"""
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+def build_content_bundle():
+    """Merge every page into one minified, precompressed bundle, also written under its content hash"""
+    print("🔄 Bundling page content...")
+    pages = {}
+    for page_name in page_names(DATA_DIR):
+        try:
+            content = normalized_page(load_page_file(DATA_DIR, page_name))
+        except ValueError as e:
+            print(f"❌ {os.path.join(DATA_DIR, page_name)}.json is not valid JSON: {e}")
+            return False
+        pages[page_name] = {
+            'hash': content_hash(minify_json(content)),
+            'content': content,
+        }
+
+    # No timestamp: the same content must produce the same bytes (and hash)
+    bundle = {
+        'version': 1,
+        'pages': pages,
+    }
+    payload = minify_json(bundle)
+    hashed_name = hashed_file_name(BUNDLE_NAME, payload)
+    os.makedirs(BUILD_DATA_DIR, exist_ok=True)
+    current = (BUNDLE_NAME, hashed_name)
+    for name in current:
+        write_if_changed(os.path.join(BUILD_DATA_DIR, name), payload)
+    # Drop bundles with other hashes and their .gz/.br siblings, keeping this bundle's
+    siblings = tuple(f"{name}." for name in current)
+    for name in os.listdir(BUILD_DATA_DIR):
+        if name.split('.', 1)[0] == 'content-bundle' and name not in current and not name.startswith(siblings):
+            os.remove(os.path.join(BUILD_DATA_DIR, name))
+    print(f"✅ Bundled {len(pages)} page(s) into data/{hashed_name} ({len(payload) / 1024:.1f} KB)")
+    return True
+
+def write_build_manifest():
+    """Publish the data manifest: every page's hashed file plus the hashed content bundle
+
+    Page entries hash the files Sync data shipped, so each entry's file,
+    hash and size describe exactly the bytes in the build.
+    """
+    entries = []
+    for page_name in page_names(DATA_DIR):
+        try:
+            with open(os.path.join(BUILD_DATA_DIR, f"{page_name}.json"), 'rb') as f:
+                payload = f.read()
+            entries.append(manifest_entry(page_name, json.loads(payload), payload))
+        except (OSError, ValueError):
+            # Broken or vanished files are left to validation
+            continue
+    manifest = {'version': MANIFEST_VERSION, 'totalPages': len(entries), 'pages': entries}
+    with open(os.path.join(BUILD_DATA_DIR, BUNDLE_NAME), 'rb') as f:
+        payload = f.read()
+    manifest['bundle'] = {
+        'hash': content_hash(payload),
+        'size': len(payload),
+        'file': hashed_file_name(BUNDLE_NAME, payload),
+    }
+    path = os.path.join(BUILD_DATA_DIR, MANIFEST_NAME)
+    with open(path + '.tmp', 'wb') as f:
+        f.write(minify_json(manifest))
+    os.replace(path + '.tmp', path)
+    print(f"✅ Wrote data/{MANIFEST_NAME} ({manifest['totalPages']} page(s), bundle {manifest['bundle']['file']})")
+    return True
+
+def build_search():
+    """Rebuild the search index, re-tokenizing only pages whose content changed"""
+    print("🔄 Indexing sections for search...")
+    output_path = os.path.join(BUILD_DATA_DIR, SEARCH_INDEX_NAME)
+    doc_count, term_count, rebuilt = build_search_index(DATA_DIR, output_path, SEARCH_CACHE_DIR)
+    reindexed = ', '.join(rebuilt) if rebuilt else 'none'
+    print(f"✅ Indexed {doc_count} section(s), {term_count} term(s) into data/{SEARCH_INDEX_NAME} (re-tokenized: {reindexed})")
+    return True
+
+def prerender_pages():
+    """Render each content route into a static HTML snapshot, skipping unchanged ones"""
+    print("🔄 Pre-rendering routes...")
+    try:
+        rendered, unchanged = prerender_routes(DATA_DIR, BUILD_DIR, PRERENDER_CACHE_DIR)
+    except (OSError, ValueError) as e:
+        print(f"❌ Could not pre-render routes: {e}")
+        return False
+    print(f"✅ Pre-rendered {len(rendered)} route(s) ({', '.join('/' + r for r in rendered) or 'none'}), "
+          f"{len(unchanged)} unchanged")
+    return True
+
+def map_in_workers(func, jobs, cancel=None):
+    """Run func over jobs in worker processes; returns the results, or None if cancel was set
+
+    On cancel, jobs that have not started are dropped and the running ones finish.
+    """
+    with ProcessPoolExecutor() as pool:
+        futures = [pool.submit(func, job) for job in jobs]
+        while True:
+            if cancel is not None and cancel.is_set():
+                pool.shutdown(cancel_futures=True)
+                return None
+            if not wait(futures, timeout=CANCEL_POLL_SECONDS).not_done:
+                return [future.result() for future in futures]
+
+def compress_file(path):
+    """Write .gz (and .br) siblings of one file (runs in a worker process)
+
+    A variant that would not be smaller than the file is not written.
+    Returns (path, size, {suffix: compressed size}).
+    """
+    with open(path, 'rb') as f:
+        payload = f.read()
+    encoders = {'.gz': lambda data: gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        encoders['.br'] = lambda data: brotli.compress(data, quality=11)
+    sizes = {}
+    for suffix, encode in encoders.items():
+        compressed = encode(payload)
+        if len(compressed) < len(payload):
+            with open(path + suffix + '.tmp', 'wb') as f:
+                f.write(compressed)
+            os.replace(path + suffix + '.tmp', path + suffix)
+            sizes[suffix] = len(compressed)
+        elif os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    return path, len(payload), sizes
+
+def precompress_build(cancel=None):
+    """Write .gz/.br siblings for every compressible file in the build, skipping unchanged ones"""
+    print("🔄 Precompressing assets...")
+    suffixes = ['.gz'] + (['.br'] if brotli is not None else [])
+    # relative path -> [content hash, variants written]; reset when the encoders change
+    try:
+        with open(PRECOMPRESS_STATE_FILE, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        state = {}
+    previous = state.get('files', {}) if state.get('encoders') == suffixes else {}
+
+    # Byte-identical files (a page and its content-hashed copy) are compressed
+    # once; the others get copies of its variants
+    files, jobs, copies = {}, {}, []
+    for path in iter_files(BUILD_DIR):
+        if path.endswith(('.gz', '.br')):
+            # Drop variants whose file is gone (e.g. an old hashed bundle)
+            if not os.path.exists(path[:-3]):
+                os.remove(path)
+            continue
+        if not path.endswith(COMPRESSIBLE_SUFFIXES):
+            continue
+        relative = os.path.relpath(path, BUILD_DIR).replace(os.sep, '/')
+        digest = hash_file(path)
+        entry = previous.get(relative)
+        if entry is not None and entry[0] == digest and all(os.path.exists(path + s) for s in entry[1]):
+            files[relative] = entry
+        else:
+            files[relative] = [digest, []]
+            if digest in jobs:
+                copies.append((path, jobs[digest]))
+            else:
+                jobs[digest] = path
+
+    total_before = total_after = 0
+    results = map_in_workers(compress_file, list(jobs.values()), cancel) if jobs else []
+    if results is None:
+        return False
+    for path, size, sizes in results:
+        relative = os.path.relpath(path, BUILD_DIR).replace(os.sep, '/')
+        files[relative][1] = sorted(sizes)
+        smallest = min(sizes.values(), default=size)
+        total_before += size
+        total_after += smallest
+        variants = ', '.join(f"{suffix[1:]} {compressed / 1024:.1f} KB ({(compressed - size) / size * 100:+.0f}%)"
+                             for suffix, compressed in sizes.items()) or 'not worth compressing'
+        print(f"   🗜️  {relative}: {size / 1024:.1f} KB -> {variants}")
+    for path, source in copies:
+        written = files[os.path.relpath(source, BUILD_DIR).replace(os.sep, '/')][1]
+        for suffix in suffixes:
+            if suffix in written:
+                shutil.copyfile(source + suffix, path + suffix)
+            elif os.path.exists(path + suffix):
+                os.remove(path + suffix)
+        files[os.path.relpath(path, BUILD_DIR).replace(os.sep, '/')][1] = list(written)
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(PRECOMPRESS_STATE_FILE + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump({'encoders': suffixes, 'files': files}, f, indent=2)
+    os.replace(PRECOMPRESS_STATE_FILE + '.tmp', PRECOMPRESS_STATE_FILE)
+
+    saved = f", {(total_before - total_after) / 1024:.1f} KB smaller compressed" if jobs else ''
+    variants = ' and '.join(suffix[1:] for suffix in suffixes) + ('' if brotli is not None else ' (install brotli for br)')
+    copied = f", {len(copies)} duplicate(s) copied" if copies else ''
+    print(f"✅ Compressed {len(jobs)} file(s) to {variants}{copied}, "
+          f"{len(files) - len(jobs) - len(copies)} unchanged{saved}")
+    return True
+
+def image_formats():
+    """Return the output formats the installed Pillow can encode"""
+    formats = ['webp', 'jpeg']
+    try:
+        avif = pil_features.check('avif')
+    except ValueError:
+        try:
+            import pillow_avif  # noqa: F401 (registers the AVIF plugin)
+            avif = True
+        except ImportError:
+            avif = False
+    if avif:
+        formats.insert(0, 'avif')
+    return formats
+
+def encode_image_variant(job):
+    """Resize one image and encode it in one format (runs in a worker process)"""
+    source_path, width, fmt, output_path = job
+    pil_format, options = IMAGE_ENCODERS[fmt]
+    with Image.open(source_path) as im:
+        im = ImageOps.exif_transpose(im)
+        if im.width > width:
+            im = im.resize((width, round(im.height * width / im.width)), Image.LANCZOS)
+        if im.mode not in ('RGB', 'RGBA') or (fmt == 'jpeg' and im.mode == 'RGBA'):
+            im = im.convert('RGB')
+        tmp_path = output_path + '.tmp'
+        im.save(tmp_path, pil_format, **options)
+    os.replace(tmp_path, output_path)
+    return output_path
+
+def build_images(cancel=None):
+    """Generate resized AVIF/WebP/JPEG variants of the public images plus a srcset manifest"""
+    if Image is None:
+        # A CI build without the variants would deploy a site missing its images
+        if os.environ.get('CI'):
+            print("❌ Pillow is not installed; CI builds need it for responsive images (pip install Pillow)")
+            return False
+        print("ℹ️  Pillow is not installed, skipping responsive images (pip install Pillow)")
         return True
-    except subprocess.CalledProcessError as e:
-        print(f"❌ {description} failed:")
-        print(f"Error: {e.stderr}")
+    print("🔄 Optimizing images...")
+
+    sources = sorted(
+        name for name in os.listdir(PUBLIC_DIR)
+        if name.lower().endswith(IMAGE_EXTENSIONS) and os.path.isfile(os.path.join(PUBLIC_DIR, name))
+    )
+    formats = image_formats()
+    manifest = {}
+    jobs = []
+    for name in sources:
+        source_path = os.path.join(PUBLIC_DIR, name)
+        digest = hash_file(source_path)[:16]
+        with Image.open(source_path) as im:
+            width, height = ImageOps.exif_transpose(im).size
+        widths = sorted({min(w, width) for w in IMAGE_WIDTHS})
+
+        # Cached variants are keyed by the source content, so unchanged images are never re-encoded
+        cache_dir = os.path.join(IMAGE_CACHE_DIR, digest)
+        os.makedirs(cache_dir, exist_ok=True)
+        stem = os.path.splitext(name)[0]
+        variants = {}
+        for fmt in formats:
+            variants[fmt] = []
+            for w in widths:
+                filename = f"{stem}-{w}.{fmt}"
+                cached_path = os.path.join(cache_dir, filename)
+                if not os.path.exists(cached_path):
+                    jobs.append((source_path, w, fmt, cached_path))
+                variants[fmt].append({'src': f"images/{filename}", 'width': w})
+        manifest[name] = {
+            'hash': digest,
+            'width': width,
+            'height': height,
+            'variants': variants,
+        }
+
+    if jobs and map_in_workers(encode_image_variant, jobs, cancel) is None:
         return False
 
+    os.makedirs(BUILD_IMAGES_DIR, exist_ok=True)
+    for name, entry in manifest.items():
+        cache_dir = os.path.join(IMAGE_CACHE_DIR, entry['hash'])
+        for variants in entry['variants'].values():
+            for variant in variants:
+                filename = os.path.basename(variant['src'])
+                shutil.copy2(os.path.join(cache_dir, filename), os.path.join(BUILD_IMAGES_DIR, filename))
+    with open(os.path.join(BUILD_IMAGES_DIR, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump({'images': manifest}, f, indent=2)
+
+    variant_count = sum(len(v) for entry in manifest.values() for v in entry['variants'].values())
+    print(f"✅ {variant_count} image variant(s) ready, {len(jobs)} encoded ({', '.join(formats)})")
+    return True
+
+def node_version():
+    """The Node.js version npm builds with (part of the bundle cache key)"""
+    try:
+        result = subprocess.run(['node', '--version'], capture_output=True, text=True, check=True)
+        return result.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'no-node'
+
+def bundle_cache_key():
+    """Hash of everything that decides what npm compiles"""
+    return hashlib.sha256(f"{hash_paths(JS_INPUTS)}:{node_version()}".encode('utf-8')).hexdigest()
+
+def bundle_object_path(digest):
+    return os.path.join(BUNDLE_OBJECTS_DIR, digest[:2], digest)
+
+def compiled_build_files():
+    """Relative paths of build files npm produced, as opposed to copies of public/ files"""
+    for path in iter_files(BUILD_DIR):
+        relative = os.path.relpath(path, BUILD_DIR)
+        if relative in PROCESSED_PUBLIC_FILES or not os.path.exists(os.path.join(PUBLIC_DIR, relative)):
+            yield relative
+
+def store_bundle(key):
+    """Save the freshly compiled bundle in the cache under its input key"""
+    manifest = {}
+    for relative in compiled_build_files():
+        path = os.path.join(BUILD_DIR, relative)
+        digest = hash_file(path)
+        object_path = bundle_object_path(digest)
+        if not os.path.exists(object_path):
+            # Chunks that did not change between builds are stored only once
+            os.makedirs(os.path.dirname(object_path), exist_ok=True)
+            shutil.copyfile(path, object_path + '.tmp')
+            os.replace(object_path + '.tmp', object_path)
+        manifest[relative.replace(os.sep, '/')] = digest
+
+    manifest_path = os.path.join(BUNDLE_CACHE_DIR, f"{key}.json")
+    with open(manifest_path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump({'files': manifest}, f, indent=2)
+    os.replace(manifest_path + '.tmp', manifest_path)
+    prune_bundle_cache()
+    print(f"📦 Cached the JS bundle ({len(manifest)} file(s), key {key[:12]})")
+
+def restore_bundle(key):
+    """Recreate client/build from a cached bundle plus today's public files; False on a miss"""
+    manifest_path = os.path.join(BUNDLE_CACHE_DIR, f"{key}.json")
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            files = json.load(f)['files']
+    except (OSError, ValueError, KeyError):
+        return False
+    if not all(os.path.exists(bundle_object_path(digest)) for digest in files.values()):
+        return False
+
+    shutil.rmtree(BUILD_DIR, ignore_errors=True)
+    for relative, digest in files.items():
+        target = os.path.join(BUILD_DIR, *relative.split('/'))
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copyfile(bundle_object_path(digest), target)
+    # npm copies public/ (data included) into the build; layer the current files on top the same way
+    for path in iter_files(PUBLIC_DIR):
+        relative = os.path.relpath(path, PUBLIC_DIR)
+        if relative in PROCESSED_PUBLIC_FILES:
+            continue
+        target = os.path.join(BUILD_DIR, relative)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copy2(path, target)
+    # Recently used bundles survive pruning
+    os.utime(manifest_path)
+    return True
+
+def prune_bundle_cache():
+    """Keep the most recently used bundles and drop files no kept bundle refers to"""
+    manifests = sorted(
+        (os.path.join(BUNDLE_CACHE_DIR, name) for name in os.listdir(BUNDLE_CACHE_DIR) if name.endswith('.json')),
+        key=os.path.getmtime, reverse=True)
+    for path in manifests[BUNDLE_CACHE_KEEP:]:
+        os.remove(path)
+    referenced = set()
+    for path in manifests[:BUNDLE_CACHE_KEEP]:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                referenced.update(json.load(f)['files'].values())
+        except (OSError, ValueError, KeyError):
+            continue
+    for path in iter_files(BUNDLE_OBJECTS_DIR):
+        if os.path.basename(path) not in referenced:
+            os.remove(path)
+
+def full_build(cancel=None, use_cache=True):
+    """Build the static site with npm, or restore an identical earlier build from the cache"""
+    key = bundle_cache_key()
+    if use_cache and TRACE.step('Restore cached bundle', restore_bundle, key):
+        print(f"✅ Restored the JS bundle from the build cache (key {key[:12]}), skipping npm")
+    else:
+        if not run_command("npm run build", "Building static site", cancel):
+            return False
+        TRACE.step('Cache bundle', store_bundle, key)
+    # Both paths leave raw copies of the data files, which the Sync data task
+    # replaces; drop the copied manifest so the build's own is written again
+    build_manifest_path = os.path.join(BUILD_DATA_DIR, MANIFEST_NAME)
+    if os.path.exists(build_manifest_path):
+        os.remove(build_manifest_path)
+    return True
+
+def sync_public_assets():
+    """Copy changed public files (outside the data directory) into the build as-is"""
+    copied = 0
+    for path in iter_files(PUBLIC_DIR, exclude=[DATA_DIR]):
+        relative = os.path.relpath(path, PUBLIC_DIR)
+        if relative in PROCESSED_PUBLIC_FILES:
+            continue
+        target = os.path.join(BUILD_DIR, relative)
+        # Matching stats short-circuit; otherwise the contents are compared
+        if os.path.exists(target) and filecmp.cmp(path, target):
+            continue
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copy2(path, target)
+        print(f"   🖼️  Updated {relative.replace(os.sep, '/')}")
+        copied += 1
+    print(f"✅ Copied {copied} changed public file(s)")
+    return True
+
+def build_tasks(cancel=None, use_cache=True, stage='full'):
+    """The build stages: what each one reads and writes, and what has to finish first
+
+    stage: the watch stage to rebuild; tasks it skips are left out, and
+        whatever they wrote in the last build stands in for them
+    """
+    data = {'inputs': [DATA_DIR], 'suffixes': ('.json',)}
+    bundle_path = os.path.join(BUILD_DATA_DIR, BUNDLE_NAME)
+    tasks = [
+        # Never build broken content
+        Task('Validate content', validate_content, **data),
+        Task('Build JS bundle', lambda: full_build(cancel, use_cache), inputs=JS_INPUTS, salt=node_version,
+             outputs=[os.path.join(BUILD_DIR, 'index.html')], deps=['Validate content']),
+        # npm replaces client/build, so everything that writes into it waits for the bundle.
+        # No inputs: it always runs, to replace the raw data files a new bundle
+        # leaves behind, but it only writes pages whose shipped bytes changed
+        Task('Sync data', sync_data_files, deps=['Build JS bundle']),
+        Task('Sync public assets', sync_public_assets, inputs=[PUBLIC_DIR],
+             exclude=[DATA_DIR] + [os.path.join(PUBLIC_DIR, name) for name in PROCESSED_PUBLIC_FILES],
+             outputs=[BUILD_DIR], deps=['Build JS bundle']),
+        Task('Bundle content', build_content_bundle, **data,
+             outputs=[bundle_path], deps=['Build JS bundle']),
+        Task('Content manifest', write_build_manifest, **data,
+             outputs=[os.path.join(BUILD_DATA_DIR, MANIFEST_NAME)], deps=['Sync data', 'Bundle content']),
+        Task('Search index', build_search, **data,
+             outputs=[os.path.join(BUILD_DATA_DIR, SEARCH_INDEX_NAME)], deps=['Build JS bundle']),
+        Task('Pre-render routes', prerender_pages, inputs=[DATA_DIR, os.path.join(BUILD_DIR, 'index.html')],
+             outputs=[os.path.join(BUILD_DIR, f"{route}.html") for route in ROUTES], deps=['Build JS bundle']),
+        Task('Images', lambda: build_images(cancel), inputs=[PUBLIC_DIR], exclude=[DATA_DIR], suffixes=IMAGE_EXTENSIONS,
+             outputs=[os.path.join(BUILD_IMAGES_DIR, 'manifest.json')], deps=['Build JS bundle']),
+        # Last, over everything the other stages wrote; no inputs, so it always
+        # runs, but it only compresses files whose content hash changed
+        Task('Precompress', lambda: precompress_build(cancel),
+             deps=['Sync data', 'Sync public assets', 'Content manifest', 'Search index',
+                   'Pre-render routes', 'Images']),
+    ]
+    skipped = set(WATCH_STAGE_SKIPS[stage])
+    for task in tasks:
+        task.deps = [dep for dep in task.deps if dep not in skipped]
+    return [task for task in tasks if task.name not in skipped]
+
+def prepare_data():
+    """Fold pending editor journals into the page files the build reads; returns the compacted pages"""
+    compacted = TRACE.step('Compact journals', compact_journals, DATA_DIR)
+    if compacted:
+        print(f"📝 Compacted edit journals for: {', '.join(compacted)}")
+    if TRACE.step('Write manifest', write_manifest, DATA_DIR):
+        print(f"📝 Regenerated {os.path.join(DATA_DIR, MANIFEST_NAME)} from the page files")
+    return compacted
+
+def run_build(force=False, cancel=None, jobs=None, prepared=False, stage='full'):
+    """Run the build graph (or a watch stage's part of it); returns True, False, or None if cancel was set"""
+    if not prepared:
+        prepare_data()
+
+    graph = TaskGraph(build_tasks(cancel, use_cache=not force, stage=stage), TRACE, {} if force else load_build_state())
+    outcomes = graph.run(force=force, cancel=cancel, max_workers=jobs)
+    save_build_state(graph.state)
+
+    counts = {}
+    for outcome in outcomes.values():
+        counts[outcome] = counts.get(outcome, 0) + 1
+    print(f"📋 Tasks: {', '.join(f'{count} {outcome}' for outcome, count in sorted(counts.items()))}")
+    if outcomes['Validate content'] == FAILED:
+        print("❌ Build aborted. Please fix the content errors above.")
+    if FAILED in counts:
+        return False
+    if CANCELLED in counts:
+        return None
+    return True
+
+def change_stage(path, own_writes):
+    """Return the cheapest watch stage that covers a changed path, or None to ignore it
+
+    own_writes maps the pages the watcher compacted itself to their stat key
+    right after; a page that still has that key was changed by the build.
+    """
+    path = os.path.abspath(path)
+    public_dir = os.path.abspath(PUBLIC_DIR)
+    if os.path.dirname(path) == os.path.abspath(DATA_DIR):
+        name = os.path.basename(path)
+        # The manifest is regenerated by every save and build
+        if name == MANIFEST_NAME:
+            return None
+        for suffix in (JOURNAL_SUFFIX, '.json'):
+            if name.endswith(suffix):
+                page_name = name[:-len(suffix)]
+                if page_name in own_writes and page_stat_key(DATA_DIR, page_name) == own_writes[page_name]:
+                    return None
+                return 'data'
+        return None
+    if path.startswith(public_dir + os.sep) and os.path.relpath(path, public_dir) not in PROCESSED_PUBLIC_FILES:
+        return 'assets'
+    return 'full'
+
+def wider_stage(*stages):
+    """Return the most thorough of the given stages (None entries are ignored)"""
+    stages = [stage for stage in stages if stage is not None]
+    return max(stages, key=WATCH_STAGES.index) if stages else None
+
+def start_watch_rebuild(stage):
+    """Start a watch-mode rebuild's trace and compact journals; returns {page: stat key} of the compacted pages"""
+    # Runs on the watching thread, so the stat keys are known before the
+    # compaction's own file events are read
+    global TRACE
+    TRACE = BuildTrace(sys.argv + [f"(watch: {stage})"])
+    print(f"\n🔄 Rebuilding ({stage})...")
+    return {page_name: page_stat_key(DATA_DIR, page_name) for page_name in prepare_data()}
+
+def watch_rebuild(stage, cancel):
+    """Run one watch stage of the build graph; returns True, False, or None if it was cancelled"""
+    started = time.perf_counter()
+    try:
+        result = run_build(cancel=cancel, prepared=True, stage=stage)
+    finally:
+        write_trace(None, 'watch')
+    if result:
+        print(f"🎉 Rebuilt in {(time.perf_counter() - started) * 1000:.0f} ms")
+    return result
+
+def watch(debounce_ms):
+    """Rebuild whenever data, public assets or source change, until interrupted"""
+    from file_watcher import create_watcher
+
+    paths = [PUBLIC_DIR] + [path for path in JS_INPUTS if not path.startswith(PUBLIC_DIR + os.sep)]
+    paths = [path for path in paths if os.path.exists(path)]
+    watcher = create_watcher(paths, recursive=True)
+    print(f"👀 Watching {', '.join(paths)} ({type(watcher).__name__}, Ctrl+C to stop)")
+
+    # Start by catching up with anything that changed since the last build.
+    # Within a stage, tasks whose inputs did not change are still skipped
+    pending = 'full'
+    last_change = 0.0
+    worker = None
+    failed = None
+    outcome = {}
+    own_writes = {}
+    cancel = threading.Event()
+    debounce = debounce_ms / 1000
+
+    def run(stage, cancel):
+        outcome['stage'] = stage
+        outcome['result'] = watch_rebuild(stage, cancel)
+
+    try:
+        while True:
+            if worker is not None and not worker.is_alive():
+                worker = None
+                if outcome['result'] is None:
+                    # Redo the cancelled work together with whatever cancelled it
+                    pending = wider_stage(pending, outcome['stage'])
+                elif outcome['result'] is False:
+                    print("❌ Rebuild failed, waiting for the next change")
+                    failed = outcome['stage']
+                else:
+                    failed = None
+                    print("👀 Waiting for changes...")
+
+            if pending is not None and worker is None and time.monotonic() - last_change >= debounce:
+                cancel = threading.Event()
+                # A failed stage is retried along with the next change
+                stage = wider_stage(pending, failed)
+                own_writes.update(start_watch_rebuild(stage))
+                worker = threading.Thread(target=run, args=(stage, cancel), daemon=True)
+                worker.start()
+                pending = None
+
+            timeout = None if pending is None and worker is None else 0.1
+            changed = watcher.wait(timeout)
+            stage = wider_stage(*(change_stage(path, own_writes) for path in changed))
+            if stage is None:
+                continue
+            # Coalesce a burst of changes into one rebuild after things go quiet
+            pending = wider_stage(pending, stage)
+            last_change = time.monotonic()
+            if worker is not None and not cancel.is_set():
+                print("⏹️  Newer changes arrived, cancelling the current rebuild")
+                cancel.set()
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching")
+        cancel.set()
+        if worker is not None:
+            worker.join()
+    finally:
+        watcher.close()
+
+def serve(host, port, live_data=True, watch_debounce_ms=None):
+    """Serve the build until interrupted, optionally rebuilding on changes (--watch)"""
+    from preview_server import create_server
+
+    if not os.path.exists(os.path.join(BUILD_DIR, 'index.html')):
+        print(f"❌ {BUILD_DIR}/index.html not found - build the site first (python3 rebuild-site.py)")
+        return False
+    try:
+        server = create_server(BUILD_DIR, host, port, DATA_DIR if live_data else None)
+    except OSError as e:
+        print(f"❌ Could not listen on {host}:{port}: {e}")
+        return False
+    data_source = f"live from {DATA_DIR}" if live_data else f"as built in {BUILD_DATA_DIR}"
+    print(f"🌐 Serving {BUILD_DIR} at http://{host}:{port}/ (page data {data_source}, Ctrl+C to stop)")
+
+    if watch_debounce_ms is not None:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            watch(watch_debounce_ms)
+        finally:
+            server.shutdown()
+            server.server_close()
+        return True
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Stopped serving")
+    finally:
+        server.server_close()
+    return True
+
+def write_trace(args, kind='build'):
+    """Write the trace of this run and print where the time went"""
+    if resource is not None:
+        # Highest RSS of any child that has exited (npm, image workers, ...)
+        TRACE.metadata['peakChildRssMb'] = peak_rss_mb(resource.getrusage(resource.RUSAGE_CHILDREN))
+    path = getattr(args, 'trace', None) or os.path.join(
+        TRACE_DIR, f"{kind}-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    json_path, chrome_path = TRACE.write(path)
+
+    print("\n⏱️  Slowest phases:")
+    for line in TRACE.summary_lines():
+        print(f"   {line}")
+    print(f"   Trace: {json_path} (Chrome/Perfetto: {chrome_path})")
+
+    compare_path = getattr(args, 'compare_trace', None)
+    if compare_path:
+        try:
+            previous = load_trace(compare_path)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Could not read {compare_path}: {e}")
+            return
+        print(f"\n📊 Compared with {compare_path}:")
+        for line in compare_traces(previous, TRACE.to_json()):
+            print(f"   {line}")
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Rebuild the static website after content changes")
+    parser.add_argument('--force', action='store_true',
+                        help="run every build stage, even the ones that are up to date, and rebuild the JS bundle with npm instead of restoring it from the cache")
+    parser.add_argument('--incremental', action='store_true',
+                        help="accepted for compatibility: up-to-date stages are always skipped unless --force")
+    parser.add_argument('--jobs', type=int, metavar='N',
+                        help="how many build stages may run at once (default: CPU count + 4)")
+    parser.add_argument('--watch', action='store_true',
+                        help="keep running and rebuild the cheapest stage covering each change")
+    parser.add_argument('--debounce', type=int, default=WATCH_DEBOUNCE_MS, metavar='MS',
+                        help=f"quiet time before a watch-mode rebuild starts (default: {WATCH_DEBOUNCE_MS})")
+    parser.add_argument('--serve', action='store_true',
+                        help="serve the built site locally instead of building it (with --watch: serve while rebuilding)")
+    parser.add_argument('--host', default=SERVE_HOST, help=f"address for --serve (default: {SERVE_HOST})")
+    parser.add_argument('--port', type=int, default=SERVE_PORT, help=f"port for --serve (default: {SERVE_PORT})")
+    parser.add_argument('--build-data', action='store_true',
+                        help=f"with --serve, serve page data as built instead of live from {DATA_DIR}")
+    parser.add_argument('--trace', metavar='PATH',
+                        help=f"where to write the timing trace (default: {TRACE_DIR}/build-<time>.json)")
+    parser.add_argument('--compare-trace', metavar='PATH',
+                        help="print per-phase timing changes against an earlier trace")
+    return parser.parse_args(argv)
+
 def main():
+    args = parse_args()
+
     print("🚀 Rebuilding static website...")
     print("=" * 50)
-    
+
     # Check if we're in the right directory
     if not os.path.exists('client'):
         print("❌ Error: 'client' directory not found. Please run this script from the project root.")
         sys.exit(1)
-    
-    # Build the static site
-    if not run_command("npm run build", "Building static site"):
+
+    if args.serve:
+        if not serve(args.host, args.port, live_data=not args.build_data,
+                     watch_debounce_ms=args.debounce if args.watch else None):
+            sys.exit(1)
+        return
+
+    if args.watch:
+        watch(args.debounce)
+        return
+
+    built = run_build(force=args.force, jobs=args.jobs)
+    write_trace(args)
+    if not built:
         print("❌ Build failed. Please check the errors above.")
         sys.exit(1)
-    
+
     print("\n🎉 Static site rebuilt successfully!")
     print("\n📁 Built files are in: client/build/")
-    print("🌐 To preview locally, run: npm run preview")
+    print("🌐 To preview locally, run: python3 rebuild-site.py --serve (or npm run preview)")
     print("🚀 To deploy, push changes to GitHub")
 
 if __name__ == "__main__":
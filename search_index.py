@@ -0,0 +1,163 @@
+"""
+Inverted search index over portfolio sections
+
+Each section is one document. Its title, description, technologies and
+HTML-stripped text are tokenized into weighted terms, and the index maps
+every term to a postings list of (document, weight) pairs. Tokenized pages
+are cached by content hash so only changed pages are re-tokenized.
+"""
+
+import hashlib
+import html
+import json
+import os
+import re
+
+from content_store import WEBSITE_PAGES
+
+INDEX_VERSION = 1
+
+# Fields that are indexed and how much a match in each one counts
+FIELD_WEIGHTS = {
+    'title': 3,
+    'technologies': 3,
+    'description': 2,
+    'text': 1,
+}
+
+TAG_RE = re.compile(r'<[^>]+>')
+# Keeps technology names such as c++, c#, node.js and scikit-learn in one piece
+TOKEN_RE = re.compile(r'[a-z0-9]+(?:[+#]+|(?:[.\-][a-z0-9]+)+)?')
+
+STOP_WORDS = frozenset("""
+a an and are as at be by for from has have in into is it its of on or that the
+their this to was were will with using use used via our we i my me
+""".split())
+
+
+def strip_html(text):
+    """Drop tags and decode entities, keeping word boundaries"""
+    return html.unescape(TAG_RE.sub(' ', text))
+
+
+def tokenize(text):
+    """Lowercase text and split it into index terms"""
+    return [
+        token for token in TOKEN_RE.findall(text.lower())
+        if token not in STOP_WORDS and (len(token) > 1 or not token.isalpha())
+    ]
+
+
+def section_terms(section):
+    """Return {term: weight} for one section"""
+    terms = {}
+    for field, weight in FIELD_WEIGHTS.items():
+        value = section.get(field)
+        if not value:
+            continue
+        if isinstance(value, list):
+            value = ' '.join(str(item) for item in value)
+        elif field == 'text':
+            value = strip_html(value)
+        for token in tokenize(str(value)):
+            terms[token] = terms.get(token, 0) + weight
+    return terms
+
+
+def page_hash(page):
+    """Content hash of a page as it would be indexed"""
+    payload = json.dumps(page, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def tokenize_page(page_name, page):
+    """Turn a page into its indexable documents"""
+    sections = sorted(page.get('sections', []), key=lambda x: x.get('order', 0))
+    return [
+        {
+            'page': page_name,
+            'section': index,
+            'title': section.get('title', ''),
+            'terms': section_terms(section),
+        }
+        for index, section in enumerate(sections)
+    ]
+
+
+def load_page_documents(page_name, data_dir, cache_dir):
+    """Return (documents, rebuilt) for a page, reusing the cached tokens when the hash matches"""
+    with open(os.path.join(data_dir, f"{page_name}.json"), 'r', encoding='utf-8') as f:
+        page = json.load(f)
+    digest = page_hash(page)
+
+    cache_path = os.path.join(cache_dir, f"{page_name}.json")
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        if cached.get('version') == INDEX_VERSION and cached.get('hash') == digest:
+            return cached['documents'], False
+    except (OSError, ValueError):
+        pass
+
+    documents = tokenize_page(page_name, page)
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = cache_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': INDEX_VERSION, 'hash': digest, 'documents': documents}, f,
+                  separators=(',', ':'), ensure_ascii=False)
+    os.replace(tmp_path, cache_path)
+    return documents, True
+
+
+def merge_documents(documents):
+    """Build the compact index: doc table, sorted term dictionary and postings
+
+    postings[i] belongs to terms[i] and is a flat list of
+    [doc_delta, weight, doc_delta, weight, ...] with ascending doc ids.
+    stopWords lets the client drop the same query words the indexer drops.
+    """
+    docs = []
+    inverted = {}
+    for doc_id, document in enumerate(documents):
+        docs.append([document['page'], document['section'], document['title']])
+        for term, weight in document['terms'].items():
+            inverted.setdefault(term, []).append((doc_id, weight))
+
+    terms = sorted(inverted)
+    postings = []
+    for term in terms:
+        flat = []
+        previous = 0
+        for doc_id, weight in inverted[term]:
+            flat.extend((doc_id - previous, weight))
+            previous = doc_id
+        postings.append(flat)
+
+    return {
+        'version': INDEX_VERSION,
+        'docs': docs,
+        'terms': terms,
+        'postings': postings,
+        'stopWords': sorted(STOP_WORDS),
+    }
+
+
+def build_search_index(data_dir, output_path, cache_dir, pages=None):
+    """Write the search index and return (document count, term count, rebuilt page names)"""
+    documents = []
+    rebuilt = []
+    for page_name in pages or WEBSITE_PAGES:
+        if not os.path.exists(os.path.join(data_dir, f"{page_name}.json")):
+            continue
+        page_documents, changed = load_page_documents(page_name, data_dir, cache_dir)
+        documents.extend(page_documents)
+        if changed:
+            rebuilt.append(page_name)
+
+    index = merge_documents(documents)
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    tmp_path = output_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, separators=(',', ':'), ensure_ascii=False)
+    os.replace(tmp_path, output_path)
+    return len(index['docs']), len(index['terms']), rebuilt
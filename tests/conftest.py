@@ -0,0 +1,47 @@
+import json
+import os
+import sys
+
+import pytest
+
+# The modules live at the repository root next to the scripts that use them
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def make_page(page_name='projects', sections=3):
+    return {
+        'pageName': page_name,
+        'title': page_name.title(),
+        'description': f"All about {page_name}",
+        'sections': [
+            {
+                'title': f"Section {i}",
+                'githubLink': f"https://github.com/someone/repo{i}",
+                'documentationLink': '',
+                'description': f"Description {i}",
+                'technologies': ['Python', f"Tool{i}"],
+                'text': f"<p>Body of section {i}</p>",
+                'order': i * 1024,
+            }
+            for i in range(sections)
+        ],
+        'lastUpdated': '2024-01-01T00:00:00',
+    }
+
+
+@pytest.fixture
+def page():
+    return make_page()
+
+
+@pytest.fixture
+def page_factory():
+    return make_page
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    """A data directory holding a projects page"""
+    with open(tmp_path / 'projects.json', 'w', encoding='utf-8') as f:
+        json.dump(make_page(), f, indent=2)
+    return str(tmp_path)
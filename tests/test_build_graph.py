@@ -0,0 +1,92 @@
+import threading
+
+import pytest
+
+from build_graph import CANCELLED, FAILED, RAN, SKIPPED, Task, TaskGraph
+from build_trace import BuildTrace
+
+
+class Recorder:
+    """Task functions that log their calls"""
+
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def task(self, name, result=True, then=None):
+        def run():
+            with self.lock:
+                self.calls.append(name)
+            if then is not None:
+                then()
+            return result
+        return run
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / 'source.txt'
+    path.write_text('one')
+    return path
+
+
+def graph_for(recorder, source, tmp_path, state=None, fail=None, cancel=None):
+    output = tmp_path / 'output.txt'
+    output.write_text('built')
+    tasks = [
+        Task('read', recorder.task('read', fail != 'read'), inputs=[str(source)], outputs=[str(output)]),
+        Task('transform', recorder.task('transform', then=cancel.set if cancel else None),
+             inputs=[str(source)], deps=['read']),
+        Task('publish', recorder.task('publish'), deps=['transform']),
+    ]
+    return TaskGraph(tasks, BuildTrace(), state)
+
+
+def test_unchanged_inputs_are_skipped(tmp_path, source):
+    recorder = Recorder()
+    graph = graph_for(recorder, source, tmp_path)
+    assert graph.run() == {'read': RAN, 'transform': RAN, 'publish': RAN}
+
+    recorder = Recorder()
+    again = graph_for(recorder, source, tmp_path, graph.state)
+    # A task without inputs always runs
+    assert again.run() == {'read': SKIPPED, 'transform': SKIPPED, 'publish': RAN}
+    assert recorder.calls == ['publish']
+
+    source.write_text('two')
+    assert graph_for(Recorder(), source, tmp_path, graph.state).run()['read'] == RAN
+    assert graph_for(Recorder(), source, tmp_path, graph.state).run(force=True)['transform'] == RAN
+
+
+def test_missing_output_reruns_a_task(tmp_path, source):
+    graph = graph_for(Recorder(), source, tmp_path)
+    graph.run()
+    again = graph_for(Recorder(), source, tmp_path, graph.state)
+    (tmp_path / 'output.txt').unlink()
+    assert again.run()['read'] == RAN
+
+
+def test_failure_cancels_downstream_and_is_retried(tmp_path, source):
+    recorder = Recorder()
+    graph = graph_for(recorder, source, tmp_path, fail='read')
+    assert graph.run() == {'read': FAILED, 'transform': CANCELLED, 'publish': CANCELLED}
+    assert recorder.calls == ['read']
+    # Only successful runs are remembered
+    assert 'read' not in graph.state
+    assert graph_for(Recorder(), source, tmp_path, graph.state).run()['read'] == RAN
+
+
+def test_cancel_stops_tasks_that_have_not_started(tmp_path, source):
+    recorder = Recorder()
+    cancel = threading.Event()
+    graph = graph_for(recorder, source, tmp_path, cancel=cancel)
+    outcomes = graph.run(cancel=cancel)
+    assert outcomes['transform'] == RAN and outcomes['publish'] == CANCELLED
+    assert 'publish' not in recorder.calls
+
+
+def test_unknown_dependencies_and_cycles_are_rejected():
+    with pytest.raises(ValueError, match='unknown task'):
+        TaskGraph([Task('a', lambda: True, deps=['missing'])], BuildTrace())
+    with pytest.raises(ValueError, match='cycle'):
+        TaskGraph([Task('a', lambda: True, deps=['b']), Task('b', lambda: True, deps=['a'])], BuildTrace())
@@ -0,0 +1,56 @@
+import threading
+
+import pytest
+
+from build_trace import BuildTrace, compare_traces, load_trace
+
+
+def crash():
+    raise RuntimeError("boom")
+
+
+def statuses(trace):
+    return {phase['name']: phase['status'] for phase in trace.phases}
+
+
+def test_step_records_status_and_result():
+    trace = BuildTrace(['rebuild-site.py'])
+    assert trace.step('ok', lambda: 42) == 42
+    assert trace.step('failed', lambda: False) is False
+    with pytest.raises(RuntimeError):
+        trace.step('crashed', crash)
+    with trace.phase('skipped', 'task') as info:
+        info['status'] = 'skipped'
+        info['files'] = 3
+    assert statuses(trace) == {'ok': 'ok', 'failed': 'failed', 'crashed': 'error', 'skipped': 'skipped'}
+    assert trace.phases[-1]['files'] == 3
+    # Skipped phases are left out of the slowest-phases report
+    assert sorted(line.split()[-1] for line in trace.summary_lines()) == ['crashed', 'failed', 'ok']
+
+
+def test_phases_from_threads_get_their_own_track():
+    trace = BuildTrace()
+    trace.step('main', lambda: None)
+    worker = threading.Thread(target=trace.step, args=('worker', lambda: None), name='build-task_0')
+    worker.start()
+    worker.join()
+    chrome = trace.to_chrome()
+    names = {event['args']['name'] for event in chrome['traceEvents'] if event['ph'] == 'M'}
+    assert 'build-task_0' in names
+    tids = {event['name']: event['tid'] for event in chrome['traceEvents'] if event['ph'] == 'X'}
+    assert tids['main'] != tids['worker']
+
+
+def test_write_and_compare(tmp_path):
+    trace = BuildTrace(['rebuild-site.py'])
+    trace.step('Sync data', lambda: None)
+    path, chrome_path = trace.write(str(tmp_path / 'traces' / 'build.json'))
+    assert chrome_path.endswith('build.chrome.json')
+    previous = load_trace(path)
+    assert [phase['name'] for phase in previous['phases']] == ['Sync data']
+
+    current = dict(previous, phases=[dict(previous['phases'][0], name='Search index')])
+    lines = compare_traces(previous, current)
+    assert any('Search index' in line and '(new)' in line for line in lines)
+    assert any('Sync data' in line and '(not run)' in line for line in lines)
+    assert lines[-1].startswith('total')
@@ -0,0 +1,107 @@
+import random
+
+import pytest
+
+from bulk_edit import ContentIndex, plan_replace, query_words, replace_host, replace_technologies
+from content_store import apply_page_operation, delete_section, move_section
+
+
+@pytest.fixture
+def pages(page_factory):
+    pages = {'projects': page_factory('projects'), 'experience': page_factory('experience', sections=2)}
+    pages['experience']['sections'][1]['text'] = '<p>Shipped a Python service at Acme Corp</p>'
+    pages['experience']['sections'][1]['githubLink'] = 'https://user@GitHub.com:443/acme/service'
+    return pages
+
+
+def build_index(pages):
+    index = ContentIndex()
+    for page_name, page in pages.items():
+        index.update_page(page_name, page)
+    return index
+
+
+class FullScan(ContentIndex):
+    """Visits every section, to check that the index never misses a match"""
+
+    def candidates(self, scope, find, whole_word=False):
+        return self.all_locations()
+
+
+def test_technology_rename_and_removal():
+    assert replace_technologies(['Python', 'Go'], 'python', 'Python 3') == ['Python 3', 'Go']
+    assert replace_technologies(['Python', 'Go'], 'go', '') == ['Python']
+    assert replace_technologies(['Python'], 'rust', 'Rust') is None
+
+
+def test_host_replacement_keeps_user_info_and_port():
+    assert replace_host('https://user@GitHub.com:443/acme/x', 'github.com', 'gitlab.com') == \
+        'https://user@gitlab.com:443/acme/x'
+    assert replace_host('https://example.com/a', 'github.com', 'gitlab.com') is None
+
+
+def test_only_interior_runs_are_certain():
+    assert query_words('ython serv', False) == []
+    assert query_words('a Python service', False) == ['python']
+    assert query_words('ython serv', True) == ['ython', 'serv']
+
+
+def test_plan_replace_builds_a_patch(pages):
+    index = build_index(pages)
+    patch, replacements = plan_replace(index, pages.__getitem__, 'technology', 'python', 'Python 3')
+    assert replacements == 5
+    assert patch['experience'] == [
+        {'op': 'set', 'section': 0, 'field': 'technologies', 'value': ['Python 3', 'Tool0']},
+        {'op': 'set', 'section': 1, 'field': 'technologies', 'value': ['Python 3', 'Tool1']},
+    ]
+
+    patch, replacements = plan_replace(index, pages.__getitem__, 'host', 'github.com', 'gitlab.com')
+    assert replacements == 5
+    assert patch['experience'][1]['value'] == 'https://user@gitlab.com:443/acme/service'
+
+    for page_name, operations in patch.items():
+        for operation in operations:
+            apply_page_operation(pages[page_name], operation)
+    assert plan_replace(index, pages.__getitem__, 'host', 'github.com', 'gitlab.com') == ({}, 0)
+
+
+def test_text_replace_matches_a_full_scan(pages):
+    index = build_index(pages)
+    full = FullScan()
+    full.pages = index.pages
+    texts = [section[field] for page in pages.values() for section in page['sections']
+             for field in ('title', 'description', 'text')]
+    rng = random.Random(5)
+    for _ in range(500):
+        text = rng.choice(texts)
+        start = rng.randrange(len(text))
+        find = text[start:start + rng.randint(1, 20)]
+        if not find.strip():
+            continue
+        options = (rng.random() < 0.3, rng.random() < 0.3)
+        assert plan_replace(index, pages.__getitem__, 'text', find, 'Z', *options) == \
+            plan_replace(full, pages.__getitem__, 'text', find, 'Z', *options), find
+
+
+def test_incremental_update_matches_a_fresh_index(pages):
+    index = build_index(pages)
+    page = pages['projects']
+    move_section(page, 0, 2)
+    delete_section(page, 1)
+    page['sections'][0]['text'] = '<p>Rewritten with Rust</p>'
+    index.update_page('projects', page)
+    assert index.postings == build_index(pages).postings
+    assert index.locate(('tech', 'rust')) == []
+    assert index.locate(('word', 'rust')) == [('projects', 0)]
+
+    index.remove_page('experience')
+    del pages['experience']
+    assert index.postings == build_index(pages).postings
+
+
+def test_unknown_scope_and_empty_find_are_rejected(pages):
+    index = build_index(pages)
+    with pytest.raises(ValueError):
+        plan_replace(index, pages.__getitem__, 'everywhere', 'x', 'y')
+    with pytest.raises(ValueError):
+        plan_replace(index, pages.__getitem__, 'text', '  ', 'y')
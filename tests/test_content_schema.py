@@ -0,0 +1,51 @@
+import json
+import os
+
+from content_schema import validate_data_dir, validate_file, validate_page
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'client', 'public', 'data')
+
+
+def paths(errors):
+    return [error.path for error in errors]
+
+
+def test_valid_page_has_no_errors(page):
+    assert validate_page(page, 'projects') == []
+
+
+def test_errors_are_located_by_json_path(page):
+    page['sections'][1]['order'] = True
+    page['sections'][2]['githubLink'] = 'not a url'
+    page['sections'][0]['technologies'] = ['Python', '']
+    del page['sections'][0]['title']
+    assert sorted(paths(validate_page(page))) == [
+        '$.sections[0]',
+        '$.sections[0].technologies[1]',
+        '$.sections[1].order',
+        '$.sections[2].githubLink',
+    ]
+
+
+def test_page_name_must_match_the_file(page):
+    assert paths(validate_page(page, 'about')) == ['$.pageName']
+
+
+def test_invalid_json_reports_the_position(tmp_path):
+    path = tmp_path / 'projects.json'
+    path.write_text('{"pageName": "projects",\n  "title": }', encoding='utf-8')
+    [error] = validate_file(str(path))
+    assert 'line 2' in error.message
+
+
+def test_manifest_is_checked_against_its_own_schema(tmp_path, page):
+    (tmp_path / 'projects.json').write_text(json.dumps(page), encoding='utf-8')
+    (tmp_path / 'manifest.json').write_text(json.dumps({'pages': [{'title': 'x'}]}), encoding='utf-8')
+    results = validate_data_dir(str(tmp_path))
+    assert results['projects.json'] == []
+    [error] = results['manifest.json']
+    assert error.path == '$.pages[0]' and 'pageName' in error.message
+
+
+def test_shipped_data_is_valid():
+    assert all(errors == [] for errors in validate_data_dir(DATA_DIR).values())
@@ -0,0 +1,112 @@
+import os
+import threading
+
+import content_store
+from content_store import (ORDER_GAP, PageCache, PageWriter, add_section, apply_journal, compact_journals,
+                           copy_page, diff_pages, journal_path, load_page_file, move_section)
+
+
+def orders(page):
+    return [section['order'] for section in page['sections']]
+
+
+def titles(page):
+    return [section['title'] for section in page['sections']]
+
+
+def test_add_section_between_neighbours_keeps_other_orders(page):
+    before = orders(page)
+    add_section(page, {'title': 'Inserted'}, position=1)
+    assert titles(page)[1] == 'Inserted'
+    assert orders(page)[0] == before[0] and orders(page)[2:] == before[1:]
+    assert before[0] < orders(page)[1] < before[1]
+
+
+def test_move_section_changes_only_the_moved_order(page):
+    before = orders(page)
+    assert move_section(page, 0, 2) is False
+    assert titles(page) == ['Section 1', 'Section 2', 'Section 0']
+    assert orders(page)[:2] == before[1:]
+    assert orders(page)[2] == before[2] + ORDER_GAP
+
+
+def test_repeated_inserts_rebalance_when_keys_run_out(page):
+    for _ in range(80):
+        add_section(page, {'title': 'Squeezed'}, position=1)
+    assert orders(page) == sorted(orders(page))
+    assert len(set(orders(page))) == len(page['sections'])
+
+
+def test_journal_replays_diff(page):
+    edited = copy_page(page)
+    edited['title'] = 'Renamed'
+    edited['sections'][1]['text'] = '<p>Changed</p>'
+    move_section(edited, 0, 2)
+    del edited['sections'][1]
+    add_section(edited, {'title': 'New'})
+
+    ops = diff_pages(page, edited)
+    assert {op['op'] for op in ops} == {'page', 'patch', 'move', 'remove', 'put'}
+    assert apply_journal(copy_page(page), [{'ops': ops}]) == edited
+
+
+def test_writer_journals_and_compaction_folds_it_in(data_dir):
+    page = load_page_file(data_dir, 'projects')
+    page['sections'][0]['title'] = 'Journaled'
+    writer = PageWriter(data_dir)
+    writer.submit('projects', page)
+    assert writer.flush(5)
+
+    assert os.path.exists(journal_path(data_dir, 'projects'))
+    assert load_page_file(data_dir, 'projects') == page
+
+    assert compact_journals(data_dir) == ['projects']
+    assert not os.path.exists(journal_path(data_dir, 'projects'))
+    assert load_page_file(data_dir, 'projects') == page
+    writer.close(5)
+
+
+def test_torn_journal_line_is_ignored(data_dir):
+    page = load_page_file(data_dir, 'projects')
+    content_store.append_journal(data_dir, 'projects', [{'op': 'page', 'fields': {'title': 'Kept'}}])
+    with open(journal_path(data_dir, 'projects'), 'a', encoding='utf-8') as f:
+        f.write('{"ops": [{"op": "page", "fie')
+    assert load_page_file(data_dir, 'projects') == dict(page, title='Kept')
+
+
+def test_journal_is_not_replayed_twice_after_a_crash(data_dir):
+    # Not idempotent: replayed on the compacted page, the move would overwrite the put
+    content_store.append_journal(data_dir, 'projects', [{'op': 'move', 'from': 0, 'to': 512}])
+    content_store.append_journal(data_dir, 'projects', [{'op': 'put', 'order': 0, 'section': {'title': 'New'}}])
+    compacted = load_page_file(data_dir, 'projects')
+    assert titles(compacted) == ['New', 'Section 0', 'Section 1', 'Section 2']
+
+    # A crash after the page file was rewritten but before the journal was removed
+    content_store.atomic_write_json(f"{data_dir}/projects.json", compacted)
+    assert load_page_file(data_dir, 'projects') == compacted
+    assert compact_journals(data_dir) == ['projects']
+    assert load_page_file(data_dir, 'projects') == compacted
+
+
+def test_appends_during_compaction_are_kept(data_dir):
+    def append():
+        for i in range(200):
+            content_store.append_journal(data_dir, 'projects', [{'op': 'page', 'fields': {f"key{i}": i}}])
+
+    thread = threading.Thread(target=append)
+    thread.start()
+    while thread.is_alive():
+        compact_journals(data_dir)
+    page = load_page_file(data_dir, 'projects')
+    assert all(page[f"key{i}"] == i for i in range(200))
+
+
+def test_cache_returns_private_copies_and_notices_changes(data_dir):
+    cache = PageCache(data_dir)
+    first = cache.load('projects')
+    first['title'] = 'Changed in memory'
+    assert cache.load('projects')['title'] == 'Projects'
+    assert cache.hits == 1
+
+    content_store.append_journal(data_dir, 'projects', [{'op': 'page', 'fields': {'title': 'On disk'}}])
+    assert cache.load('projects')['title'] == 'On disk'
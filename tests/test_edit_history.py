@@ -0,0 +1,102 @@
+import copy
+import random
+
+import pytest
+
+import content_store
+from edit_history import EditHistory, apply_operation, field_operations, invert, text_edit
+
+
+def test_text_edit_stores_only_the_changed_span():
+    assert text_edit('a long description', 'a short description') == [2, 'long', 'short']
+    assert text_edit('same', 'same') == [4, '', '']
+
+
+@pytest.mark.parametrize('operation', [
+    {'op': 'set', 'field': 'title', 'edit': [0, 'Section', 'Part']},
+    {'op': 'set', 'section': 1, 'field': 'technologies', 'old': ['Python', 'Tool1'], 'new': ['Go']},
+    {'op': 'delete', 'section': 0, 'value': {'title': 'Section 0', 'text': '', 'order': 0}},
+    {'op': 'move', 'from': 0, 'to': 2, 'orders': [0, 3072]},
+])
+def test_invert_twice_is_the_identity(operation):
+    assert invert(invert(operation)) == operation
+
+
+def test_inverse_restores_the_page(page):
+    before = copy.deepcopy(page)
+    edited = copy.deepcopy(page)
+    edited['sections'][1]['text'] = '<p>Body of the second section</p>'
+    edited['sections'][1]['technologies'] = ['Go']
+    operations = field_operations(page['sections'][1], edited['sections'][1], content_store.SECTION_FIELDS, 1)
+
+    for operation in operations:
+        apply_operation(page, operation)
+    assert page == edited
+    for operation in reversed(operations):
+        apply_operation(page, invert(operation))
+    assert page == before
+
+
+def test_undo_and_redo_of_random_edits(page):
+    rng = random.Random(3)
+    history = EditHistory(max_bytes=10 ** 9)
+    snapshots = [copy.deepcopy(page)]
+    for step in range(200):
+        sections = page['sections']
+        choice = rng.random()
+        if choice < 0.5 and sections:
+            index = rng.randrange(len(sections))
+            after = dict(sections[index], text=sections[index]['text'] + f' edit {step}')
+            operations = field_operations(sections[index], after, ['text'], index)
+        elif choice < 0.7:
+            index = rng.randrange(len(sections) + 1)
+            section = content_store.add_section(page, {'title': f"Added {step}"}, index)
+            content_store.delete_section(page, index)
+            operations = [{'op': 'add', 'section': index, 'value': section}]
+        elif choice < 0.85 and sections:
+            index = rng.randrange(len(sections))
+            operations = [{'op': 'delete', 'section': index, 'value': sections[index]}]
+        elif len(sections) > 1:
+            source, target = rng.sample(range(len(sections)), 2)
+            old_order = sections[source]['order']
+            moved = copy.deepcopy(page)
+            content_store.move_section(moved, source, target)
+            operations = [{'op': 'move', 'from': source, 'to': target,
+                           'orders': [old_order, moved['sections'][target]['order']]}]
+        else:
+            continue
+        operations = copy.deepcopy(operations)
+        for operation in operations:
+            apply_operation(page, operation)
+        history.record('edit', operations)
+        snapshots.append(copy.deepcopy(page))
+
+    for snapshot in reversed(snapshots[:-1]):
+        history.undo(page)
+        assert page == snapshot
+    assert not history.can_undo()
+    for snapshot in snapshots[1:]:
+        history.redo(page)
+        assert page == snapshot
+
+
+def test_oldest_steps_are_dropped_over_the_limits(page):
+    history = EditHistory(max_bytes=10 ** 9, max_steps=3)
+    for i in range(5):
+        history.record(f"step {i}", [{'op': 'set', 'field': 'title', 'edit': [0, '', 'x']}])
+    assert [step[0] for step in history.undo_steps] == ['step 2', 'step 3', 'step 4']
+
+    small = EditHistory(max_bytes=1)
+    small.record('big', [{'op': 'set', 'field': 'title', 'edit': [0, '', 'x' * 100]}])
+    assert small.can_undo()
+
+
+def test_a_new_edit_clears_redo(page):
+    history = EditHistory()
+    operation = {'op': 'set', 'field': 'title', 'edit': [0, '', 'New ']}
+    apply_operation(page, operation)
+    history.record('title', [operation])
+    history.undo(page)
+    assert history.can_redo()
+    history.record('other', [{'op': 'set', 'field': 'description', 'edit': [0, '', 'x']}])
+    assert not history.can_redo()
@@ -0,0 +1,66 @@
+import os
+
+import pytest
+
+from file_watcher import InotifyWatcher, PollingWatcher, default_ignore
+
+
+def make_watcher(kind, paths, **options):
+    if kind == 'polling':
+        return PollingWatcher(paths, interval=0.01, **options)
+    try:
+        return InotifyWatcher(paths, **options)
+    except OSError as e:
+        pytest.skip(f"inotify unavailable: {e}")
+
+
+@pytest.fixture(params=['polling', 'inotify'])
+def kind(request):
+    return request.param
+
+
+def test_reports_created_changed_and_deleted_files(kind, tmp_path):
+    page = tmp_path / 'projects.json'
+    page.write_text('{}')
+    watcher = make_watcher(kind, [str(tmp_path)])
+    try:
+        assert watcher.wait(0.05) == set()
+        page.write_text('{"title": "changed"}')
+        assert str(page) in watcher.wait(2)
+        (tmp_path / 'about.json').write_text('{}')
+        assert str(tmp_path / 'about.json') in watcher.wait(2)
+        page.unlink()
+        assert str(page) in watcher.wait(2)
+    finally:
+        watcher.close()
+
+
+def test_recursive_watch_follows_new_directories(kind, tmp_path):
+    watcher = make_watcher(kind, [str(tmp_path)], recursive=True)
+    try:
+        nested = tmp_path / 'images' / 'new'
+        nested.mkdir(parents=True)
+        watcher.wait(0.1)
+        (nested / 'photo.jpg').write_bytes(b'jpeg')
+        assert str(nested / 'photo.jpg') in watcher.wait(2)
+    finally:
+        watcher.close()
+
+
+def test_single_file_ignores_its_siblings(kind, tmp_path):
+    watched = tmp_path / 'package.json'
+    watched.write_text('{}')
+    watcher = make_watcher(kind, [str(watched)])
+    try:
+        (tmp_path / 'other.json').write_text('{}')
+        assert watcher.wait(0.1) == set()
+        watched.write_text('{"name": "x"}')
+        assert watcher.wait(2) == {str(watched)}
+    finally:
+        watcher.close()
+
+
+def test_temp_and_dependency_paths_are_ignored():
+    assert default_ignore(os.path.join('data', '.projects.json.123.tmp'))
+    assert default_ignore(os.path.join('client', 'node_modules'))
+    assert not default_ignore(os.path.join('data', 'projects.json'))
@@ -0,0 +1,90 @@
+import importlib.util
+import json
+import os
+
+import pytest
+
+from content_store import load_page_file
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope='module')
+def editor():
+    spec = importlib.util.spec_from_file_location('content_editor', os.path.join(ROOT, 'content-editor.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def cli(editor, data_dir):
+    """Run one headless command against data_dir and return its exit status"""
+    def run(*argv):
+        return editor.run_cli(editor.parse_args(['--data-dir', data_dir, *argv]))
+    return run
+
+
+def titles(data_dir):
+    return [section['title'] for section in load_page_file(data_dir, 'projects')['sections']]
+
+
+def test_get_prints_json(cli, capsys):
+    assert cli('get', 'projects', '--section', '1', '--field', 'technologies') == 0
+    assert json.loads(capsys.readouterr().out) == ['Python', 'Tool1']
+    assert cli('get', 'projects', '--field', 'title') == 0
+    assert json.loads(capsys.readouterr().out) == 'Projects'
+
+
+def test_set_page_and_section_fields(cli, data_dir):
+    assert cli('set', 'projects', 'title', 'Work') == 0
+    assert cli('set', 'projects', 'technologies', '["Go"]', '--section', '2', '--json') == 0
+    page = load_page_file(data_dir, 'projects')
+    assert page['title'] == 'Work' and page['sections'][2]['technologies'] == ['Go']
+    with open(os.path.join(data_dir, 'manifest.json'), encoding='utf-8') as f:
+        assert json.load(f)['pages'][0]['title'] == 'Work'
+
+
+def test_add_delete_and_move_sections(cli, data_dir):
+    assert cli('add', 'projects', '--field', 'title', 'Added', '--position', '1') == 0
+    assert titles(data_dir) == ['Section 0', 'Added', 'Section 1', 'Section 2']
+    assert cli('delete', 'projects', '0') == 0
+    assert cli('move', 'projects', '2', '0') == 0
+    assert titles(data_dir) == ['Section 2', 'Added', 'Section 1']
+
+
+def test_apply_runs_a_patch_file(cli, data_dir, tmp_path):
+    patch = tmp_path / 'patch.json'
+    patch.write_text(json.dumps({'pages': {'projects': [
+        {'op': 'add', 'fields': {'title': 'Patched'}},
+        {'op': 'set', 'section': 3, 'field': 'description', 'value': 'Added by a patch'},
+    ]}}), encoding='utf-8')
+    assert cli('apply', str(patch)) == 0
+    page = load_page_file(data_dir, 'projects')
+    assert page['sections'][3]['title'] == 'Patched'
+    assert page['sections'][3]['description'] == 'Added by a patch'
+
+
+def test_replace_and_dry_run(cli, data_dir, capsys):
+    assert cli('replace', 'technology', 'Python', 'Python 3', '--dry-run') == 0
+    assert '3 match(es) on 1 page(s)' in capsys.readouterr().out
+    assert load_page_file(data_dir, 'projects')['sections'][0]['technologies'] == ['Python', 'Tool0']
+
+    assert cli('replace', 'technology', 'Python', 'Python 3') == 0
+    assert all(section['technologies'][0] == 'Python 3'
+               for section in load_page_file(data_dir, 'projects')['sections'])
+
+
+def test_invalid_edit_leaves_the_files_untouched(cli, data_dir, tmp_path):
+    # A valid edit followed by one the schema rejects: neither is saved
+    patch = tmp_path / 'patch.json'
+    patch.write_text(json.dumps({'pages': {'projects': [
+        {'op': 'set', 'field': 'title', 'value': 'Work'},
+        {'op': 'set', 'section': 0, 'field': 'githubLink', 'value': 'not a link'},
+    ]}}), encoding='utf-8')
+    before = {name: (tmp_path / name).read_bytes() for name in os.listdir(data_dir)}
+    with pytest.raises(ValueError, match='nothing was saved'):
+        cli('apply', str(patch))
+    with pytest.raises(ValueError, match='nothing was saved'):
+        cli('set', 'projects', 'title', '5', '--json')
+    assert {name: (tmp_path / name).read_bytes() for name in os.listdir(data_dir)} == before
@@ -0,0 +1,45 @@
+import random
+
+import pytest
+
+from html_normalizer import normalize_html, strip_tags, to_editable, to_text
+
+FRAGMENTS = [
+    '<p>', '</p>', '<br>', '<BR/>', '<br />', '<ul>', '</ul>', '<li>', '</li>', '<Strong>', '</strong>',
+    '<h2>', '</h2>', ' ', '  ', '\n', '\t', 'word', 'a b', '&amp;', '<a  href="x y">', '</a>',
+    '<!-- note -->', '<hr/>', '<img src="a.png"/>', '<pre>', '</pre>', '<code>', '</CODE>', '  \n  ',
+]
+
+
+@pytest.mark.parametrize('html, expected', [
+    ('<P>Hello   <B>world</B></P>', '<p>Hello <b>world</b></p>'),
+    ('<p>one\ntwo</p>\n\n<p>three</p>', '<p>one<br>two</p><p>three</p>'),
+    ('<ul>\n  <li>a</li>\n  <li>b</li>\n</ul>', '<ul><li>a</li><li>b</li></ul>'),
+    ('<p>kept<!-- dropped --> text<br/></p>', '<p>kept text</p>'),
+    ('<pre class="sh">  make  test\n  make install\n</pre>', '<pre class="sh">  make  test\n  make install\n</pre>'),
+    ('<p>run <code>a  b\n</code>  now</p>', '<p>run <code>a  b\n</code> now</p>'),
+])
+def test_normalize(html, expected):
+    assert normalize_html(html) == expected
+
+
+def test_editable_layout_is_one_block_per_line():
+    assert to_editable('<p>one<br>two</p><ul><li>a</li></ul>') == '<p>one\ntwo</p>\n<ul>\n<li>a</li>\n</ul>'
+
+
+def test_round_trips_are_stable():
+    rng = random.Random(7)
+    for _ in range(5000):
+        html = ''.join(rng.choice(FRAGMENTS) for _ in range(rng.randint(0, 12)))
+        normalized = normalize_html(html)
+        assert normalize_html(normalized) == normalized, html
+        assert normalize_html(to_editable(normalized)) == normalized, html
+
+
+def test_unclosed_pre_keeps_its_trailing_newline():
+    assert to_editable('<pre>x\n') == '<pre>x\n'
+
+
+def test_text_views():
+    assert to_text('<p>one<br>two</p><p>three</p>') == 'one\ntwo\n\nthree\n\n'
+    assert strip_tags('<p>a <b>b</b></p>') == 'a b'
@@ -0,0 +1,54 @@
+import json
+
+import pytest
+
+from prerender import prerender_routes, render_document
+
+TEMPLATE = ('<html><head><title>Jane Doe | Portfolio</title>'
+            '<meta name="description" content="Site"></head>'
+            '<body><div id="root"></div></body></html>')
+
+
+@pytest.fixture
+def build_dir(tmp_path):
+    build = tmp_path / 'build'
+    build.mkdir()
+    (build / 'index.html').write_text(TEMPLATE, encoding='utf-8')
+    return build
+
+
+def test_document_carries_the_page(page):
+    page['sections'][0]['title'] = 'Tom & Jerry <3'
+    page['sections'].reverse()
+    document = render_document(TEMPLATE, page, 'Portfolio')
+    assert '<title>Projects | Portfolio</title>' in document
+    assert 'content="All about projects"' in document
+    assert 'Tom &amp; Jerry &lt;3' in document
+    assert '<p>Body of section 2</p>' in document
+    assert document.index('Description 0') < document.index('Description 1') < document.index('Description 2')
+
+
+def test_only_changed_routes_are_rendered(tmp_path, data_dir, build_dir):
+    cache = str(tmp_path / 'cache')
+    routes = {'projects': 'projects', 'missing': 'nowhere'}
+    assert prerender_routes(data_dir, str(build_dir), cache, routes) == (['projects'], [])
+    assert 'Section 1' in (build_dir / 'projects.html').read_text(encoding='utf-8')
+    assert prerender_routes(data_dir, str(build_dir), cache, routes) == ([], ['projects'])
+
+    with open(f"{data_dir}/projects.json", 'r+', encoding='utf-8') as f:
+        page = json.load(f)
+        page['title'] = 'Work'
+        f.seek(0)
+        f.truncate()
+        json.dump(page, f)
+    assert prerender_routes(data_dir, str(build_dir), cache, routes) == (['projects'], [])
+
+    # A new template re-renders every route
+    (build_dir / 'index.html').write_text(TEMPLATE.replace('Site', 'New'), encoding='utf-8')
+    assert prerender_routes(data_dir, str(build_dir), cache, routes) == (['projects'], [])
+
+
+def test_template_needs_an_empty_root(tmp_path, data_dir, build_dir):
+    (build_dir / 'index.html').write_text('<div id="root">rendered</div>', encoding='utf-8')
+    with pytest.raises(ValueError):
+        prerender_routes(data_dir, str(build_dir), str(tmp_path / 'cache'))
@@ -0,0 +1,149 @@
+import gzip
+import http.client
+import json
+import threading
+
+import pytest
+
+from content_store import content_hash, page_payload
+from preview_server import SENDFILE_MIN_BYTES, accepted_encodings, create_server, parse_range
+
+SCRIPT = b'console.log("app");\n' * 100
+LARGE = bytes(range(256)) * (SENDFILE_MIN_BYTES // 256 + 10)
+
+
+@pytest.fixture
+def build_dir(tmp_path):
+    build = tmp_path / 'build'
+    (build / 'static' / 'js').mkdir(parents=True)
+    (build / 'index.html').write_text('<div id="root"></div>', encoding='utf-8')
+    (build / 'about.html').write_text('<div id="root">About</div>', encoding='utf-8')
+    (build / 'static' / 'js' / 'main.1a2b3c4d.js').write_bytes(SCRIPT)
+    (build / 'static' / 'js' / 'main.1a2b3c4d.js.gz').write_bytes(gzip.compress(SCRIPT))
+    (build / 'video.bin').write_bytes(LARGE)
+    return build
+
+
+@pytest.fixture
+def serve():
+    """Start a server on a free port and return a function making requests to it"""
+    servers = []
+
+    def start(build_dir, data_dir=None):
+        server = create_server(str(build_dir), port=0, data_dir=data_dir)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+
+        def request(path, method='GET', **headers):
+            connection = http.client.HTTPConnection(*server.server_address, timeout=5)
+            connection.request(method, path, headers=headers)
+            response = connection.getresponse()
+            body = response.read()
+            connection.close()
+            return response, body
+        return request
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def test_etag_revalidation(serve, build_dir):
+    request = serve(build_dir)
+    response, body = request('/index.html')
+    assert response.status == 200 and body == b'<div id="root"></div>'
+    assert response.getheader('Cache-Control') == 'no-cache'
+    etag = response.getheader('ETag')
+
+    response, body = request('/index.html', **{'If-None-Match': f'W/{etag}, "other"'})
+    assert response.status == 304 and body == b''
+    assert request('/index.html', **{'If-None-Match': '"stale"'})[0].status == 200
+    # If-None-Match wins over If-Modified-Since
+    response, _ = request('/index.html', **{'If-None-Match': '"stale"',
+                                            'If-Modified-Since': response.getheader('Last-Modified')})
+    assert response.status == 200
+
+    (build_dir / 'index.html').write_text('<div id="root">changed</div>', encoding='utf-8')
+    assert request('/index.html', **{'If-None-Match': etag})[0].status == 200
+
+
+def test_precompressed_sibling_and_immutable_names(serve, build_dir):
+    request = serve(build_dir)
+    response, body = request('/static/js/main.1a2b3c4d.js', **{'Accept-Encoding': 'br;q=0, gzip'})
+    assert response.getheader('Content-Encoding') == 'gzip'
+    assert gzip.decompress(body) == SCRIPT
+    assert 'immutable' in response.getheader('Cache-Control')
+    response, body = request('/static/js/main.1a2b3c4d.js')
+    assert response.getheader('Content-Encoding') is None and body == SCRIPT
+
+
+@pytest.mark.parametrize('path', ['/video.bin', '/static/js/main.1a2b3c4d.js'])
+def test_byte_ranges(serve, build_dir, path):
+    request = serve(build_dir)
+    content = (build_dir / path.lstrip('/')).read_bytes()
+    size = len(content)
+
+    response, body = request(path, Range='bytes=10-19', **{'Accept-Encoding': 'gzip'})
+    assert response.status == 206 and body == content[10:20]
+    assert response.getheader('Content-Range') == f'bytes 10-19/{size}'
+    assert response.getheader('Content-Encoding') is None
+
+    assert request(path, Range='bytes=-5')[1] == content[-5:]
+    response, body = request(path, Range=f'bytes={size - 100}-')
+    assert body == content[-100:]
+    response, body = request(path, Range=f'bytes=0-{SENDFILE_MIN_BYTES}')
+    assert body == content[:SENDFILE_MIN_BYTES + 1]
+
+    response, _ = request(path, Range=f'bytes={size}-')
+    assert response.status == 416 and response.getheader('Content-Range') == f'bytes */{size}'
+
+    etag = request(path)[0].getheader('ETag')
+    assert request(path, Range='bytes=0-0', **{'If-Range': etag})[0].status == 206
+    response, body = request(path, Range='bytes=0-0', **{'If-Range': '"old"'})
+    assert response.status == 200 and body == content
+
+
+def test_parse_range():
+    assert parse_range('bytes=0-9', 100) == (0, 9)
+    assert parse_range('bytes=90-200', 100) == (90, 99)
+    assert parse_range('bytes=-200', 100) == (0, 99)
+    assert parse_range('bytes=100-', 100) is False
+    assert parse_range('bytes=-0', 100) is False
+    for ignored in ['bytes=0-1,5-6', 'items=0-1', 'bytes=9-2', 'bytes=a-b', 'bytes']:
+        assert parse_range(ignored, 100) is None
+
+
+def test_routes_and_fallbacks(serve, build_dir):
+    request = serve(build_dir)
+    assert request('/about')[1] == b'<div id="root">About</div>'
+    assert request('/projects/detail')[1] == b'<div id="root"></div>'
+    assert request('/missing.png')[0].status == 404
+    # Paths can't climb out of the build: this is an unknown route, so it gets the app
+    assert request('/../../etc/passwd')[1] == b'<div id="root"></div>'
+    assert request('/../../etc/hosts.txt')[0].status == 404
+
+    (build_dir / '_redirects').write_text('/old /about 301\n/* /index.html 200\n', encoding='utf-8')
+    request = serve(build_dir)
+    response, _ = request('/old')
+    assert response.status == 301 and response.getheader('Location') == '/about'
+    assert request('/anything')[1] == b'<div id="root"></div>'
+
+
+def test_live_page_data(serve, build_dir, data_dir):
+    request = serve(build_dir, data_dir)
+    with open(f"{data_dir}/projects.json", encoding='utf-8') as f:
+        payload = page_payload(json.load(f))
+    response, body = request('/data/projects.json')
+    assert body == payload and response.getheader('Cache-Control') == 'no-cache'
+    response, body = request(f'/data/projects.{content_hash(payload)}.json')
+    assert body == payload and 'immutable' in response.getheader('Cache-Control')
+    assert request('/data/projects.json', **{'If-None-Match': response.getheader('ETag')})[0].status == 304
+    assert json.loads(request('/data/manifest.json')[1])['pages'][0]['pageName'] == 'projects'
+    # The bundle would hide live edits, so the app falls back to page files
+    assert request('/data/content-bundle.json')[0].status == 404
+
+
+def test_accepted_encodings():
+    assert accepted_encodings('gzip, br;q=0, deflate;q=0.5') == {'gzip', 'deflate'}
+    assert accepted_encodings(None) == set()
@@ -0,0 +1,301 @@
+import gzip
+import importlib.util
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+
+import pytest
+
+import file_watcher
+from content_store import content_hash, page_payload
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_script():
+    spec = importlib.util.spec_from_file_location('rebuild_site', os.path.join(ROOT, 'rebuild-site.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def site(tmp_path, monkeypatch, page_factory):
+    """The build script, run from a project holding a projects page and an empty build"""
+    monkeypatch.chdir(tmp_path)
+    module = load_script()
+    # Worker processes find the stage functions by module name
+    monkeypatch.setitem(sys.modules, module.__name__, module)
+    os.makedirs(module.DATA_DIR)
+    os.makedirs(module.BUILD_DIR)
+    write_page(module, page_factory())
+    return module
+
+
+def write_page(site, page):
+    with open(os.path.join(site.DATA_DIR, f"{page['pageName']}.json"), 'w', encoding='utf-8') as f:
+        json.dump(page, f, indent=2)
+
+
+def build_file(site, name):
+    with open(os.path.join(site.BUILD_DATA_DIR, name), 'rb') as f:
+        return f.read()
+
+
+def test_manifest_describes_the_shipped_files(site, page_factory):
+    # Valid on disk, but not in display order
+    page = page_factory('experience')
+    page['sections'].reverse()
+    write_page(site, page)
+    assert site.sync_data_files() and site.build_content_bundle() and site.write_build_manifest()
+
+    manifest = json.loads(build_file(site, site.MANIFEST_NAME))
+    assert [entry['pageName'] for entry in manifest['pages']] == ['experience', 'projects']
+    for entry in manifest['pages'] + [manifest['bundle']]:
+        payload = build_file(site, entry['file'])
+        assert len(payload) == entry['size'] and content_hash(payload) == entry['hash']
+    for entry in manifest['pages']:
+        assert build_file(site, f"{entry['pageName']}.json") == build_file(site, entry['file'])
+    shipped = json.loads(build_file(site, 'experience.json'))
+    assert [section['title'] for section in shipped['sections']] == ['Section 0', 'Section 1', 'Section 2']
+
+
+def test_images_need_pillow_in_ci(site, monkeypatch):
+    monkeypatch.setattr(site, 'Image', None)
+    monkeypatch.delenv('CI', raising=False)
+    assert site.build_images()
+    monkeypatch.setenv('CI', 'true')
+    assert not site.build_images()
+
+
+def test_identical_files_are_compressed_once(site, capsys):
+    site.sync_data_files()
+    hashed_name = site.hashed_file_name('projects.json', build_file(site, 'projects.json'))
+    capsys.readouterr()
+    assert site.precompress_build()
+    assert 'Compressed 1 file(s)' in capsys.readouterr().out
+    assert gzip.decompress(build_file(site, f"{hashed_name}.gz")) == build_file(site, 'projects.json')
+    assert build_file(site, f"{hashed_name}.gz") == build_file(site, 'projects.json.gz')
+
+    assert site.precompress_build()
+    assert 'Compressed 0 file(s)' in capsys.readouterr().out
+
+
+def test_changes_pick_the_cheapest_covering_stage(site):
+    data_dir = site.DATA_DIR
+    assert site.change_stage(os.path.join(data_dir, 'projects.json'), {}) == 'data'
+    assert site.change_stage(os.path.join(data_dir, 'projects.journal.jsonl'), {}) == 'data'
+    assert site.change_stage(os.path.join(data_dir, site.MANIFEST_NAME), {}) is None
+    assert site.change_stage(os.path.join(data_dir, '.projects.json.1.2.tmp'), {}) is None
+    assert site.change_stage(os.path.join(site.PUBLIC_DIR, 'photo.png'), {}) == 'assets'
+    assert site.change_stage(os.path.join(site.PUBLIC_DIR, 'index.html'), {}) == 'full'
+    assert site.change_stage(os.path.join(site.CLIENT_DIR, 'src', 'App.js'), {}) == 'full'
+    assert site.wider_stage(None, 'data', 'assets') == 'assets'
+    assert site.wider_stage(None) is None
+
+    # The watcher's own compaction is ignored until the page changes again
+    own_writes = {'projects': site.page_stat_key(data_dir, 'projects')}
+    assert site.change_stage(os.path.join(data_dir, 'projects.json'), own_writes) is None
+    with open(os.path.join(data_dir, 'projects.journal.jsonl'), 'w', encoding='utf-8') as f:
+        f.write('{"ops": []}\n')
+    assert site.change_stage(os.path.join(data_dir, 'projects.json'), own_writes) == 'data'
+
+
+def test_stages_leave_out_the_tasks_they_cannot_affect(site):
+    names = {stage: [task.name for task in site.build_tasks(stage=stage)] for stage in site.WATCH_STAGES}
+    assert 'Build JS bundle' in names['full'] and 'Build JS bundle' not in names['assets']
+    assert 'Images' in names['assets'] and 'Images' not in names['data']
+    for stage in site.WATCH_STAGES:
+        # Every stage forms a graph of its own
+        site.TaskGraph(site.build_tasks(stage=stage), site.TRACE)
+
+
+class ScriptedWatcher:
+    """Stands in for the file watcher: one batch of changed paths per wait, then Ctrl+C"""
+
+    def __init__(self, batches):
+        self.batches = list(batches)
+
+    def wait(self, timeout=None):
+        if not self.batches:
+            raise KeyboardInterrupt
+        time.sleep(0.01)
+        return self.batches.pop(0)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def watch_runs(site, monkeypatch):
+    """Run site.watch over scripted changes; returns [(stage, was cancelled)] per rebuild
+
+    The first rebuild takes up to first_run_seconds, unless it is cancelled sooner.
+    """
+    def run(batches, first_run_seconds=0, debounce_ms=100):
+        runs = []
+
+        def rebuild(stage, cancel):
+            cancelled = cancel.wait(first_run_seconds if not runs else 0)
+            runs.append((stage, cancelled))
+            return None if cancelled else True
+
+        monkeypatch.setattr(site, 'start_watch_rebuild', lambda stage: {})
+        monkeypatch.setattr(site, 'watch_rebuild', rebuild)
+        monkeypatch.setattr(file_watcher, 'create_watcher', lambda paths, recursive: ScriptedWatcher(batches))
+        site.watch(debounce_ms)
+        return runs
+    return run
+
+
+def test_a_burst_of_changes_is_rebuilt_once(site, watch_runs):
+    page = os.path.join(site.DATA_DIR, 'projects.json')
+    # After the catch-up build, five changes 10 ms apart and then 300 ms of quiet
+    assert watch_runs([[]] * 5 + [[page]] * 5 + [[]] * 30) == [('full', False), ('data', False)]
+
+
+def test_newer_changes_cancel_the_running_rebuild(site, watch_runs):
+    image = os.path.join(site.PUBLIC_DIR, 'photo.png')
+    # The cancelled full rebuild is redone along with the asset change
+    assert watch_runs([[]] * 5 + [[image]] + [[]] * 30, first_run_seconds=5) == [('full', True), ('full', False)]
+
+
+def test_cancel_stops_worker_stages(site):
+    cancel = threading.Event()
+    threading.Timer(0.2, cancel.set).start()
+    started = time.monotonic()
+    assert site.map_in_workers(time.sleep, [0.1] * 200, cancel) is None
+    assert time.monotonic() - started < 5
+    assert site.map_in_workers(abs, [-1, 2]) == [1, 2]
+
+    site.sync_data_files()
+    assert site.precompress_build(cancel) is False
+    assert not os.path.exists(site.PRECOMPRESS_STATE_FILE)
+
+
+def test_sync_rewrites_changed_pages_and_drops_stale_ones(site, page_factory, capsys):
+    write_page(site, page_factory('experience'))
+    site.sync_data_files()
+    for name in (site.BUNDLE_NAME, site.SEARCH_INDEX_NAME, 'old.json', 'old.0123456789abcdef.json'):
+        with open(os.path.join(site.BUILD_DATA_DIR, name), 'wb') as f:
+            f.write(b'{}')
+    os.remove(os.path.join(site.DATA_DIR, 'experience.json'))
+    capsys.readouterr()
+
+    site.sync_data_files()
+    assert 'Updated' not in capsys.readouterr().out
+    hashed_name = site.hashed_file_name('projects.json', build_file(site, 'projects.json'))
+    assert sorted(os.listdir(site.BUILD_DATA_DIR)) == sorted(
+        [site.BUNDLE_NAME, site.SEARCH_INDEX_NAME, 'projects.json', hashed_name])
+
+
+@pytest.fixture
+def npm_builds(site, monkeypatch):
+    """Stand in for the JS bundle stage; returns the list of times it ran"""
+    builds = []
+
+    def full_build(cancel=None, use_cache=True):
+        builds.append(use_cache)
+        with open(os.path.join(site.BUILD_DIR, 'index.html'), 'w', encoding='utf-8') as f:
+            f.write('<html><head><title>Site</title></head><body><div id="root"></div></body></html>')
+        return True
+
+    monkeypatch.setattr(site, 'full_build', full_build)
+    monkeypatch.delenv('CI', raising=False)
+    return builds
+
+
+def test_up_to_date_tasks_are_skipped(site, npm_builds, page_factory, capsys):
+    for page_name in ('home', 'education', 'experience'):
+        write_page(site, page_factory(page_name))
+    assert site.run_build()
+    assert site.run_build()
+    # Only the tasks without inputs run again
+    assert 'Tasks: 2 ran, 8 skipped' in capsys.readouterr().out
+
+    page = json.loads(build_file(site, 'projects.json'))
+    write_page(site, dict(page, title='Work'))
+    assert site.run_build()
+    out = capsys.readouterr().out
+    assert 'Build JS bundle: up to date' in out and 'Sync public assets: up to date' in out
+    assert npm_builds == [True]
+    assert json.loads(build_file(site, 'projects.json'))['title'] == 'Work'
+
+
+def test_content_bundle_is_deterministic(site, page_factory):
+    assert site.build_content_bundle()
+    payload = build_file(site, site.BUNDLE_NAME)
+    bundle = json.loads(payload)
+    assert bundle['pages']['projects']['hash'] == content_hash(page_payload(page_factory()))
+    hashed_name = site.hashed_file_name(site.BUNDLE_NAME, payload)
+    assert build_file(site, hashed_name) == payload
+
+    # Same content, written differently: same bytes, same hash
+    page = page_factory()
+    page['sections'].reverse()
+    with open(os.path.join(site.DATA_DIR, 'projects.json'), 'w', encoding='utf-8') as f:
+        json.dump(page, f, indent=4)
+    assert site.build_content_bundle()
+    assert build_file(site, site.BUNDLE_NAME) == payload
+
+    # New content replaces the old hashed bundle but keeps the current one's siblings
+    with open(os.path.join(site.BUILD_DATA_DIR, f"{hashed_name}.gz"), 'wb') as f:
+        f.write(gzip.compress(payload))
+    write_page(site, dict(page, title='Work'))
+    assert site.build_content_bundle()
+    new_name = site.hashed_file_name(site.BUNDLE_NAME, build_file(site, site.BUNDLE_NAME))
+    assert new_name != hashed_name
+    assert sorted(os.listdir(site.BUILD_DATA_DIR)) == sorted([site.BUNDLE_NAME, new_name])
+
+
+def compile_bundle(site, script):
+    """Lay out a build the way npm does: compiled files plus copies of public/"""
+    os.makedirs(os.path.join(site.BUILD_DIR, 'static', 'js'), exist_ok=True)
+    with open(os.path.join(site.BUILD_DIR, 'index.html'), 'w', encoding='utf-8') as f:
+        f.write('<div id="root"></div>')
+    with open(os.path.join(site.BUILD_DIR, 'static', 'js', 'main.js'), 'w', encoding='utf-8') as f:
+        f.write(script)
+    shutil.copytree(site.PUBLIC_DIR, site.BUILD_DIR, dirs_exist_ok=True)
+
+
+def test_bundle_cache_hit_and_miss(site):
+    with open(os.path.join(site.PUBLIC_DIR, 'robots.txt'), 'w', encoding='utf-8') as f:
+        f.write('User-agent: *\n')
+    compile_bundle(site, 'app()')
+    site.store_bundle('key')
+    assert not site.restore_bundle('other')
+
+    shutil.rmtree(site.BUILD_DIR)
+    with open(os.path.join(site.PUBLIC_DIR, 'robots.txt'), 'w', encoding='utf-8') as f:
+        f.write('User-agent: none\n')
+    assert site.restore_bundle('key')
+    with open(os.path.join(site.BUILD_DIR, 'static', 'js', 'main.js'), encoding='utf-8') as f:
+        assert f.read() == 'app()'
+    # Public files come from today's tree, not the cached build
+    with open(os.path.join(site.BUILD_DIR, 'robots.txt'), encoding='utf-8') as f:
+        assert f.read() == 'User-agent: none\n'
+    assert os.path.exists(os.path.join(site.BUILD_DATA_DIR, 'projects.json'))
+
+    # A missing object is a miss, and the build is left alone
+    for path in site.iter_files(site.BUNDLE_OBJECTS_DIR):
+        os.remove(path)
+    assert not site.restore_bundle('key')
+    assert os.path.exists(os.path.join(site.BUILD_DIR, 'index.html'))
+
+
+def test_bundle_cache_keeps_the_most_recent_bundles(site, monkeypatch):
+    monkeypatch.setattr(site, 'BUNDLE_CACHE_KEEP', 2)
+    for age, key in enumerate(['old', 'used', 'new']):
+        compile_bundle(site, f"app('{key}')")
+        site.store_bundle(key)
+        os.utime(os.path.join(site.BUNDLE_CACHE_DIR, f"{key}.json"), (age + 1, age + 1))
+        if key == 'used':
+            # Restoring marks a bundle as recently used
+            assert site.restore_bundle('old')
+    assert sorted(os.listdir(site.BUNDLE_CACHE_DIR)) == ['new.json', 'objects', 'old.json']
+    # index.html is shared by both kept bundles and stored once; used's main.js is gone
+    assert len(list(site.iter_files(site.BUNDLE_OBJECTS_DIR))) == 3
+    assert site.restore_bundle('old') and not site.restore_bundle('used')
@@ -0,0 +1,52 @@
+import json
+
+from search_index import STOP_WORDS, build_search_index, section_terms, strip_html, tokenize
+
+
+def postings(index, term):
+    """{doc id: weight} for a term of a written index"""
+    flat = index['postings'][index['terms'].index(term)]
+    found = {}
+    doc_id = 0
+    for delta, weight in zip(flat[::2], flat[1::2]):
+        doc_id += delta
+        found[doc_id] = weight
+    return found
+
+
+def test_tokenize_keeps_technology_names_whole():
+    assert tokenize("Built with C++, C#, Node.js and scikit-learn") == ['built', 'c++', 'c#', 'node.js', 'scikit-learn']
+
+
+def test_tokenize_drops_stop_words_and_single_letters_but_not_digits():
+    assert tokenize("A tour of the x 3 d engine") == ['tour', '3', 'engine']
+
+
+def test_strip_html_keeps_word_boundaries():
+    assert tokenize(strip_html("<p>first</p><p>second&amp;third</p>")) == ['first', 'second', 'third']
+
+
+def test_fields_are_weighted(page):
+    section = page['sections'][0]
+    section['text'] = '<p>python</p>'
+    assert section_terms(section)['python'] == 3 + 1
+
+
+def test_index_round_trip(tmp_path, data_dir):
+    output = tmp_path / 'out' / 'search-index.json'
+    cache = tmp_path / 'cache'
+    docs, terms, rebuilt = build_search_index(data_dir, str(output), str(cache))
+    assert (docs, rebuilt) == (3, ['projects'])
+    index = json.loads(output.read_text(encoding='utf-8'))
+    assert len(index['terms']) == terms
+    assert postings(index, 'tool2') == {2: 3}
+    assert set(postings(index, 'python')) == {0, 1, 2}
+
+    # The client drops the stop words the index ships, so a query never asks for a term that can't exist
+    assert set(index['stopWords']) == STOP_WORDS
+    assert not STOP_WORDS & set(index['terms'])
+    query = [word for word in "the body of section".split() if word not in index['stopWords']]
+    assert query == ['body', 'section'] and all(word in index['terms'] for word in query)
+
+    # Unchanged pages come from the token cache
+    assert build_search_index(data_dir, str(output), str(cache))[2] == []